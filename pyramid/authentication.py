@@ -2,10 +2,13 @@ from codecs import utf_8_decode
 from codecs import utf_8_encode
 from hashlib import md5
 import base64
-import datetime
+import binascii
 import re
+import struct
 import time as time_mod
 
+from repoze.lru import LRUCache
+
 from zope.interface import implementer
 
 from pyramid.compat import (
@@ -347,6 +350,31 @@ class AuthTktAuthenticationPolicy(CallbackAuthenticationPolicy):
        wildcard domain.
        Optional.
 
+    ``single_cookie``
+
+       Default: ``False``.  By default, remembering a user (or reissuing
+       the ticket) sets three cookies: one without a domain, one for the
+       current domain and, if ``wild_domain`` is true, one for the wildcard
+       domain.  If this value is ``True``, only a single cookie is set: the
+       wildcard domain cookie if ``wild_domain`` is true, the cookie without
+       a domain otherwise.  Forgetting a user still expires all three.
+       Note that browsers ignore wildcard domain cookies for hosts without
+       a dot in their name (such as ``localhost``).  Optional.
+
+    ``cache_size``
+
+       Default: ``0``.  The number of auth_tkt cookie values whose parsed
+       and verified contents are kept in a least-recently-used cache, so
+       that requests carrying a cookie seen recently needn't verify its
+       signature again.  ``timeout`` and ``reissue_time`` are still
+       honored for cached cookies.  If this value is ``0``, no cache is
+       used.  Optional.
+
+    ``cache_ttl``
+
+       Default: ``60``.  The number of seconds for which a cookie value
+       stays in the cache described by ``cache_size``.  Optional.
+
     ``debug``
 
         Default: ``False``.  If ``debug`` is ``True``, log messages to the
@@ -369,6 +397,9 @@ class AuthTktAuthenticationPolicy(CallbackAuthenticationPolicy):
                  path="/",
                  http_only=False,
                  wild_domain=True,
+                 single_cookie=False,
+                 cache_size=0,
+                 cache_ttl=60,
                  debug=False,
                  ):
         self.cookie = AuthTktCookieHelper(
@@ -382,6 +413,9 @@ class AuthTktAuthenticationPolicy(CallbackAuthenticationPolicy):
             http_only=http_only,
             path=path,
             wild_domain=wild_domain,
+            single_cookie=single_cookie,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
             )
         self.callback = callback
         self.debug = debug
@@ -509,22 +543,17 @@ def calculate_digest(ip, timestamp, secret, userid, tokens, user_data):
     userid = bytes_(userid, 'utf-8')
     tokens = bytes_(tokens, 'utf-8')
     user_data = bytes_(user_data, 'utf-8')
-    digest0 = md5(
-        encode_ip_timestamp(ip, timestamp) + secret + userid + b'\0'
-        + tokens + b'\0' + user_data).hexdigest()
-    digest = md5(bytes_(digest0) + secret).hexdigest()
+    digest0 = md5(b''.join((
+        encode_ip_timestamp(ip, timestamp), secret, userid, b'\0',
+        tokens, b'\0', user_data))).digest()
+    # hexlify produces bytes on both Python 2 and 3
+    digest = md5(binascii.hexlify(digest0) + secret).hexdigest()
     return digest
 
 # this function licensed under the MIT license (stolen from Paste)
 def encode_ip_timestamp(ip, timestamp):
-    ip_chars = ''.join(map(chr, map(int, ip.split('.'))))
-    t = int(timestamp)
-    ts = ((t & 0xff000000) >> 24,
-          (t & 0xff0000) >> 16,
-          (t & 0xff00) >> 8,
-          t & 0xff)
-    ts_chars = ''.join(map(chr, ts))
-    return bytes_(ip_chars + ts_chars)
+    ip_chars = bytes(bytearray(map(int, ip.split('.'))))
+    return ip_chars + struct.pack('!I', int(timestamp) & 0xffffffff)
 
 EXPIRE = object()
 
@@ -556,7 +585,8 @@ class AuthTktCookieHelper(object):
     
     def __init__(self, secret, cookie_name='auth_tkt', secure=False,
                  include_ip=False, timeout=None, reissue_time=None,
-                 max_age=None, http_only=False, path="/", wild_domain=True):
+                 max_age=None, http_only=False, path="/", wild_domain=True,
+                 single_cookie=False, cache_size=0, cache_ttl=60):
         self.secret = secret
         self.cookie_name = cookie_name
         self.include_ip = include_ip
@@ -567,6 +597,12 @@ class AuthTktCookieHelper(object):
         self.http_only = http_only
         self.path = path
         self.wild_domain = wild_domain
+        self.single_cookie = single_cookie
+        self.cache_ttl = cache_ttl
+        if cache_size:
+            self.cache = LRUCache(cache_size)
+        else:
+            self.cache = None
 
         static_flags = []
         if self.secure:
@@ -575,22 +611,54 @@ class AuthTktCookieHelper(object):
             static_flags.append('; HttpOnly')
         self.static_flags = "".join(static_flags)
 
-    def _get_cookies(self, environ, value, max_age=None):
+        # the cookie attributes following the value of each Set-Cookie
+        # header, per host; see _get_cookie_tails
+        self._cookie_tails = LRUCache(100)
+        # the most recently computed max age flags as ((max_age, second),
+        # flags); see _get_max_age_flags
+        self._max_age_flags = (None, None)
+
+    def _get_cookies(self, environ, value, max_age=None, single=False):
         if max_age is EXPIRE:
             max_age = "; Max-Age=0; Expires=Wed, 31-Dec-97 23:59:59 GMT"
         elif max_age is not None:
-            later = datetime.datetime.utcnow() + datetime.timedelta(
-                seconds=int(max_age))
-            # Wdy, DD-Mon-YY HH:MM:SS GMT
-            expires = later.strftime('%a, %d %b %Y %H:%M:%S GMT')
-            # the Expires header is *required* at least for IE7 (IE7 does
-            # not respect Max-Age)
-            max_age = "; Max-Age=%s; Expires=%s" % (max_age, expires)
+            max_age = self._get_max_age_flags(max_age)
         else:
             max_age = ''
 
-        cur_domain = environ.get('HTTP_HOST', environ.get('SERVER_NAME'))
+        host = environ.get('HTTP_HOST', environ.get('SERVER_NAME'))
+        tails = self._cookie_tails.get(host)
+        if tails is None:
+            tails = self._get_cookie_tails(host)
+            self._cookie_tails.put(host, tails)
+
+        if single:
+            # the wildcard domain cookie if there is one, otherwise the one
+            # without a domain
+            tails = tails[-1:] if self.wild_domain else tails[:1]
 
+        head = '%s="%s' % (self.cookie_name, value)
+        flags = max_age + self.static_flags
+        return [('Set-Cookie', head + tail + flags) for tail in tails]
+
+    def _get_max_age_flags(self, max_age):
+        now = self.now # service tests
+        if now is None:
+            now = time_mod.time()
+        now = int(now)
+        key, flags = self._max_age_flags
+        if key == (max_age, now):
+            return flags
+        # Wdy, DD-Mon-YY HH:MM:SS GMT
+        expires = time_mod.strftime('%a, %d %b %Y %H:%M:%S GMT',
+                                    time_mod.gmtime(now + int(max_age)))
+        # the Expires header is *required* at least for IE7 (IE7 does
+        # not respect Max-Age)
+        flags = "; Max-Age=%s; Expires=%s" % (max_age, expires)
+        self._max_age_flags = ((max_age, now), flags)
+        return flags
+
+    def _get_cookie_tails(self, cur_domain):
         # While Chrome, IE, and Firefox can cope, Opera (at least) cannot
         # cope with a port number in the cookie domain when the URL it
         # receives the cookie from does not also have that port number in it
@@ -603,21 +671,16 @@ class AuthTktCookieHelper(object):
         if ':' in cur_domain:
             cur_domain = cur_domain.split(':', 1)[0]
 
-        cookies = [
-            ('Set-Cookie', '%s="%s"; Path=%s%s%s' % (
-            self.cookie_name, value, self.path, max_age, self.static_flags)),
-            ('Set-Cookie', '%s="%s"; Path=%s; Domain=%s%s%s' % (
-            self.cookie_name, value, self.path, cur_domain, max_age,
-                self.static_flags)),
+        tails = [
+            '"; Path=%s' % self.path,
+            '"; Path=%s; Domain=%s' % (self.path, cur_domain),
             ]
 
         if self.wild_domain:
             wild_domain = '.' + cur_domain
-            cookies.append(('Set-Cookie', '%s="%s"; Path=%s; Domain=%s%s%s' % (
-                self.cookie_name, value, self.path, wild_domain, max_age,
-                self.static_flags)))
+            tails.append('"; Path=%s; Domain=%s' % (self.path, wild_domain))
 
-        return cookies
+        return tuple(tails)
 
     def identify(self, request):
         """ Return a dictionary with authentication information, or ``None``
@@ -633,30 +696,22 @@ class AuthTktCookieHelper(object):
         else:
             remote_addr = '0.0.0.0'
         
-        try:
-            timestamp, userid, tokens, user_data = self.parse_ticket(
-                self.secret, cookie, remote_addr)
-        except self.BadTicket:
-            return None
-
         now = self.now # service tests
 
         if now is None: 
             now = time_mod.time()
 
+        ticket = self._parse(cookie, remote_addr, now)
+
+        if ticket is None:
+            return None
+
+        timestamp, userid, tokens, user_data = ticket
+
         if self.timeout and ( (timestamp + self.timeout) < now ):
             # the auth_tkt data has expired
             return None
 
-        userid_typename = 'userid_type:'
-        user_data_info = user_data.split('|')
-        for datum in filter(None, user_data_info):
-            if datum.startswith(userid_typename):
-                userid_type = datum[len(userid_typename):]
-                decoder = self.userid_type_decoders.get(userid_type)
-                if decoder:
-                    userid = decoder(userid)
-
         reissue = self.reissue_time is not None
 
         if reissue and not hasattr(request, '_authtkt_reissued'):
@@ -683,6 +738,39 @@ class AuthTktCookieHelper(object):
         identity['userdata'] = user_data
         return identity
 
+    def _parse(self, cookie, remote_addr, now):
+        # Return the (timestamp, userid, tokens, user_data) of a valid
+        # ticket, with the userid decoded, or None.  Only valid tickets are
+        # cached, keyed by the cookie value (and address it was sent from).
+        cache = self.cache
+        if cache is not None:
+            key = (cookie, remote_addr)
+            entry = cache.get(key)
+            if entry is not None and entry[0] > now:
+                timestamp, userid, tokens, user_data = entry[1]
+                return timestamp, userid, list(tokens), user_data
+
+        try:
+            timestamp, userid, tokens, user_data = self.parse_ticket(
+                self.secret, cookie, remote_addr)
+        except self.BadTicket:
+            return None
+
+        userid_typename = 'userid_type:'
+        user_data_info = user_data.split('|')
+        for datum in filter(None, user_data_info):
+            if datum.startswith(userid_typename):
+                userid_type = datum[len(userid_typename):]
+                decoder = self.userid_type_decoders.get(userid_type)
+                if decoder:
+                    userid = decoder(userid)
+
+        if cache is not None:
+            cache.put(key, (now + self.cache_ttl,
+                            (timestamp, userid, tuple(tokens), user_data)))
+
+        return timestamp, userid, tokens, user_data
+
     def forget(self, request):
         """ Return a set of expires Set-Cookie headers, which will destroy
         any existing auth_tkt cookie when attached to a response"""
@@ -753,7 +841,8 @@ class AuthTktCookieHelper(object):
             secure=self.secure)
 
         cookie_value = ticket.cookie_value()
-        return self._get_cookies(environ, cookie_value, max_age)
+        return self._get_cookies(environ, cookie_value, max_age,
+                                 single=self.single_cookie)
 
 @implementer(IAuthenticationPolicy)
 class SessionAuthenticationPolicy(CallbackAuthenticationPolicy):
@@ -35,10 +35,16 @@ class ZPTTemplateRenderer(object):
         if sys.platform.startswith('java'): # pragma: no cover
             raise RuntimeError(
                 'Chameleon templates are not compatible with Jython')
+        kw = {}
+        loader = self.lookup.module_loader
+        if loader is not None:
+            # compiled templates are written to and loaded from disk
+            kw['loader'] = loader
         return PageTemplateFile(self.path,
                                 auto_reload=self.lookup.auto_reload,
                                 debug=self.lookup.debug,
-                                translate=self.lookup.translate)
+                                translate=self.lookup.translate,
+                                **kw)
 
     def implementation(self):
         return self.template
@@ -198,6 +198,11 @@ try:
 except ImportError: # pragma: no cover
     from http.cookies import SimpleCookie
 
+if PY3: # pragma: no cover
+    import dbm
+else:
+    import anydbm as dbm
+
 if PY3: # pragma: no cover
     from html import escape
 else:
@@ -1,8 +1,10 @@
+import copy
 import inspect
 import logging
 import operator
 import os
 import sys
+import time
 import types
 import warnings
 import venusian
@@ -65,12 +67,24 @@ from pyramid.config.rendering import DEFAULT_RENDERERS
 from pyramid.config.rendering import RenderingConfiguratorMixin
 from pyramid.config.routes import RoutesConfiguratorMixin
 from pyramid.config.security import SecurityConfiguratorMixin
-from pyramid.config.settings import SettingsConfiguratorMixin
+from pyramid.config.settings import (
+    Settings,
+    SettingsConfiguratorMixin,
+    )
 from pyramid.config.testing import TestingConfiguratorMixin
 from pyramid.config.tweens import TweensConfiguratorMixin
 from pyramid.config.util import (
     action_method,
     ActionInfo,
+    ScanRecorder,
+    read_scan_index,
+    read_scan_snapshot,
+    replay_scan,
+    scan_modules,
+    scan_snapshot_key,
+    write_scan_index,
+    write_scan_profile,
+    write_scan_snapshot,
     )
 from pyramid.config.views import ViewsConfiguratorMixin
 from pyramid.config.zca import ZCAConfiguratorMixin
@@ -243,7 +257,9 @@ class Configurator(
     ``True``, introspection values during actions will be kept for for use
     for tools like the debug toolbar.  If it's ``False``, introspection
     values provided by registrations will be ignored.  By default, it is
-    ``True``.  This parameter is new as of Pyramid 1.3.
+    ``True``.  This parameter is new as of Pyramid 1.3.  The
+    ``pyramid.introspection`` :term:`deployment setting` can also be used to
+    turn introspection off; when it is false, ``introspection`` is ignored.
     """
     manager = manager # for testing injection
     venusian = venusian # for testing injection
@@ -303,6 +319,10 @@ class Configurator(
                 default_view_mapper=default_view_mapper,
                 exceptionresponse_view=exceptionresponse_view,
                 )
+        else:
+            settings = getattr(registry, 'settings', None)
+            if settings and not settings.get('pyramid.introspection', True):
+                self.introspection = False
 
     def setup_registry(self,
                        settings=None,
@@ -340,6 +360,8 @@ class Configurator(
         self._fix_registry()
 
         self._set_settings(settings)
+        if not registry.settings['pyramid.introspection']:
+            self.introspection = False
         self._register_response_adapters()
 
         if isinstance(debug_logger, string_types):
@@ -434,6 +456,19 @@ class Configurator(
     def _split_spec(self, path_or_spec):
         return resolve_asset_spec(path_or_spec, self.package_name)
 
+    def _get_local_utility(self, iface):
+        # Return the utility providing ``iface`` which is registered in this
+        # configurator's registry itself, or None.  If only a base registry
+        # has one (see ``overlay``), a copy of it is registered first, so it
+        # can be changed without affecting the base registry.
+        registry = self.registry
+        utility = registry.queryUtility(iface)
+        if utility is not None and registry.utilities.registered(
+            (), iface) is None:
+            utility = copy.copy(utility)
+            registry.registerUtility(utility, iface)
+        return utility
+
     def _fix_registry(self):
         """ Fix up a ZCA component registry that is not a
         pyramid.registry.Registry by adding analogues of ``has_listeners``,
@@ -584,14 +619,28 @@ class Configurator(
 
     _ctx = action_state # bw compat
 
-    def commit(self):
+    def commit(self, timings=None):
         """ Commit any pending configuration actions. If a configuration
         conflict is detected in the pending configuration actions, this method
         will raise a :exc:`ConfigurationConflictError`; within the traceback
         of this error will be information about the source of the conflict,
         usually including file names and line numbers of the cause of the
-        configuration conflicts."""
-        self.action_state.execute_actions(introspector=self.introspector)
+        configuration conflicts.
+
+        If ``timings`` is a dictionary, the number of actions committed and
+        the time spent executing them are added to it, by category (e.g.
+        ``'views'`` or ``'routes'``); each value is a ``[count, seconds]``
+        list.  For example:
+
+        .. code-block:: python
+
+           timings = {}
+           config.commit(timings=timings)
+           for category, (count, seconds) in sorted(timings.items()):
+               print('%s: %d actions, %.3fs' % (category, count, seconds))
+        """
+        self.action_state.execute_actions(introspector=self.introspector,
+                                          timings=timings)
         self.action_state = ActionState() # old actions have been processed
 
     def include(self, callable, route_prefix=None):
@@ -800,6 +849,49 @@ class Configurator(
         configurator.info = self.info
         return configurator
 
+    def overlay(self, name, settings=None):
+        """ Return a new Configurator using a new :term:`application
+        registry` named ``name`` which is an overlay on this configurator's
+        registry, for instance to configure one tenant of a multi-tenant
+        application.  Pending configuration actions of this configurator are
+        committed first.
+
+        The new registry starts out with the configuration of this one
+        (views, routes, renderers, security policies, tweens, subscribers
+        and so on) without copying it: lookups fall back to this registry,
+        and routes and other registrations which are changed in place are
+        only copied the first time they are changed through the new
+        configurator.  Its :term:`deployment settings` are the settings of
+        this registry, updated with ``settings`` if it is passed.
+        Registrations made with the new configurator take precedence over
+        those of this registry, and don't affect it.  A separate
+        :app:`Pyramid` application can be made from each registry with
+        :meth:`pyramid.config.Configurator.make_wsgi_app`; see also
+        :class:`pyramid.router.HostDispatcher`.
+
+        Make sure that the configuration of this registry is complete before
+        making overlays of it: the settings, tweens and subscribers of later
+        changes to it may not be seen by existing overlays.
+        """
+        self.commit()
+        base = self.registry
+        registry = Registry(name, bases=(base,))
+        registry.has_listeners = base.has_listeners
+        base_introspector = getattr(base, 'introspector', None)
+        if isinstance(base_introspector, Introspector):
+            registry.introspector = Introspector(base=base_introspector)
+        if settings:
+            merged = dict(base.settings or {})
+            merged.update(settings)
+            registry.settings = Settings(merged)
+        return self.__class__(
+            registry=registry,
+            package=self.package,
+            autocommit=self.autocommit,
+            route_prefix=self.route_prefix,
+            introspection=self.introspection,
+            )
+
     def maybe_dotted(self, dotted):
         """ Resolve the :term:`dotted Python name` ``dotted`` to a
         global Python object.  If ``dotted`` is not a string, return
@@ -844,7 +936,7 @@ class Configurator(
 
     # this is *not* an action method (uses caller_package)
     def scan(self, package=None, categories=None, onerror=None, ignore=None,
-             **kw):
+             snapshot=None, index=None, profile=None, **kw):
         """Scan a Python package and any of its subpackages for objects
         marked with :term:`configuration decoration` such as
         :class:`pyramid.view.view_config`.  Any decorated object found will
@@ -898,18 +990,86 @@ class Configurator(
         often necessary; it's an advanced usage.
 
         .. note:: the ``**kw`` argument is new in Pyramid 1.1
+
+        The ``snapshot`` argument, if provided, is the name of a file in
+        which to keep a snapshot of the scan, to speed up later scans of the
+        same package.  A snapshot records the configuration calls (such as
+        :meth:`pyramid.config.Configurator.add_view`) made by the decorators
+        found during a scan.  If the snapshot file exists and was written by
+        a scan of the same package with the same ``categories``, ``ignore``
+        value and :term:`deployment settings`, and none of the Python source
+        files of the package has changed since, the scan makes the recorded
+        calls instead of importing and inspecting every module of the
+        package; only the modules which define decorated objects are
+        imported.  Otherwise, the package is scanned and the snapshot file is
+        (re)written.  No snapshot is written if a decorator callback does
+        anything but call configurator methods, or passes them objects which
+        cannot be referred to by module and name or pickled, and none is
+        used if ``kw`` or a callable ``ignore`` value is passed.  By
+        default, ``snapshot`` is ``None``, meaning that no snapshot is used.
+
+        The ``index`` argument, if provided, is the name of a file in which
+        to keep a list of the modules of the package which contain decorated
+        objects (such as views decorated with
+        :class:`pyramid.view.view_config`).  If the index file exists and
+        was written by a scan of the same package with the same
+        ``categories``, ``ignore`` value and :term:`deployment settings`,
+        and none of the Python source files of the package has changed
+        since, only the modules it lists are imported and scanned; the
+        others aren't imported at all.  Otherwise, the whole package is
+        scanned and the index file is (re)written.  As with ``snapshot``,
+        the index is not used if ``kw`` or a callable ``ignore`` value is
+        passed.  By default, ``index`` is ``None``.
+
+        The ``profile`` argument, if provided, should be a file-like object
+        (such as ``sys.stderr``) to which a report of the time spent
+        importing and scanning each module of the package is written,
+        slowest modules first.  By default, ``profile`` is ``None``, meaning
+        that no report is written.
         """
         package = self.maybe_dotted(package)
         if package is None: # pragma: no cover
             package = caller_package()
 
-        ctorkw = {'config':self}
+        key = None
+        if (snapshot is not None or index is not None) and not kw:
+            key = scan_snapshot_key(package, categories, ignore,
+                                    self.registry.settings)
+        if key is not None and snapshot is not None:
+            records = read_scan_snapshot(snapshot, key)
+            if records is not None:
+                replay_scan(self, records)
+                return
+        modules = None
+        if key is not None and index is not None:
+            modules = read_scan_index(index, key)
+        if key is not None and (snapshot is not None or modules is None):
+            records = []
+            config = ScanRecorder(self, records)
+        else:
+            records = None
+            config = self
+
+        ctorkw = {'config':config}
         ctorkw.update(kw)
 
         scanner = self.venusian.Scanner(**ctorkw)
-        
-        scanner.scan(package, categories=categories, onerror=onerror,
-                     ignore=ignore)
+
+        if profile is None and (key is None or index is None):
+            scanner.scan(package, categories=categories, onerror=onerror,
+                         ignore=ignore)
+        else:
+            stats = scan_modules(scanner, package, categories=categories,
+                                 onerror=onerror, ignore=ignore,
+                                 modules=modules, records=records)
+            if key is not None and index is not None and modules is None:
+                write_scan_index(
+                    index, key, [name for name, i, s, calls in stats if calls])
+            if profile is not None:
+                write_scan_profile(profile, stats)
+
+        if key is not None and snapshot is not None:
+            write_scan_snapshot(snapshot, key, records)
 
     def make_wsgi_app(self):
         """ Commits any pending configuration statements, sends a
@@ -978,11 +1138,18 @@ class ActionState(object):
             )
         self.actions.append(action)
 
-    def execute_actions(self, clear=True, introspector=None):
+    def execute_actions(self, clear=True, introspector=None, timings=None):
         """Execute the configuration actions
 
         This calls the action callables after resolving conflicts
 
+        If ``timings`` is a dictionary, the number of actions executed and
+        the time spent executing them are added to it, by action category:
+        each key is the category name of the first introspectable of an
+        action or, for actions without introspectables, the first element
+        of their discriminator (e.g. ``'view'``), and each value is a
+        ``[count, seconds]`` list.
+
         For example:
 
         >>> output = []
@@ -1027,14 +1194,12 @@ class ActionState(object):
         """
 
         try:
-            for action in resolveConflicts(self.actions):
-                callable = action['callable']
-                args = action['args']
-                kw = action['kw']
-                info = action['info']
-                # we use "get" below in case an action was added via a ZCML
-                # directive that did not know about introspectables
-                introspectables = action.get('introspectables', ())
+            for action in _resolve_conflicts(self.actions):
+                (discriminator, callable, args, kw, includepath, info, order,
+                 introspectables, original) = action
+
+                if timings is not None:
+                    start = time.time()
 
                 try:
                     if callable is not None:
@@ -1053,90 +1218,127 @@ class ActionState(object):
                 if introspector is not None:
                     for introspectable in introspectables:
                         introspectable.register(introspector, info)
+
+                if timings is not None:
+                    category = _action_category(discriminator,
+                                                introspectables)
+                    timing = timings.get(category)
+                    if timing is None:
+                        timing = timings[category] = [0, 0.0]
+                    timing[0] += 1
+                    timing[1] += time.time() - start
                 
         finally:
             if clear:
                 del self.actions[:]
 
-# this function is licensed under the ZPL (stolen from Zope)
-def resolveConflicts(actions):
-    """Resolve conflicting actions
-
-    Given an actions list, identify and try to resolve conflicting actions.
-    Actions conflict if they have the same non-None discriminator.
-    Conflicting actions can be resolved if the include path of one of
-    the actions is a prefix of the includepaths of the other
-    conflicting actions and is unequal to the include paths in the
-    other conflicting actions.
-    """
-
-    # organize actions by discriminators
-    unique = {}
-    output = []
+def _action_category(discriminator, introspectables):
+    # the category under which the execution time of an action is reported
+    if introspectables:
+        return introspectables[0].category_name
+    if isinstance(discriminator, tuple) and discriminator:
+        return discriminator[0]
+    return discriminator
+
+def _action_tuple(discriminator, callable=None, args=(), kw=None,
+                  includepath=(), info=None, order=0, introspectables=(),
+                  original=None):
+    # the fields of an action, in the order of those of old-style tuple
+    # actions, followed by the action itself
+    if kw is None:
+        kw = {}
+    return (discriminator, callable, args, kw, includepath, info, order or 0,
+            introspectables, original)
+
+def _resolve_conflicts(actions):
+    # Return the actions which survive conflict resolution (see
+    # resolveConflicts) as _action_tuple tuples, in execution order.
+    expanded = []
+    first = {} # discriminator -> position of the first action with it
+    groups = {} # discriminator -> positions of all actions with it, if > 1
     for i, action in enumerate(actions):
-        if not isinstance(action, dict):
+        if isinstance(action, dict):
+            action = (action['discriminator'], action['callable'],
+                      action['args'], action['kw'], action['includepath'],
+                      action['info'], action['order'] or 0,
+                      # we use "get" in case an action was added via a ZCML
+                      # directive that did not know about introspectables
+                      action.get('introspectables', ()), action)
+        else:
             # old-style tuple action
-            action = expand_action(*action)
-
-        # "order" is an integer grouping. Actions in a lower order will be
-        # executed before actions in a higher order.  Within an order,
-        # actions are executed sequentially based on original action ordering
-        # ("i").
-        order = action['order'] or 0
-        discriminator = action['discriminator']
-
-        # "ainfo" is a tuple of (order, i, action) where "order" is a
-        # user-supplied grouping, "i" is an integer expressing the relative
-        # position of this action in the action list being resolved, and
-        # "action" is an action dictionary.  The purpose of an ainfo is to
-        # associate an "order" and an "i" with a particular action; "order"
-        # and "i" exist for sorting purposes after conflict resolution.
-        ainfo = (order, i, action)
-
+            action = _action_tuple(*action)
+        expanded.append(action)
+        discriminator = action[0]
         if discriminator is None:
             # The discriminator is None, so this action can never conflict.
-            # We can add it directly to the result.
-            output.append(ainfo)
             continue
-
-        L = unique.setdefault(discriminator, [])
-        L.append(ainfo)
+        j = first.setdefault(discriminator, i)
+        if j != i:
+            group = groups.get(discriminator)
+            if group is None:
+                groups[discriminator] = [j, i]
+            else:
+                group.append(i)
 
     # Check for conflicts
     conflicts = {}
+    overridden = set()
 
-    for discriminator, ainfos in unique.items():
+    for discriminator, group in groups.items():
 
         # We use (includepath, order, i) as a sort key because we need to
         # sort the actions by the paths so that the shortest path with a
         # given prefix comes first.  The "first" action is the one with the
         # shortest include path.  We break sorting ties using "order", then
         # "i".
-        def bypath(ainfo):
-            path, order, i = ainfo[2]['includepath'], ainfo[0], ainfo[1]
-            return path, order, i
-
-        ainfos.sort(key=bypath)
-        ainfo, rest = ainfos[0], ainfos[1:]
-        output.append(ainfo)
-        _, _, action = ainfo
-        basepath, baseinfo, discriminator = (action['includepath'],
-                                             action['info'],
-                                             action['discriminator'])
-
-        for _, _, action in rest:
-            includepath = action['includepath']
-            # Test whether path is a prefix of opath
-            if (includepath[:len(basepath)] != basepath # not a prefix
-                or includepath == basepath):
+        group.sort(key=lambda i: (expanded[i][4], expanded[i][6], i))
+        base = expanded[group[0]]
+        basepath, baseinfo = base[4], base[5]
+        baselen = len(basepath)
+
+        for i in group[1:]:
+            overridden.add(i)
+            action = expanded[i]
+            includepath = action[4]
+            # Test whether basepath is a proper prefix of includepath
+            if (len(includepath) <= baselen
+                or includepath[:baselen] != basepath):
                 L = conflicts.setdefault(discriminator, [baseinfo])
-                L.append(action['info'])
+                L.append(action[5])
 
     if conflicts:
         raise ConfigurationConflictError(conflicts)
 
-    # sort conflict-resolved actions by (order, i) and return them
-    return [ x[2] for x in sorted(output, key=operator.itemgetter(0, 1))]
+    # Actions in a lower "order" are executed before actions in a higher
+    # order.  Within an order, actions are executed in their original order
+    # ("i").  The sort is stable and the actions are already in their
+    # original order, so sorting by order is enough (and takes linear time
+    # when most actions share an order).
+    if overridden:
+        expanded = [ action for i, action in enumerate(expanded)
+                     if i not in overridden ]
+    expanded.sort(key=operator.itemgetter(6))
+    return expanded
+
+# this function is licensed under the ZPL (stolen from Zope)
+def resolveConflicts(actions):
+    """Resolve conflicting actions
+
+    Given an actions list, identify and try to resolve conflicting actions.
+    Actions conflict if they have the same non-None discriminator.
+    Conflicting actions can be resolved if the include path of one of
+    the actions is a prefix of the includepaths of the other
+    conflicting actions and is unequal to the include paths in the
+    other conflicting actions.
+    """
+    result = []
+    for action in _resolve_conflicts(actions):
+        original = action[8]
+        if original is None:
+            # old-style tuple action
+            original = expand_action(*action[:8])
+        result.append(original)
+    return result
                 
 def expand_action(discriminator, callable=None, args=(), kw=None,
                   includepath=(), info=None, order=0, introspectables=()):
@@ -1,6 +1,8 @@
 import pkg_resources
 import sys
 
+from repoze.lru import LRUCache
+
 from zope.interface import implementer
 
 from pyramid.interfaces import IPackageOverrides
@@ -10,6 +12,8 @@ from pyramid.threadlocal import get_current_registry
 
 from pyramid.config.util import action_method
 
+_marker = object()
+
 class OverrideProvider(pkg_resources.DefaultProvider):
     def __init__(self, module):
         pkg_resources.DefaultProvider.__init__(self, module)
@@ -82,6 +86,10 @@ class OverrideProvider(pkg_resources.DefaultProvider):
         
 @implementer(IPackageOverrides)
 class PackageOverrides:
+    # the number of resource names whose resolution is remembered; names
+    # come from request URLs (e.g. via static views), so this is bounded
+    resolved_cache_size = 1000
+
     # pkg_resources arg in kw args below for testing
     def __init__(self, package, pkg_resources=pkg_resources):
         if hasattr(package, '__loader__') and not isinstance(package.__loader__,
@@ -105,6 +113,8 @@ class PackageOverrides:
         pkg_resources.register_loader_type(self.__class__, OverrideProvider)
         self.overrides = []
         self.overridden_package_name = package.__name__
+        self.cache_resolved = True
+        self._resolved = LRUCache(self.resolved_cache_size)
 
     def insert(self, path, package, prefix):
         if not path or path.endswith('/'):
@@ -112,6 +122,7 @@ class PackageOverrides:
         else:
             override = FileOverride(path, package, prefix)
         self.overrides.insert(0, override)
+        self._resolved.clear()
         return override
 
     def search_path(self, resource_name):
@@ -121,35 +132,51 @@ class PackageOverrides:
                 package, name = o
                 yield package, name
 
+    def resolve(self, resource_name):
+        """ Return the ``(package, name)`` pair naming the first existing
+        asset which overrides ``resource_name``, or ``None`` if no override
+        applies.  Results (including ``None``) are cached until the next
+        :meth:`insert` unless ``cache_resolved`` is false; only the most
+        recently used ``resolved_cache_size`` names are remembered."""
+        resolved = self._resolved.get(resource_name, _marker)
+        if resolved is _marker:
+            resolved = None
+            for package, rname in self.search_path(resource_name):
+                if pkg_resources.resource_exists(package, rname):
+                    resolved = (package, rname)
+                    break
+            if self.cache_resolved:
+                self._resolved.put(resource_name, resolved)
+        return resolved
+
     def get_filename(self, resource_name):
-        for package, rname in self.search_path(resource_name):
-            if pkg_resources.resource_exists(package, rname):
-                return pkg_resources.resource_filename(package, rname)
+        resolved = self.resolve(resource_name)
+        if resolved is not None:
+            return pkg_resources.resource_filename(*resolved)
 
     def get_stream(self, resource_name):
-        for package, rname in self.search_path(resource_name):
-            if pkg_resources.resource_exists(package, rname):
-                return pkg_resources.resource_stream(package, rname)
+        resolved = self.resolve(resource_name)
+        if resolved is not None:
+            return pkg_resources.resource_stream(*resolved)
 
     def get_string(self, resource_name):
-        for package, rname in self.search_path(resource_name):
-            if pkg_resources.resource_exists(package, rname):
-                return pkg_resources.resource_string(package, rname)
+        resolved = self.resolve(resource_name)
+        if resolved is not None:
+            return pkg_resources.resource_string(*resolved)
 
     def has_resource(self, resource_name):
-        for package, rname in self.search_path(resource_name):
-            if pkg_resources.resource_exists(package, rname):
-                return True
+        if self.resolve(resource_name) is not None:
+            return True
 
     def isdir(self, resource_name):
-        for package, rname in self.search_path(resource_name):
-            if pkg_resources.resource_exists(package, rname):
-                return pkg_resources.resource_isdir(package, rname)
+        resolved = self.resolve(resource_name)
+        if resolved is not None:
+            return pkg_resources.resource_isdir(*resolved)
 
     def listdir(self, resource_name):
-        for package, rname in self.search_path(resource_name):
-            if pkg_resources.resource_exists(package, rname):
-                return pkg_resources.resource_listdir(package, rname)
+        resolved = self.resolve(resource_name)
+        if resolved is not None:
+            return pkg_resources.resource_listdir(*resolved)
     
 
 class DirectoryOverride:
@@ -183,6 +210,10 @@ class AssetsConfiguratorMixin(object):
         override = self.registry.queryUtility(IPackageOverrides, name=pkg_name)
         if override is None:
             override = PackageOverrides(package)
+            settings = self.registry.settings
+            if settings and settings.get('pyramid.reload_assets'):
+                # don't cache override lookups when assets may come and go
+                override.cache_resolved = False
             self.registry.registerUtility(override, IPackageOverrides,
                                           name=pkg_name)
         override.insert(path, override_pkg_name, override_prefix)
@@ -122,7 +122,7 @@ class FactoriesConfiguratorMixin(object):
             name = callable.__name__
 
         def register():
-            plist = self.registry.queryUtility(IRequestProperties)
+            plist = self._get_local_utility(IRequestProperties)
 
             if plist is None:
                 plist = []
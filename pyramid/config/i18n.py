@@ -101,7 +101,7 @@ class I18NConfiguratorMixin(object):
         def register():
             for directory in directories:
 
-                tdirs = self.registry.queryUtility(ITranslationDirectories)
+                tdirs = self._get_local_utility(ITranslationDirectories)
                 if tdirs is None:
                     tdirs = []
                     self.registry.registerUtility(tdirs,
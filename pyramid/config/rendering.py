@@ -8,17 +8,35 @@ from pyramid.interfaces import (
 
 from pyramid.config.util import action_method
 
-from pyramid import (
-    renderers,
-    chameleon_text,
-    chameleon_zpt,
-    )
+from pyramid.path import DottedNameResolver
+
+from pyramid import renderers
+
+class LazyRendererFactory(object):
+    """ A renderer factory which imports the renderer factory named by the
+    :term:`dotted Python name` ``name`` when it is first used, so that
+    template engines which an application doesn't use are never imported.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.factory = None
 
-from pyramid.mako_templating import renderer_factory as mako_renderer_factory
+    def __call__(self, info):
+        factory = self.factory
+        if factory is None:
+            factory = DottedNameResolver(None).resolve(self.name)
+            self.factory = factory
+        return factory(info)
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.name)
+
+mako_renderer_factory = LazyRendererFactory(
+    'pyramid.mako_templating.renderer_factory')
 
 DEFAULT_RENDERERS = (
-    ('.txt', chameleon_text.renderer_factory),
-    ('.pt', chameleon_zpt.renderer_factory),
+    ('.txt', LazyRendererFactory('pyramid.chameleon_text.renderer_factory')),
+    ('.pt', LazyRendererFactory('pyramid.chameleon_zpt.renderer_factory')),
     ('.mak', mako_renderer_factory),
     ('.mako', mako_renderer_factory),
     ('json', renderers.json_renderer_factory),
@@ -102,3 +120,32 @@ class RenderingConfiguratorMixin(object):
                                    'renderer globals factory')
         intr['factory'] = factory
         self.action(IRendererGlobalsFactory, register)
+
+    def compile_templates(self):
+        """ Commit any pending configuration, then compile the template of
+        every view registered in this configuration which uses a template
+        renderer, so that the first request to each of those views doesn't
+        have to.  Call this before serving requests, e.g. just before
+        :meth:`pyramid.config.Configurator.make_wsgi_app`.
+
+        If the ``pyramid.template_cache_directory`` setting (for Chameleon)
+        or the ``mako.module_directory`` setting (for Mako) names a
+        directory, compiled templates are also written there, so that other
+        processes configured with the same directory can load them from disk
+        instead of compiling them again.
+
+        Returns a list of ``(template name, exception)`` two-tuples, one for
+        each distinct template; ``exception`` is ``None`` if the template was
+        compiled successfully.  Templates are found using :term:`introspection`
+        so nothing is compiled if introspection is turned off.
+
+        .. note::
+
+           This method is new as of :app:`Pyramid` 1.3.
+        """
+        self.commit()
+        self.begin()
+        try:
+            return renderers.compile_templates(self.registry)
+        finally:
+            self.end()
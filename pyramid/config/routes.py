@@ -450,7 +450,7 @@ class RoutesConfiguratorMixin(object):
     def get_routes_mapper(self):
         """ Return the :term:`routes mapper` object associated with
         this configurator's :term:`registry`."""
-        mapper = self.registry.queryUtility(IRoutesMapper)
+        mapper = self._get_local_utility(IRoutesMapper)
         if mapper is None:
             mapper = RoutesMapper()
             self.registry.registerUtility(mapper, IRoutesMapper)
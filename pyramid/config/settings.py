@@ -109,14 +109,35 @@ class Settings(dict):
                                     config_reload_resources))
         # reload_resources is an older alias for reload_assets
         eff_reload_assets = reload_assets or reload_resources
+        config_reload_assets_interval = self.get('reload_assets_interval', 0)
+        config_reload_assets_interval = self.get(
+            'pyramid.reload_assets_interval', config_reload_assets_interval)
+        eff_reload_assets_interval = float(
+            eget('PYRAMID_RELOAD_ASSETS_INTERVAL',
+                 config_reload_assets_interval))
         locale_name = self.get('default_locale_name', 'en')
         locale_name = self.get('pyramid.default_locale_name', locale_name)
         eff_locale_name = eget('PYRAMID_DEFAULT_LOCALE_NAME', locale_name)
+        template_cache_dir = self.get('template_cache_directory', None)
+        template_cache_dir = self.get('pyramid.template_cache_directory',
+                                      template_cache_dir)
+        eff_template_cache_dir = eget('PYRAMID_TEMPLATE_CACHE_DIRECTORY',
+                                      template_cache_dir)
         config_prevent_http_cache = self.get('prevent_http_cache', '')
         config_prevent_http_cache = self.get('pyramid.prevent_http_cache',
                                              config_prevent_http_cache)
         eff_prevent_http_cache = asbool(eget('PYRAMID_PREVENT_HTTP_CACHE',
                                              config_prevent_http_cache))
+        config_capture_action_info = self.get('capture_action_info', 'true')
+        config_capture_action_info = self.get('pyramid.capture_action_info',
+                                              config_capture_action_info)
+        eff_capture_action_info = asbool(eget('PYRAMID_CAPTURE_ACTION_INFO',
+                                              config_capture_action_info))
+        config_introspection = self.get('introspection', 'true')
+        config_introspection = self.get('pyramid.introspection',
+                                        config_introspection)
+        eff_introspection = asbool(eget('PYRAMID_INTROSPECTION',
+                                        config_introspection))
 
         update = {
             'debug_authorization': eff_debug_all or eff_debug_auth,
@@ -126,8 +147,12 @@ class Settings(dict):
             'reload_templates': eff_reload_all or eff_reload_templates,
             'reload_resources':eff_reload_all or eff_reload_assets,
             'reload_assets':eff_reload_all or eff_reload_assets,
+            'reload_assets_interval':eff_reload_assets_interval,
             'default_locale_name':eff_locale_name,
             'prevent_http_cache':eff_prevent_http_cache,
+            'template_cache_directory':eff_template_cache_dir,
+            'capture_action_info':eff_capture_action_info,
+            'introspection':eff_introspection,
 
             'pyramid.debug_authorization': eff_debug_all or eff_debug_auth,
             'pyramid.debug_notfound': eff_debug_all or eff_debug_notfound,
@@ -136,8 +161,12 @@ class Settings(dict):
             'pyramid.reload_templates': eff_reload_all or eff_reload_templates,
             'pyramid.reload_resources':eff_reload_all or eff_reload_assets,
             'pyramid.reload_assets':eff_reload_all or eff_reload_assets,
+            'pyramid.reload_assets_interval':eff_reload_assets_interval,
             'pyramid.default_locale_name':eff_locale_name,
             'pyramid.prevent_http_cache':eff_prevent_http_cache,
+            'pyramid.template_cache_directory':eff_template_cache_dir,
+            'pyramid.capture_action_info':eff_capture_action_info,
+            'pyramid.introspection':eff_introspection,
             }
 
         self.update(update)
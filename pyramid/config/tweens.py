@@ -140,7 +140,7 @@ class TweensConfiguratorMixin(object):
         registry = self.registry
         introspectables = []
 
-        tweens = registry.queryUtility(ITweens)
+        tweens = self._get_local_utility(ITweens)
         if tweens is None:
             tweens = Tweens()
             registry.registerUtility(tweens, ITweens)
@@ -201,6 +201,16 @@ class Tweens(object):
         self.factories = {}
         self.order = []
 
+    def __copy__(self):
+        tweens = self.__class__()
+        tweens.explicit = list(self.explicit)
+        tweens.names = list(self.names)
+        tweens.req_over = set(self.req_over)
+        tweens.req_under = set(self.req_under)
+        tweens.factories = dict(self.factories)
+        tweens.order = list(self.order)
+        return tweens
+
     def add_explicit(self, name, factory):
         self.explicit.append((name, factory))
 
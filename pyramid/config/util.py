@@ -1,13 +1,24 @@
+import imp
+import linecache
+import os
+import pkgutil
 import re
-import traceback
+import sys
+import tempfile
+import time
+import types
 
 from zope.interface import implementer
 
 from pyramid.interfaces import IActionInfo
 
 from pyramid.compat import (
+    PY3,
+    binary_type,
     bytes_,
     is_nonstr_iter,
+    pickle,
+    text_type,
     )
 
 from pyramid.exceptions import ConfigurationError
@@ -24,17 +35,48 @@ DEFAULT_PHASH = md5().hexdigest()
 
 @implementer(IActionInfo)
 class ActionInfo(object):
-    def __init__(self, file, line, function, src):
+    def __init__(self, file, line, function, src=None):
         self.file = file
         self.line = line
         self.function = function
-        self.src = src
+        self._src = src
+
+    @property
+    def src(self):
+        # the source line is only read when it's asked for (usually to
+        # report a conflict or an error)
+        src = self._src
+        if src is None:
+            src = ''
+            if self.file and self.line:
+                linecache.checkcache(self.file)
+                src = linecache.getline(self.file, self.line).strip()
+            self._src = src
+        return src
 
     def __str__(self):
         srclines = self.src.split('\n')
         src = '\n'.join('    %s' % x for x in srclines)
         return 'Line %s of file %s:\n%s' % (self.line, self.file, src)
 
+_NO_ACTION_INFO = ActionInfo(None, 0, '', '')
+
+def call_site_info(registry, backframes=2):
+    """ Return an :class:`ActionInfo` for the caller of the function which
+    calls this one (or, with a larger ``backframes``, for a caller further
+    up the stack).  If the ``pyramid.capture_action_info`` setting of
+    ``registry`` is false, an empty :class:`ActionInfo` is returned
+    instead."""
+    settings = getattr(registry, 'settings', None)
+    if settings and not settings.get('pyramid.capture_action_info', True):
+        return _NO_ACTION_INFO
+    try:
+        f = sys._getframe(backframes)
+    except ValueError: # pragma: no cover
+        return _NO_ACTION_INFO
+    code = f.f_code
+    return ActionInfo(code.co_filename, f.f_lineno, code.co_name)
+
 def action_method(wrapped):
     """ Wrapper to provide the right conflict info report data when a method
     that calls Configurator.action calls another that does the same"""
@@ -48,11 +90,7 @@ def action_method(wrapped):
             # _info permitted as extract_stack tuple
             info = ActionInfo(*info)
         if info is None:
-            try:
-                f = traceback.extract_stack(limit=3)
-                info = ActionInfo(*f[-backframes])
-            except: # pragma: no cover
-                info = ActionInfo(None, 0, '', '')
+            info = call_site_info(self.registry, backframes)
         self._ainfo.append(info)
         try:
             result = wrapped(self, *arg, **kw)
@@ -293,3 +331,329 @@ def as_sorted_tuple(val):
     val = tuple(sorted(val))
     return val
 
+# Scan snapshots (see ``Configurator.scan``).  A snapshot records the calls
+# which the decorator callbacks run by a scan make to the configurator, so
+# that a later scan of an unchanged package can make the same calls again
+# without importing and inspecting each of its modules.  The actions those
+# calls create can't be recorded themselves: they hold closures.
+
+_SNAPSHOT_VERSION = 1
+
+class ScanRecorder(object):
+    """ Stands in for a configurator as the ``config`` of a Venusian
+    scanner, recording the method calls made to it as ``(package_name,
+    method_name, args, kw)`` tuples.  ``None`` is recorded if a callback
+    does anything else with it, in which case the calls can't be
+    replayed."""
+    def __init__(self, config, records, package_name=None):
+        self._config = config
+        self._records = records
+        self._package_name = package_name
+
+    def with_package(self, package):
+        name = getattr(package, '__name__', package)
+        return self.__class__(self._config.with_package(package),
+                              self._records, name)
+
+    def __getattr__(self, name):
+        attr = getattr(self._config, name)
+        if not isinstance(attr, types.MethodType):
+            self._records.append(None)
+            return attr
+        def method(*arg, **kw):
+            if '_info' not in kw:
+                # what action_method would compute if called directly
+                backframes = kw.pop('_backframes', 2)
+                info = call_site_info(self._config.registry, backframes)
+                kw['_info'] = (info.file, info.line, info.function,
+                               info._src)
+            self._records.append((self._package_name, name, arg, kw))
+            return attr(*arg, **kw)
+        return method
+
+def replay_scan(config, records):
+    """ Make the configurator method calls recorded by a
+    :class:`ScanRecorder` again."""
+    for package_name, name, arg, kw in records:
+        target = config
+        if package_name is not None:
+            target = config.with_package(package_name)
+        getattr(target, name)(*arg, **kw)
+
+def scan_snapshot_key(package, categories, ignore, settings):
+    """ Return a string which changes whenever a scan of ``package`` with
+    the given arguments and settings could make different configuration
+    calls, or ``None`` if that can't be known.  It is based on the names,
+    sizes and modification times of the package's Python source files."""
+    categories = tuple(categories or ())
+    if ignore is None:
+        ignore = ()
+    elif is_nonstr_iter(ignore):
+        ignore = tuple(ignore)
+    else:
+        ignore = (ignore,)
+    for value in categories + ignore:
+        if not isinstance(value, (binary_type, text_type)):
+            return None
+    if hasattr(package, '__path__'):
+        paths = list(package.__path__)
+    else:
+        paths = [package.__file__]
+    digest = md5()
+    digest.update(bytes_(repr((
+        _SNAPSHOT_VERSION, sys.version, package.__name__, categories, ignore,
+        sorted((settings or {}).items())
+        ))))
+    for path in paths:
+        if not os.path.isdir(path):
+            if path.endswith(('.pyc', '.pyo')):
+                path = path[:-1]
+            walk = [(os.path.dirname(path), [], [os.path.basename(path)])]
+        else:
+            walk = os.walk(path)
+        for dirpath, dirnames, filenames in walk:
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.endswith('.py'):
+                    filename = os.path.join(dirpath, name)
+                    st = os.stat(filename)
+                    digest.update(bytes_(repr(
+                        (filename, st.st_mtime, st.st_size))))
+    return digest.hexdigest()
+
+_simple_types = (binary_type, text_type, int, float, bool, type(None),
+                 tuple, list, dict, set, frozenset)
+if not PY3: # pragma: no cover
+    _simple_types += (long,)
+    _global_types = (type, types.ClassType, types.FunctionType,
+                     types.BuiltinFunctionType)
+else: # pragma: no cover
+    _global_types = (type, types.FunctionType, types.BuiltinFunctionType)
+
+class _GlobalsIndex(object):
+    # Finds the module attribute which refers to an object, so that objects
+    # which pickle would otherwise copy (e.g. ``null_renderer``) are
+    # recorded by reference.
+    def __init__(self):
+        self.names = None
+
+    def __call__(self, obj):
+        if isinstance(obj, _simple_types):
+            return None
+        if self.names is None:
+            self.names = {}
+            for modname, module in list(sys.modules.items()):
+                if module is None:
+                    continue
+                for attrname, value in list(vars(module).items()):
+                    self.names.setdefault(id(value), (modname, attrname))
+        name = self.names.get(id(obj))
+        if name is not None:
+            return name
+        if isinstance(obj, _global_types):
+            return None # pickled by name
+        raise pickle.PicklingError('Can\'t record %r' % (obj,))
+
+def _load_global(name):
+    modname, attrname = name
+    __import__(modname)
+    return getattr(sys.modules[modname], attrname)
+
+def write_scan_snapshot(path, key, records):
+    """ Write the ``records`` of a :class:`ScanRecorder` to the file named
+    ``path`` along with ``key``, unless they can't be replayed.  Return
+    whether the snapshot was written."""
+    if None in records:
+        return False
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(key, f, pickle.HIGHEST_PROTOCOL)
+            pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+            pickler.persistent_id = _GlobalsIndex()
+            pickler.dump(records)
+        try:
+            os.rename(tmp, path)
+        except OSError: # pragma: no cover (windows)
+            os.remove(path)
+            os.rename(tmp, path)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        os.remove(tmp)
+        return False
+    except:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return True
+
+def read_scan_snapshot(path, key):
+    """ Return the records stored in the snapshot file named ``path`` if
+    it was written with ``key``, or ``None``."""
+    try:
+        f = open(path, 'rb')
+    except (IOError, OSError):
+        return None
+    try:
+        try:
+            if pickle.load(f) != key:
+                return None
+            unpickler = pickle.Unpickler(f)
+            unpickler.persistent_load = _load_global
+            return unpickler.load()
+        except Exception:
+            # a damaged snapshot or one naming objects which are gone
+            return None
+    finally:
+        f.close()
+
+# Module-at-a-time scans (see ``Configurator.scan``), used to time the
+# import and the scan of each module of a package, and to scan only the
+# modules listed in a scan index.
+
+def _scan_ignore(package_name, ignore):
+    # the meaning Venusian gives to the ``ignore`` argument of a scan
+    if ignore is None:
+        ignore = ()
+    elif not is_nonstr_iter(ignore):
+        ignore = (ignore,)
+    def _ignore(fullname):
+        for ign in ignore:
+            if callable(ign):
+                if ign(fullname):
+                    return True
+            else:
+                if ign.startswith('.'):
+                    ign = package_name + ign
+                if fullname.startswith(ign):
+                    return True
+        return False
+    return _ignore
+
+def _is_source(importer, name):
+    # Venusian only scans modules which have source files (not orphaned
+    # bytecode files) and packages
+    loader = importer.find_module(name)
+    if loader is None: # pragma: no cover
+        return False
+    try:
+        etc = getattr(loader, 'etc', None)
+        if etc is not None:
+            return etc[2] in (imp.PY_SOURCE, imp.PKG_DIRECTORY)
+        filename = loader.get_filename(name) # pragma: no cover
+        return not filename.endswith(('.pyc', '.pyo')) # pragma: no cover
+    finally:
+        f = getattr(loader, 'file', None)
+        if f is not None:
+            f.close()
+
+def _submodule_names(module, ignore):
+    names = []
+    for importer, name, ispkg in pkgutil.iter_modules(
+        getattr(module, '__path__', None) or [], module.__name__ + '.'):
+        if not ignore(name) and _is_source(importer, name):
+            names.append(name)
+    return names
+
+def scan_modules(scanner, package, categories=None, onerror=None,
+                 ignore=None, modules=None, records=None):
+    """ Scan ``package`` with the Venusian ``scanner``, as ``scanner.scan``
+    would, but importing and scanning one module at a time.  If ``modules``
+    is not ``None``, it is a sequence of the dotted names of the modules to
+    scan, and no other module of the package is imported.
+
+    Return a list of ``(name, import_seconds, scan_seconds, calls)``
+    tuples, one per module, in scan order.  ``calls`` is the number of
+    items added to ``records`` (usually the records of the
+    :class:`ScanRecorder` used as the ``config`` of the scanner) while the
+    module was scanned, or ``None`` if ``records`` is ``None``."""
+    _ignore = _scan_ignore(package.__name__, ignore)
+    if modules is None:
+        pending = [package.__name__]
+    else:
+        pending = list(modules)
+    pending.reverse()
+    stats = []
+    while pending:
+        name = pending.pop()
+        start = time.time()
+        try:
+            __import__(name)
+        except Exception:
+            if onerror is None:
+                raise
+            onerror(name)
+            continue
+        imported = time.time()
+        module = sys.modules[name]
+        submodules = _submodule_names(module, _ignore)
+        if submodules:
+            # scan the members of the package only; its submodules are
+            # scanned in turn
+            skip = set(submodules)
+            member_ignore = [_ignore, skip.__contains__]
+        else:
+            member_ignore = _ignore
+        before = records is not None and len(records)
+        scanner.scan(module, categories=categories, onerror=onerror,
+                     ignore=member_ignore)
+        end = time.time()
+        calls = None
+        if records is not None:
+            calls = len(records) - before
+        stats.append((name, imported - start, end - imported, calls))
+        if modules is None:
+            pending.extend(reversed(submodules))
+    return stats
+
+def write_scan_profile(out, stats):
+    """ Write a report of the ``stats`` returned by :func:`scan_modules` to
+    the file-like object ``out``, slowest modules first."""
+    stats = sorted(stats, key=lambda s: s[1] + s[2], reverse=True)
+    width = max([len(s[0]) for s in stats] + [len('Module')])
+    line = '%%-%ds  %%9s  %%9s  %%9s\n' % width
+    out.write(line % ('Module', 'Import', 'Scan', 'Total'))
+    out.write(line % ('-' * width, '-' * 9, '-' * 9, '-' * 9))
+    total_import = total_scan = 0.0
+    for name, import_seconds, scan_seconds, calls in stats:
+        total_import += import_seconds
+        total_scan += scan_seconds
+        out.write(line % (name, '%.4fs' % import_seconds,
+                          '%.4fs' % scan_seconds,
+                          '%.4fs' % (import_seconds + scan_seconds)))
+    out.write(line % ('-' * width, '-' * 9, '-' * 9, '-' * 9))
+    out.write(line % ('%d modules' % len(stats), '%.4fs' % total_import,
+                      '%.4fs' % total_scan,
+                      '%.4fs' % (total_import + total_scan)))
+
+def write_scan_index(path, key, names):
+    """ Write a scan index, the dotted ``names`` of the modules to scan, to
+    the file named ``path`` along with ``key``."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(key + '\n')
+            for name in names:
+                f.write(name + '\n')
+        try:
+            os.rename(tmp, path)
+        except OSError: # pragma: no cover (windows)
+            os.remove(path)
+            os.rename(tmp, path)
+    except:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def read_scan_index(path, key):
+    """ Return the module names stored in the scan index file named
+    ``path`` if it was written with ``key``, or ``None``."""
+    try:
+        with open(path, 'r') as f:
+            lines = f.read().splitlines()
+    except (IOError, OSError):
+        return None
+    if not lines or lines[0] != key:
+        return None
+    return lines[1:]
@@ -1,3 +1,4 @@
+import copy
 import inspect
 import operator
 import os
@@ -25,6 +26,7 @@ from pyramid.interfaces import (
     IResponse,
     IRouteRequest,
     ISecuredView,
+    IRoutesMapper,
     IStaticURLInfo,
     IView,
     IViewClassifier,
@@ -39,7 +41,6 @@ from pyramid.compat import (
     string_types,
     urlparse,
     im_func,
-    url_quote,
     WIN,
     )
 
@@ -54,8 +55,12 @@ from pyramid.httpexceptions import (
     )
 
 from pyramid.security import NO_PERMISSION_REQUIRED
-from pyramid.static import static_view
+from pyramid.static import (
+    PathSegmentMd5CacheBuster,
+    static_view,
+    )
 from pyramid.threadlocal import get_current_registry
+from pyramid.traversal import quote_path_segment
 
 from pyramid.view import (
     render_view_to_response,
@@ -83,8 +88,8 @@ def view_description(view):
         return object_description(view)
 
 def wraps_view(wrapper):
-    def inner(self, view):
-        wrapper_view = wrapper(self, view)
+    def inner(self, view, *arg):
+        wrapper_view = wrapper(self, view, *arg)
         return preserve_view_attrs(view, wrapper_view)
     return inner
 
@@ -131,17 +136,21 @@ class ViewDeriver(object):
         self.logger = self.registry.queryUtility(IDebugLogger)
 
     def __call__(self, view):
-        return self.attr_wrapped_view(
-            self.predicated_view(
-                self.authdebug_view(
-                    self.secured_view(
-                        self.owrapped_view(
-                            self.http_cached_view(
-                                self.decorated_view(
-                                    self.rendered_view(
-                                        self.mapped_view(
-                                            self.text_wrapped_view(
-                                                view))))))))))
+        # The derived view is "compiled" from the options which are actually
+        # in use for this registration: rendering and HTTP caching share a
+        # single wrapper, and predicates, authorization debugging, security
+        # and the MultiView attributes share another.  Options which are
+        # not in use add no wrapper at all.
+        view = self.mapped_view(self.text_wrapped_view(view))
+        if self.kw.get('decorator') is None:
+            derived = self.response_view(view)
+        else:
+            # a decorator must be handed a view which returns a response,
+            # and its result must be subject to HTTP caching
+            view = self.decorated_view(self.rendered_view(view))
+            derived = self.http_cached_view(view)
+        derived = self.owrapped_view(derived)
+        return self.guarded_view(derived, derived is not view)
 
     @wraps_view
     def text_wrapped_view(self, view):
@@ -186,15 +195,55 @@ class ViewDeriver(object):
             return wrapped_response
         return _owrapped_view
 
+    @wraps_view
+    def response_view(self, view):
+        return self._response_view(view, self._result_converter(view),
+                                   self._http_cache())
+
+    @wraps_view
+    def rendered_view(self, view):
+        # one way or another this wrapper must produce a Response (unless
+        # the renderer is a NullRendererHelper)
+        return self._response_view(view, self._result_converter(view), None)
+
     @wraps_view
     def http_cached_view(self, view):
-        if self.registry.settings.get('prevent_http_cache', False):
+        return self._response_view(view, None, self._http_cache())
+
+    def _response_view(self, view, convert, http_cache):
+        if convert is None and http_cache is None:
             return view
 
+        registry = self.registry
+        if http_cache is not None:
+            seconds, options = http_cache
+
+        def response_view(context, request):
+            response = view(context, request)
+            if convert is not None:
+                result = response
+                # this must adapt, it can't do a simple interface check
+                # (avoid trying to render webob responses)
+                response = registry.queryAdapterOrSelf(result, IResponse)
+                if response is None:
+                    response = convert(context, request, result)
+            if http_cache is not None:
+                prevent_caching = getattr(response.cache_control,
+                                          'prevent_auto', False)
+                if not prevent_caching:
+                    response.cache_expires(seconds, **options)
+            return response
+
+        return response_view
+
+    def _http_cache(self):
+        if self.registry.settings.get('prevent_http_cache', False):
+            return None
+
         seconds = self.kw.get('http_cache')
 
         if seconds is None:
-            return view
+            return None
 
         options = {}
 
@@ -206,186 +255,163 @@ class ViewDeriver(object):
                     'If http_cache parameter is a tuple or list, it must be '
                     'in the form (seconds, options); not %s' % (seconds,))
 
-        def wrapper(context, request):
-            response = view(context, request)
-            prevent_caching = getattr(response.cache_control, 'prevent_auto',
-                                      False)
-            if not prevent_caching:
-                response.cache_expires(seconds, **options)
-            return response
-
-        return wrapper
+        return seconds, options
 
-    @wraps_view
-    def secured_view(self, view):
-        permission = self.kw.get('permission')
-        if permission == NO_PERMISSION_REQUIRED:
-            # allow views registered within configurations that have a
-            # default permission to explicitly override the default
-            # permission, replacing it with no permission at all
-            permission = None
-
-        wrapped_view = view
-        if self.authn_policy and self.authz_policy and (permission is not None):
-            def _permitted(context, request):
-                principals = self.authn_policy.effective_principals(request)
-                return self.authz_policy.permits(context, principals,
-                                                 permission)
-            def _secured_view(context, request):
-                result = _permitted(context, request)
-                if result:
-                    return view(context, request)
-                view_name = getattr(view, '__name__', view)
-                msg = getattr(
-                    request, 'authdebug_message',
-                    'Unauthorized: %s failed permission check' % view_name)
-                raise HTTPForbidden(msg, result=result)
-            _secured_view.__call_permissive__ = view
-            _secured_view.__permitted__ = _permitted
-            _secured_view.__permission__ = permission
-            wrapped_view = _secured_view
-
-        return wrapped_view
-
-    @wraps_view
-    def authdebug_view(self, view):
-        wrapped_view = view
-        settings = self.registry.settings
-        permission = self.kw.get('permission')
-        if settings and settings.get('debug_authorization', False):
-            def _authdebug_view(context, request):
-                view_name = getattr(request, 'view_name', None)
-
-                if self.authn_policy and self.authz_policy:
-                    if permission is None:
-                        msg = 'Allowed (no permission registered)'
-                    else:
-                        principals = self.authn_policy.effective_principals(
-                            request)
-                        msg = str(self.authz_policy.permits(context, principals,
-                                                            permission))
-                else:
-                    msg = 'Allowed (no authorization policy in use)'
-
-                view_name = getattr(request, 'view_name', None)
-                url = getattr(request, 'url', None)
-                msg = ('debug_authorization of url %s (view name %r against '
-                       'context %r): %s' % (url, view_name, context, msg))
-                self.logger and self.logger.debug(msg)
-                if request is not None:
-                    request.authdebug_message = msg
-                return view(context, request)
+    def _result_converter(self, view):
+        renderer = self.kw.get('renderer')
+        if renderer is None:
+            # register a default renderer if you want super-dynamic
+            # rendering.  registering a default renderer will also allow
+            # override_renderer to work if a renderer is left unspecified for
+            # a view registration.
+            return self._response_resolver(view)
+        if renderer is renderers.null_renderer:
+            return None
+        return self._renderer(view, renderer)
 
-            wrapped_view = _authdebug_view
+    def _renderer(self, view, view_renderer):
+        registry = self.registry
+        def render(context, request, result):
+            renderer = view_renderer
+            attrs = getattr(request, '__dict__', {})
+            if 'override_renderer' in attrs:
+                # renderer overridden by newrequest event or other
+                renderer_name = attrs.pop('override_renderer')
+                renderer = renderers.RendererHelper(
+                    name=renderer_name,
+                    package=self.kw.get('package'),
+                    registry = registry)
+            if '__view__' in attrs:
+                view_inst = attrs.pop('__view__')
+            else:
+                view_inst = getattr(view, '__original_view__', view)
+            return renderer.render_view(request, result, view_inst, context)
+
+        return render
+
+    def _response_resolver(self, view):
+        def resolve(context, request, result):
+            if result is None:
+                append = (' You may have forgotten to return a value from '
+                          'the view callable.')
+            elif isinstance(result, dict):
+                append = (' You may have forgotten to define a renderer in '
+                          'the view configuration.')
+            else:
+                append = ''
+            msg = ('Could not convert return value of the view callable %s '
+                  'into a response object. '
+                  'The value returned was %r.' + append)
 
-        return wrapped_view
+            raise ValueError(msg % (view_description(view), result))
 
-    @wraps_view
-    def predicated_view(self, view):
-        predicates = self.kw.get('predicates', ())
-        if not predicates:
-            return view
-        def predicate_wrapper(context, request):
-            if all((predicate(context, request) for predicate in predicates)):
-                return view(context, request)
-            view_name = getattr(view, '__name__', view)
-            raise PredicateMismatch(
-                'predicate mismatch for view %s' % view_name)
-        def checker(context, request):
-            return all((predicate(context, request) for predicate in
-                        predicates))
-        predicate_wrapper.__predicated__ = checker
-        predicate_wrapper.__predicates__ = predicates
-        return predicate_wrapper
+        return resolve
 
     @wraps_view
-    def attr_wrapped_view(self, view):
+    def guarded_view(self, view, owned=False):
+        # ``owned`` is true if ``view`` is a wrapper created by this deriver,
+        # which lets us attach attributes to it without another wrapper
         kw = self.kw
+        predicates = kw.get('predicates', ())
+        permission = kw.get('permission')
         accept, order, phash = (kw.get('accept', None),
                                 kw.get('order', MAX_ORDER),
                                 kw.get('phash', DEFAULT_PHASH))
-        # this is a little silly but we don't want to decorate the original
-        # function with attributes that indicate accept, order, and phash,
-        # so we use a wrapper
-        if (
+        settings = self.registry.settings
+        authdebug = bool(settings and
+                         settings.get('debug_authorization', False))
+        authn_policy = self.authn_policy
+        authz_policy = self.authz_policy
+
+        permitted = None
+        if (authn_policy and authz_policy and (permission is not None) and
+            permission != NO_PERMISSION_REQUIRED):
+            # views registered within configurations that have a default
+            # permission may explicitly override the default permission
+            # with NO_PERMISSION_REQUIRED, replacing it with no permission
+            # at all
+            def permitted(context, request):
+                principals = authn_policy.effective_principals(request)
+                return authz_policy.permits(context, principals, permission)
+
+        if predicates or authdebug or (permitted is not None):
+            view_name = getattr(view, '__name__', view)
+            authdebug_view = authdebug and self._authdebug_view
+            def guarded_view(context, request):
+                for predicate in predicates:
+                    if not predicate(context, request):
+                        raise PredicateMismatch(
+                            'predicate mismatch for view %s' % view_name)
+                if authdebug_view:
+                    authdebug_view(context, request)
+                if permitted is not None:
+                    result = permitted(context, request)
+                    if not result:
+                        msg = getattr(
+                            request, 'authdebug_message',
+                            'Unauthorized: %s failed permission check' %
+                            view_name)
+                        raise HTTPForbidden(msg, result=result)
+                return view(context, request)
+        elif (
             (accept is None) and
             (order == MAX_ORDER) and
             (phash == DEFAULT_PHASH)
             ):
             return view # defaults
-        def attr_view(context, request):
-            return view(context, request)
-        attr_view.__accept__ = accept
-        attr_view.__order__ = order
-        attr_view.__phash__ = phash
-        attr_view.__view_attr__ = self.kw.get('attr')
-        attr_view.__permission__ = self.kw.get('permission')
-        return attr_view
+        elif owned:
+            guarded_view = view
+        else:
+            # this is a little silly but we don't want to decorate the
+            # original function with attributes that indicate accept, order,
+            # and phash, so we use a wrapper
+            def guarded_view(context, request):
+                return view(context, request)
 
-    @wraps_view
-    def rendered_view(self, view):
-        # one way or another this wrapper must produce a Response (unless
-        # the renderer is a NullRendererHelper)
-        renderer = self.kw.get('renderer')
-        if renderer is None:
-            # register a default renderer if you want super-dynamic
-            # rendering.  registering a default renderer will also allow
-            # override_renderer to work if a renderer is left unspecified for
-            # a view registration.
-            return self._response_resolved_view(view)
-        if renderer is renderers.null_renderer:
-            return view
-        return self._rendered_view(view, renderer)
+        if permitted is not None:
+            guarded_view.__call_permissive__ = view
+            guarded_view.__permitted__ = permitted
+            guarded_view.__permission__ = permission
 
-    def _rendered_view(self, view, view_renderer):
-        def rendered_view(context, request):
-            renderer = view_renderer
-            result = view(context, request)
-            registry = self.registry
-            # this must adapt, it can't do a simple interface check
-            # (avoid trying to render webob responses)
-            response = registry.queryAdapterOrSelf(result, IResponse)
-            if response is None:
-                attrs = getattr(request, '__dict__', {})
-                if 'override_renderer' in attrs:
-                    # renderer overridden by newrequest event or other
-                    renderer_name = attrs.pop('override_renderer')
-                    renderer = renderers.RendererHelper(
-                        name=renderer_name,
-                        package=self.kw.get('package'),
-                        registry = registry)
-                if '__view__' in attrs:
-                    view_inst = attrs.pop('__view__')
-                else:
-                    view_inst = getattr(view, '__original_view__', view)
-                response = renderer.render_view(request, result, view_inst,
-                                                context)
-            return response
+        if predicates:
+            def checker(context, request):
+                return all((predicate(context, request) for predicate in
+                            predicates))
+            guarded_view.__predicated__ = checker
+            guarded_view.__predicates__ = predicates
+
+        if (
+            (accept is not None) or
+            (order != MAX_ORDER) or
+            (phash != DEFAULT_PHASH)
+            ):
+            guarded_view.__accept__ = accept
+            guarded_view.__order__ = order
+            guarded_view.__phash__ = phash
+            guarded_view.__view_attr__ = kw.get('attr')
+            guarded_view.__permission__ = permission
 
-        return rendered_view
+        return guarded_view
 
-    def _response_resolved_view(self, view):
-        registry = self.registry
-        def viewresult_to_response(context, request):
-            result = view(context, request)
-            response = registry.queryAdapterOrSelf(result, IResponse)
-            if response is None:
-                if result is None:
-                    append = (' You may have forgotten to return a value from '
-                              'the view callable.')
-                elif isinstance(result, dict):
-                    append = (' You may have forgotten to define a renderer in '
-                              'the view configuration.')
-                else:
-                    append = ''
-                msg = ('Could not convert return value of the view callable %s '
-                      'into a response object. '
-                      'The value returned was %r.' + append)
-                    
-                raise ValueError(msg % (view_description(view), result))
-            return response
+    def _authdebug_view(self, context, request):
+        permission = self.kw.get('permission')
+        if self.authn_policy and self.authz_policy:
+            if permission is None:
+                msg = 'Allowed (no permission registered)'
+            else:
+                principals = self.authn_policy.effective_principals(request)
+                msg = str(self.authz_policy.permits(context, principals,
+                                                    permission))
+        else:
+            msg = 'Allowed (no authorization policy in use)'
 
-        return viewresult_to_response
+        view_name = getattr(request, 'view_name', None)
+        url = getattr(request, 'url', None)
+        msg = ('debug_authorization of url %s (view name %r against '
+               'context %r): %s' % (url, view_name, context, msg))
+        self.logger and self.logger.debug(msg)
+        if request is not None:
+            request.authdebug_message = msg
 
     @wraps_view
     def decorated_view(self, view):
@@ -540,6 +566,15 @@ class MultiView(object):
         self.views = []
         self.accepts = []
 
+    def __copy__(self):
+        # a multiview sharing the views, but not the lists holding them
+        result = self.__class__(self.name)
+        result.views = list(self.views)
+        result.media_views = dict(
+            (accept, list(views)) for accept, views in self.media_views.items())
+        result.accepts = list(self.accepts)
+        return result
+
     def __discriminator__(self, context, request):
         # used by introspection systems like so:
         # view = adapters.lookup(....)
@@ -1103,8 +1138,6 @@ class ViewsConfiguratorMixin(object):
             # see also MultiView.__discriminator__
             view_intr['derived_callable'] = derived_view
 
-            registered = self.registry.adapters.registered
-
             # A multiviews is a set of views which are registered for
             # exactly the same context type/request type/name triad.  Each
             # consituent view in a multiview differs only by the
@@ -1123,12 +1156,24 @@ class ViewsConfiguratorMixin(object):
             # doing registrations, and ``registered`` performs exact
             # matches on all the arguments it receives.
 
+            # In a registry created by Configurator.overlay, a view
+            # registered for the triad in a base registry must be merged
+            # with too, or the views for it which have other predicates
+            # would be hidden by the new registration.  A multiview found
+            # in a base registry is copied rather than changed.
+
             old_view = None
+            inherited = False
 
-            for view_type in (IView, ISecuredView, IMultiView):
-                old_view = registered((IViewClassifier, request_iface,
-                                       r_context), view_type, name)
+            for adapters in self.registry.adapters.ro:
+                for view_type in (IView, ISecuredView, IMultiView):
+                    old_view = adapters.registered(
+                        (IViewClassifier, request_iface, r_context),
+                        view_type, name)
+                    if old_view is not None:
+                        break
                 if old_view is not None:
+                    inherited = adapters is not self.registry.adapters
                     break
 
             isexc = isexception(context)
@@ -1172,7 +1217,9 @@ class ViewsConfiguratorMixin(object):
                 # multiview's consituent views have a permission
                 # associated with them, but this code is getting pretty
                 # rough already
-                if is_multiview:
+                if is_multiview and inherited:
+                    multiview = copy.copy(old_view)
+                elif is_multiview:
                     multiview = old_view
                 else:
                     multiview = MultiView(name)
@@ -1527,6 +1574,41 @@ class ViewsConfiguratorMixin(object):
         viewing.  If ``permission`` is specified, the security checking will
         be performed against the default root factory ACL.
 
+        The ``file_cache_size``, ``file_cache_max_body`` and
+        ``file_cache_interval`` keyword arguments configure a cache of
+        information about (and the contents of small) static files served
+        by the view; see :class:`pyramid.static.static_view` for their
+        meaning.  By default, no such cache is used.  Like
+        ``cache_max_age``, they have no effect when the ``name`` is a *url
+        prefix*.
+
+        If the ``gzip`` keyword argument is ``True``, static assets are
+        served gzip compressed to clients which accept it; precompressed
+        ``.gz`` siblings of the assets (see :ref:`precompressing_static_files`)
+        are used when they exist.  See :class:`pyramid.static.static_view`
+        for details.  By default, this argument is ``False``.
+
+        The ``block_size``, ``sendfile_header`` and ``sendfile_prefix``
+        keyword arguments set the number of bytes read from a static asset
+        at a time while serving it and let a front-end web server send the
+        assets instead (e.g. using ``X-Sendfile`` or ``X-Accel-Redirect``);
+        see :class:`pyramid.static.static_view` for their meaning.
+
+        The ``cachebust`` keyword argument, if passed, makes the URLs
+        generated for the static assets (see
+        :meth:`pyramid.request.Request.static_url`) change whenever the
+        assets themselves do, so that browsers can cache the assets for as
+        long as possible.  It may be ``True``, meaning that the MD5
+        checksum of the contents of each asset is included in its URL (see
+        :class:`pyramid.static.PathSegmentMd5CacheBuster`), or an object
+        implementing :class:`pyramid.interfaces.ICacheBuster` such as
+        :class:`pyramid.static.ManifestCacheBuster`.  Responses to requests
+        for such URLs carry headers allowing the asset to be cached for a
+        year without revalidation (``Cache-Control: max-age=31536000,
+        public, immutable``).  ``cachebust`` also applies when the ``name``
+        is a *url prefix*, though the static view is then not served by
+        :app:`Pyramid`.  By default, URLs are not cache-busted.
+
         Any other keyword arguments sent to ``add_static_view`` are passed on
         to :meth:`pyramid.config.Configurator.add_route` (e.g. ``factory``,
         perhaps to define a custom factory with a custom ACL for this static
@@ -1619,28 +1701,98 @@ class StaticURLInfo(object):
         try:
             reg = registry._static_url_registrations
         except AttributeError:
-            reg = registry._static_url_registrations = []
+            reg = []
+            # start from the registrations of a base registry, if any
+            for base in getattr(registry, '__bases__', ()):
+                base_reg = getattr(base, '_static_url_registrations', None)
+                if base_reg is not None:
+                    reg = list(base_reg)
+                    break
+            registry._static_url_registrations = reg
         return reg
 
+    def _get_index(self, registry):
+        # The registrations keyed by spec, for longest-prefix lookups.  Each
+        # value is a [url, route_name, cachebust, route_path] list, where
+        # route_path is the path generated by the route of a view name
+        # registration for an empty subpath, computed on first use.
+        try:
+            index = registry._static_url_index
+        except AttributeError:
+            index = None
+        if index is None:
+            index = {}
+            for (url, spec, route_name, cachebust) in self._get_registrations(
+                registry):
+                if spec not in index:
+                    index[spec] = [url, route_name, cachebust, None]
+            registry._static_url_index = index
+        return index
+
     def generate(self, path, request, **kw):
         try:
             registry = request.registry
         except AttributeError: # bw compat (for tests)
             registry = get_current_registry()
-        for (url, spec, route_name) in self._get_registrations(registry):
-            if path.startswith(spec):
-                subpath = path[len(spec):]
-                if WIN: # pragma: no cover
-                    subpath = subpath.replace('\\', '/') # windows
-                if url is None:
-                    kw['subpath'] = subpath
-                    return request.route_url(route_name, **kw)
-                else:
-                    subpath = url_quote(subpath)
-                    return urljoin(url, subpath)
+        index = self._get_index(registry)
+        # specs end with a separator; try the prefixes of path which do,
+        # longest first
+        end = len(path)
+        while True:
+            end = path.rfind('/', 0, end)
+            if WIN: # pragma: no cover
+                end = max(end, path.rfind('\\', 0, end))
+            if end < 0:
+                break
+            entry = index.get(path[:end + 1])
+            if entry is not None:
+                return self._generate(entry, path, end + 1, registry,
+                                      request, kw)
 
         raise ValueError('No static URL definition matching %s' % path)
 
+    def _generate(self, entry, path, start, registry, request, kw):
+        url, route_name, cachebust, route_path = entry
+        subpath = path[start:]
+        if WIN: # pragma: no cover
+            subpath = subpath.replace('\\', '/') # windows
+        if cachebust is not None:
+            subpath, kw = cachebust.pregenerate(path, subpath, kw)
+
+        if url is not None:
+            subpath = quote_path_segment(subpath, safe='/')
+            if subpath.startswith('/') or '/.' in '/' + subpath:
+                # urljoin would treat these specially
+                return urljoin(url, subpath)
+            return url + subpath
+
+        if kw and (len(kw) > 1 or '_app_url' not in kw):
+            route_path = False
+        elif route_path is None:
+            route_path = entry[3] = self._route_path(registry, route_name)
+        if not route_path:
+            # route_url handles query strings, anchors, pregenerators, etc.
+            kw['subpath'] = subpath
+            return request.route_url(route_name, **kw)
+        app_url = kw.get('_app_url')
+        if app_url is None:
+            app_url = request.application_url
+        return app_url + route_path + quote_path_segment(subpath, safe='/')
+
+    def _route_path(self, registry, route_name):
+        # The path generated by a static view's route for an empty subpath,
+        # False if URLs must always be generated by request.route_url, or
+        # None if the route isn't registered (yet).
+        mapper = registry.queryUtility(IRoutesMapper)
+        if mapper is None:
+            return None
+        route = mapper.get_route(route_name)
+        if route is None:
+            return None
+        if route.pregenerator is not None:
+            return False
+        return route.generate({'subpath':''})
+
     def add(self, config, name, spec, **extra):
         # This feature only allows for the serving of a directory and
         # the files contained within, not of a single asset;
@@ -1664,6 +1816,10 @@ class StaticURLInfo(object):
             # make sure it ends with a slash
             name = name + '/'
 
+        cachebust = extra.pop('cachebust', None)
+        if cachebust is True:
+            cachebust = PathSegmentMd5CacheBuster()
+
         if url_parse(name)[0]:
             # it's a URL
             # url, spec, route_name
@@ -1673,9 +1829,16 @@ class StaticURLInfo(object):
             # it's a view name
             url = None
             cache_max_age = extra.pop('cache_max_age', None)
+            view_kw = {}
+            for key in ('file_cache_size', 'file_cache_max_body',
+                        'file_cache_interval', 'gzip', 'block_size',
+                        'sendfile_header', 'sendfile_prefix'):
+                if key in extra:
+                    view_kw[key] = extra.pop(key)
             # create a view
             view = static_view(spec, cache_max_age=cache_max_age,
-                               use_subpath=True)
+                               use_subpath=True, cachebust=cachebust,
+                               **view_kw)
 
             # Mutate extra to allow factory, etc to be passed through here.
             # Treat permission specially because we'd like to default to
@@ -1727,8 +1890,9 @@ class StaticURLInfo(object):
                 idx = names.index(name)
                 registrations.pop(idx)
 
-            # url, spec, route_name
-            registrations.append((url, spec, route_name))
+            # url, spec, route_name, cachebust
+            registrations.append((url, spec, route_name, cachebust))
+            config.registry._static_url_index = None
 
         intr = config.introspectable('static views',
                                      name,
@@ -1736,6 +1900,7 @@ class StaticURLInfo(object):
                                      'static view')
         intr['name'] = name
         intr['spec'] = spec
+        intr['cachebust'] = cachebust
 
         config.action(None, callable=register, introspectables=(intr,))
 
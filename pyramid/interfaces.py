@@ -899,6 +899,54 @@ class ISession(IDict):
         returned.
         """
 
+class ISessionStorage(Interface):
+    """ An interface representing the storage used by a server-side
+    session factory (see
+    :func:`pyramid.session.ServerSideSessionFactoryConfig`).  Sessions are
+    stored as ``(accessed, created, state)`` tuples, where ``accessed``
+    and ``created`` are integer timestamps and ``state`` is a dictionary
+    of pickleable values.  Implementations must be safe to use from
+    several threads at once."""
+
+    def load(session_id):
+        """ Return the tuple stored for the string ``session_id`` or
+        ``None`` if no session is stored under that id."""
+
+    def save(session_id, value):
+        """ Store the tuple ``value`` under ``session_id``, replacing any
+        value previously stored under that id."""
+
+    def delete(session_id):
+        """ Remove the session stored under ``session_id``, if any."""
+
+    def sweep(expired):
+        """ Remove all sessions which were last accessed before the
+        integer timestamp ``expired``."""
+
+class ICacheBuster(Interface):
+    """ An object which changes the URLs generated for the static assets of
+    a static view (see
+    :meth:`pyramid.config.Configurator.add_static_view`) whenever the
+    assets themselves change, so that browsers can cache the assets
+    forever; and which recognizes such URLs in requests.  Implementations
+    must be safe to use from several threads at once."""
+
+    def pregenerate(pathspec, subpath, kw):
+        """ Return a ``(subpath, kw)`` tuple: the ``subpath`` (a string
+        relative to the root of the static view) and keyword arguments
+        (those passed to :meth:`pyramid.request.Request.static_url`) with
+        which to generate the URL of the asset named ``pathspec`` (an
+        :term:`asset specification` or an absolute path).  This is called
+        every time a URL is generated, so should be fast."""
+
+    def match(subpath):
+        """ Return the tuple of path segments ``subpath`` of a requested URL
+        with whatever ``pregenerate`` added to it removed, or ``None`` if
+        the URL wasn't generated by ``pregenerate``.  The static view
+        serves the asset of a URL which matches with far-future caching
+        headers if ``pregenerate`` still generates that URL for the asset,
+        and with its usual caching headers otherwise."""
+
 class IRendererInfo(Interface):
     """ An object implementing this interface is passed to every
     :term:`renderer factory` constructor as its only argument (conventionally
@@ -1,4 +1,5 @@
 import os
+import posixpath
 import sys
 import threading
 
@@ -22,6 +23,7 @@ from pyramid.settings import asbool
 from pyramid.util import DottedNameResolver
 
 from mako.lookup import TemplateLookup
+from mako.template import Template
 from mako import exceptions
 
 class IMakoLookup(Interface):
@@ -29,6 +31,11 @@ class IMakoLookup(Interface):
 
 class PkgResourceTemplateLookup(TemplateLookup):
     """TemplateLookup subclass that handles asset specification URIs"""
+    def __init__(self, *arg, **kw):
+        TemplateLookup.__init__(self, *arg, **kw)
+        self._asset_paths = {}
+        self._load_locks = {}
+
     def adjust_uri(self, uri, relativeto):
         """Called from within a Mako template, avoids adjusting the
         uri if it looks like an asset specification"""
@@ -54,14 +61,51 @@ class PkgResourceTemplateLookup(TemplateLookup):
                 else:
                     return self._collection[uri]
             except KeyError:
-                pname, path = resolve_asset_spec(uri)
-                srcfile = abspath_from_asset_spec(path, pname)
-                if os.path.isfile(srcfile):
-                    return self._load(srcfile, uri)
-                raise exceptions.TopLevelLookupException(
-                    "Can not locate template for uri %r" % uri)
+                srcfile = self._asset_paths.get(uri)
+                if srcfile is None:
+                    pname, path = resolve_asset_spec(uri)
+                    srcfile = abspath_from_asset_spec(path, pname)
+                    if not os.path.isfile(srcfile):
+                        raise exceptions.TopLevelLookupException(
+                            "Can not locate template for uri %r" % uri)
+                    if not self.filesystem_checks:
+                        # the asset won't move unless we're checking
+                        self._asset_paths[uri] = srcfile
+                return self._load(srcfile, uri)
         return TemplateLookup.get_template(self, uri)
 
+    def _load(self, filename, uri):
+        # Mako loads every template while holding a single lookup-wide
+        # mutex; hold a lock specific to the template instead, so that
+        # concurrent first renders of different templates don't serialize
+        lock = self._load_locks.get(uri)
+        if lock is None:
+            # setdefault is atomic, so racing threads agree on one lock
+            lock = self._load_locks.setdefault(uri, threading.Lock())
+        lock.acquire()
+        try:
+            try:
+                # try returning from collection one more time in case a
+                # concurrent thread already loaded it
+                return self._collection[uri]
+            except KeyError:
+                pass
+            if self.modulename_callable is not None:
+                module_filename = self.modulename_callable(filename, uri)
+            else:
+                module_filename = None
+            template = Template(
+                uri=uri,
+                filename=posixpath.normpath(filename),
+                lookup=self,
+                module_filename=module_filename,
+                **self.template_args
+                )
+            self._collection[uri] = template
+            return template
+        finally:
+            lock.release()
+
 
 registry_lock = threading.Lock() 
 
@@ -90,6 +134,18 @@ class MakoRendererFactoryHelper(object):
             reload_templates = asbool(reload_templates)
             directories = sget('directories', [])
             module_directory = sget('module_directory', None)
+            if module_directory is None:
+                # share compiled templates with other processes using the
+                # same template cache directory
+                cache_directory = settings.get(
+                    'pyramid.template_cache_directory', None)
+                if cache_directory is None:
+                    cache_directory = settings.get('template_cache_directory',
+                                                   None)
+                if cache_directory:
+                    module_directory = os.path.join(
+                        os.path.abspath(cache_directory),
+                        settings_prefix.rstrip('.'))
             input_encoding = sget('input_encoding', 'utf-8')
             error_handler = sget('error_handler', None)
             default_filters = sget('default_filters', 'h')
@@ -1,5 +1,6 @@
 import os
 import pkg_resources
+import re
 import sys
 import imp
 
@@ -205,6 +206,12 @@ class AssetResolver(Resolver):
                 )
         return PkgResourcesAssetDescriptor(package_name, path)
 
+# a dotted name starting with one of these is relative to a package
+_relative_prefixes = ('.', ':')
+
+# the "module:attrs" part of an entry point, as parsed by pkg_resources
+_entry_point_re = re.compile(r'\s*([\w.]+)\s*(?::\s*([\w.]+))?\s*$')
+
 class DottedNameResolver(Resolver):
     """ A class used to resolve a :term:`dotted Python name` to a package or
     module object.
@@ -255,7 +262,16 @@ class DottedNameResolver(Resolver):
     passed the string ``xml.dom``, and ``.minidom`` is supplied to the
     :meth:`~pyramid.path.DottedNameResolver.resolve` method, the resulting
     import would be for ``xml.minidom``.
+
+    A resolver remembers the objects it has resolved, so resolving the same
+    name again doesn't import or look it up again.  Use
+    :meth:`~pyramid.path.DottedNameResolver.clear_cache` to make it forget
+    them (e.g. after reloading a module).
     """
+    def __init__(self, package=CALLER_PACKAGE):
+        Resolver.__init__(self, package)
+        self._cache = {}
+
     def resolve(self, dotted):
         """
         This method resolves a dotted name reference to a global Python
@@ -294,7 +310,10 @@ class DottedNameResolver(Resolver):
             raise ValueError('%r is not a string' % (dotted,))
         package = self.package
         if package is CALLER_PACKAGE:
-            package = caller_package()
+            if dotted.startswith(_relative_prefixes):
+                package = caller_package()
+            else:
+                package = None
         return self._resolve(dotted, package)
 
     def maybe_resolve(self, dotted):
@@ -314,15 +333,37 @@ class DottedNameResolver(Resolver):
         if isinstance(dotted, string_types):
             package = self.package
             if package is CALLER_PACKAGE:
-                package = caller_package()
+                if dotted.startswith(_relative_prefixes):
+                    package = caller_package()
+                else:
+                    package = None
             return self._resolve(dotted, package)
         return dotted
 
+    def clear_cache(self):
+        """ Forget the objects resolved so far by this resolver; names
+        resolved afterwards are imported and looked up again.
+
+        .. note:: This API is new as of Pyramid 1.3.
+        """
+        self._cache.clear()
+
     def _resolve(self, dotted, package):
+        # names which aren't relative resolve to the same object whatever
+        # the package
+        key = dotted
+        if dotted.startswith(_relative_prefixes):
+            key = (dotted, package)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
         if ':' in dotted:
-            return self._pkg_resources_style(dotted, package)
+            result = self._pkg_resources_style(dotted, package)
         else:
-            return self._zope_dottedname_style(dotted, package)
+            result = self._zope_dottedname_style(dotted, package)
+        self._cache[key] = result
+        return result
 
     def _pkg_resources_style(self, value, package):
         """ package.module:attr style """
@@ -335,8 +376,22 @@ class DottedNameResolver(Resolver):
                 value = package.__name__
             else:
                 value = package.__name__ + value
-        return pkg_resources.EntryPoint.parse(
-            'x=%s' % value).load(False)
+        match = _entry_point_re.match(value)
+        if match is None:
+            # let pkg_resources parse (or reject) anything unusual, such as
+            # a name with extras
+            return pkg_resources.EntryPoint.parse(
+                'x=%s' % value).load(False)
+        module_name, attrs = match.groups()
+        __import__(module_name)
+        found = sys.modules[module_name]
+        if attrs:
+            for attr in attrs.split('.'):
+                try:
+                    found = getattr(found, attr)
+                except AttributeError:
+                    raise ImportError('%r has no %r attribute' % (found, attr))
+        return found
 
     def _zope_dottedname_style(self, value, package):
         """ package.module.attr style """
@@ -76,7 +76,15 @@ class Registry(Components, dict):
     # backwards compatibility for code that wants to look up a settings
     # object via ``registry.getUtility(ISettings)``
     def _get_settings(self):
-        return self._settings
+        settings = self._settings
+        if settings is None:
+            # a registry derived from others (see
+            # ``pyramid.config.Configurator.overlay``) shares their settings
+            for base in self.__bases__:
+                settings = getattr(base, 'settings', None)
+                if settings is not None:
+                    break
+        return settings
 
     def _set_settings(self, settings):
         self.registerUtility(settings, ISettings)
@@ -86,10 +94,17 @@ class Registry(Components, dict):
 
 @implementer(IIntrospector)
 class Introspector(object):
-    def __init__(self):
+    def __init__(self, base=None):
+        # ``base`` is the introspector of the registry which the registry of
+        # this one is an overlay on (see
+        # ``pyramid.config.Configurator.overlay``), if any; its
+        # introspectables are visible through this introspector
         self._refs = {}
         self._categories = {}
         self._counter = 0
+        self.base = base
+        if base is not None:
+            self._counter = base._counter
 
     def add(self, intr):
         category = self._categories.setdefault(intr.category_name, {})
@@ -100,13 +115,29 @@ class Introspector(object):
 
     def get(self, category_name, discriminator, default=None):
         category = self._categories.setdefault(category_name, {})
-        intr = category.get(discriminator, default)
+        intr = category.get(discriminator)
+        if intr is None:
+            if self.base is not None:
+                return self.base.get(category_name, discriminator, default)
+            return default
         return intr
 
+    def _category(self, category_name):
+        category = self._categories.get(category_name)
+        if self.base is not None:
+            base_category = self.base._category(category_name)
+            if base_category is not None:
+                if category is None:
+                    return base_category
+                base_category = base_category.copy()
+                base_category.update(category)
+                return base_category
+        return category
+
     def get_category(self, category_name, default=None, sort_key=None):
         if sort_key is None:
             sort_key = operator.attrgetter('order')
-        category = self._categories.get(category_name)
+        category = self._category(category_name)
         if category is None:
             return default
         values = category.values()
@@ -125,10 +156,13 @@ class Introspector(object):
         return L
 
     def categories(self):
-        return sorted(self._categories.keys())
+        names = set(self._categories.keys())
+        if self.base is not None:
+            names.update(self.base.categories())
+        return sorted(names)
 
     def remove(self, category_name, discriminator):
-        intr = self.get(category_name, discriminator)
+        intr = self._categories.get(category_name, {}).get(discriminator)
         if intr is None:
             return
         L = self._refs.pop(intr, [])
@@ -144,6 +178,8 @@ class Introspector(object):
         for pair in pairs:
             category_name, discriminator = pair
             intr = self._categories.get(category_name, {}).get(discriminator)
+            if intr is None and self.base is not None:
+                intr = self.base.get(category_name, discriminator)
             if intr is None:
                 raise KeyError((category_name, discriminator))
             introspectables.append(intr)
@@ -167,22 +203,32 @@ class Introspector(object):
 
     def related(self, intr):
         category_name, discriminator = intr.category_name, intr.discriminator
-        intr = self._categories.get(category_name, {}).get(discriminator)
-        if intr is None:
+        local = self._categories.get(category_name, {}).get(discriminator)
+        if local is None and self.base is not None:
+            intr = self.base.get(category_name, discriminator)
+            if intr is not None:
+                related = self.base.related(intr)
+                return related + [
+                    x for x in self._refs.get(intr, []) if x not in related]
+        if local is None:
             raise KeyError((category_name, discriminator))
-        return self._refs.get(intr, [])
+        return self._refs.get(local, [])
 
 @implementer(IIntrospectable)
 class Introspectable(dict):
 
-    order = 0 # mutated by introspector.add
-    action_info = None # mutated by self.register
+    # an application may create thousands of introspectables; slots keep
+    # each of them from also carrying an instance dictionary
+    __slots__ = ('category_name', 'discriminator', 'title', 'type_name',
+                 'order', 'action_info', '_relations')
 
     def __init__(self, category_name, discriminator, title, type_name):
         self.category_name = category_name
         self.discriminator = discriminator
         self.title = title
         self.type_name = type_name
+        self.order = 0 # mutated by introspector.add
+        self.action_info = None # mutated by self.register
         self._relations = []
 
     def relate(self, category_name, discriminator):
@@ -2,6 +2,7 @@ import json
 import os
 import pkg_resources
 import threading
+import time
 
 from zope.interface import implementer
 
@@ -243,6 +244,7 @@ class ChameleonRendererLookup(object):
         self.impl = impl
         self.registry = registry
         self.lock = threading.Lock()
+        self.templates = {}
 
     def get_spec(self, name, package):
         if not package:
@@ -289,7 +291,44 @@ class ChameleonRendererLookup(object):
             return False
         return settings.get('reload_templates', False)
 
+    @reify # wait until completely necessary to look up the cache directory
+    def module_loader(self):
+        settings = self.registry.settings
+        if settings is None:
+            return None
+        directory = settings.get('template_cache_directory')
+        if not directory:
+            return None
+        from chameleon.loader import ModuleLoader
+        directory = os.path.abspath(directory)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError: # pragma: no cover
+                # another process may have created it in the meantime
+                if not os.path.isdir(directory):
+                    raise
+        return ModuleLoader(directory)
+
     def __call__(self, info):
+        key = (info.name, info.package)
+        # reads of the template cache are lock-free; it is only written to
+        # while holding the lock
+        entry = self.templates.get(key)
+        if entry is not None:
+            renderer, spec, stamp, next_check = entry
+            if next_check is None:
+                return renderer
+            now = time.time()
+            if now < next_check:
+                return renderer
+            # reload_assets is on; the template is reused for as long as the
+            # asset resolves to the same, unmodified file
+            if self._stamp(spec) == stamp:
+                interval = info.settings.get('reload_assets_interval', 0)
+                self._cache(key, (renderer, spec, stamp, now + interval))
+                return renderer
+
         spec = self.get_spec(info.name, info.package)
         registry = info.registry
 
@@ -307,22 +346,12 @@ class ChameleonRendererLookup(object):
                                              ITemplateRenderer, name=spec)
                 finally:
                     self.lock.release()
+            self._cache(key, (renderer, spec, None, None))
         else:
             # spec is a package:relpath asset spec
             renderer = registry.queryUtility(ITemplateRenderer, name=spec)
             if renderer is None:
-                try:
-                    package_name, filename = spec.split(':', 1)
-                except ValueError: # pragma: no cover
-                    # somehow we were passed a relative pathname; this
-                    # should die
-                    package_name = caller_package(4).__name__
-                    filename = spec
-                abspath = pkg_resources.resource_filename(package_name,
-                                                          filename)
-                if not pkg_resources.resource_exists(package_name, filename):
-                    raise ValueError(
-                        'Missing template asset: %s (%s)' % (spec, abspath))
+                abspath = self._asset_filename(spec)
                 renderer = self.impl(abspath, self)
                 settings = info.settings
                 if not settings.get('reload_assets'):
@@ -333,11 +362,88 @@ class ChameleonRendererLookup(object):
                                                  name=spec)
                     finally:
                         self.lock.release()
+                    self._cache(key, (renderer, spec, None, None))
+                else:
+                    interval = settings.get('reload_assets_interval', 0)
+                    self._cache(key, (renderer, spec, self._stamp(spec),
+                                      time.time() + interval))
+            else:
+                self._cache(key, (renderer, spec, None, None))
 
         return renderer
 
+    def _cache(self, key, entry):
+        self.lock.acquire()
+        try:
+            self.templates[key] = entry
+        finally:
+            self.lock.release()
+
+    def _asset_filename(self, spec):
+        try:
+            package_name, filename = spec.split(':', 1)
+        except ValueError: # pragma: no cover
+            # somehow we were passed a relative pathname; this
+            # should die
+            package_name = caller_package(5).__name__
+            filename = spec
+        abspath = pkg_resources.resource_filename(package_name, filename)
+        if not pkg_resources.resource_exists(package_name, filename):
+            raise ValueError(
+                'Missing template asset: %s (%s)' % (spec, abspath))
+        return abspath
+
+    def _stamp(self, spec):
+        # the file an asset spec currently resolves to and its mtime, or
+        # None if the asset has gone away
+        try:
+            abspath = self._asset_filename(spec)
+            return abspath, os.path.getmtime(abspath)
+        except (ValueError, OSError):
+            return None
+
 registry_lock = threading.Lock()
 
+def compile_templates(registry):
+    """ Compile the template used by each :term:`view configuration` in
+    ``registry`` which names a template renderer, so that the first request
+    to each view doesn't pay the cost of compiling it.  Templates are found
+    using the ``templates`` :term:`introspection` category, so nothing is
+    compiled if introspection was turned off during configuration.
+
+    Compiled templates are kept by the renderers attached to the views
+    themselves.  If the ``pyramid.template_cache_directory`` setting names a
+    directory, Chameleon also writes the compiled templates there (Mako does
+    the same with ``mako.module_directory``), which lets other processes
+    using the same setting skip compilation entirely.
+
+    Returns a list of ``(template name, exception)`` two-tuples, one for
+    each distinct template; ``exception`` is ``None`` if the template was
+    compiled successfully.
+    """
+    results = []
+    seen = set()
+    introspector = getattr(registry, 'introspector', None)
+    if introspector is None:
+        return results
+    for item in introspector.get_category('templates', ()):
+        helper = item['introspectable']['renderer']
+        key = (helper.name, helper.package)
+        if key in seen:
+            continue
+        seen.add(key)
+        try:
+            template = helper.get_renderer().implementation()
+            # Chameleon templates are compiled lazily, when first rendered
+            cook_check = getattr(template, 'cook_check', None)
+            if cook_check is not None:
+                cook_check()
+        except Exception as e:
+            results.append((helper.name, e))
+        else:
+            results.append((helper.name, None))
+    return results
+
 def template_renderer_factory(info, impl, lock=registry_lock):
     registry = info.registry
     lookup = registry.queryUtility(IChameleonLookup, name=info.type)
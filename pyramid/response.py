@@ -1,5 +1,6 @@
 import mimetypes
 from os.path import (
+    abspath,
     getmtime,
     getsize,
     )
@@ -49,9 +50,29 @@ class FileResponse(Response):
     It's generally safe to leave this set to ``None`` if you're serving a
     binary file.  This argument will be ignored if you don't also pass
     ``content-type``.
+
+    ``block_size``, if passed, is the number of bytes read from the file at
+    a time while serving it (default 262144).
+
+    The response honors ``Range`` (and ``If-Range``) request headers: the
+    file is positioned at the start of the requested range rather than read
+    up to it.  Ranges are served by :class:`pyramid.response.FileIter`, not
+    by the ``wsgi.file_wrapper`` of the web server, which can only serve
+    whole files.
+
+    ``sendfile_header``, if passed, is the name of a response header, such
+    as ``X-Sendfile`` (Apache's mod_xsendfile, lighttpd) or
+    ``X-Accel-Redirect`` (nginx), which tells a front-end web server to send
+    the file itself.  The response then has no body and carries that header,
+    whose value is ``sendfile_value``, or, if ``sendfile_value`` is not
+    passed, the absolute path of the file.  ``X-Accel-Redirect`` requires a
+    ``sendfile_value`` naming an ``internal`` nginx location.  The front-end
+    server handles ``Range`` request headers itself in this mode.
     """
     def __init__(self, path, request=None, cache_max_age=None,
-                 content_type=None, content_encoding=None):
+                 content_type=None, content_encoding=None,
+                 block_size=_BLOCK_SIZE, sendfile_header=None,
+                 sendfile_value=None):
         super(FileResponse, self).__init__(conditional_response=True)
         self.last_modified = getmtime(path)
         if content_type is None:
@@ -61,21 +82,36 @@ class FileResponse(Response):
             content_type = 'application/octet-stream'
         self.content_type = content_type
         self.content_encoding = content_encoding
-        content_length = getsize(path)
-        f = open(path, 'rb')
-        app_iter = None
-        if request is not None:
-            environ = request.environ
-            if 'wsgi.file_wrapper' in environ:
-                app_iter = environ['wsgi.file_wrapper'](f, _BLOCK_SIZE)
-        if app_iter is None:
-            app_iter = FileIter(f, _BLOCK_SIZE)
-        self.app_iter = app_iter
-        # assignment of content_length must come after assignment of app_iter
-        self.content_length = content_length
+        if sendfile_header is not None:
+            if sendfile_value is None:
+                sendfile_value = abspath(path)
+            self.headers[sendfile_header] = sendfile_value
+            self.app_iter = []
+            self.content_length = None
+        else:
+            content_length = getsize(path)
+            f = open(path, 'rb')
+            self.app_iter = _file_app_iter(f, request, block_size)
+            # assignment of content_length must come after assignment of
+            # app_iter
+            self.content_length = content_length
         if cache_max_age is not None:
             self.cache_expires = cache_max_age
 
+def _file_app_iter(f, request, block_size=_BLOCK_SIZE):
+    # Return an app_iter serving the open file ``f``: the server's
+    # ``wsgi.file_wrapper`` if it has one, unless the request asks for a
+    # byte range (which a file wrapper can't serve without reading and
+    # discarding the bytes before it).  Files are deliberately not served
+    # from a memory map: WSGI servers require bytes, so mmap slices would be
+    # copied just like blocks read from the file, and every page of the file
+    # served would count against the process' resident memory.
+    if request is not None:
+        environ = request.environ
+        if 'wsgi.file_wrapper' in environ and 'HTTP_RANGE' not in environ:
+            return environ['wsgi.file_wrapper'](f, block_size)
+    return FileIter(f, block_size)
+
 class FileIter(object):
     """ A fixed-block-size iterator for use as a WSGI app_iter.
 
@@ -83,22 +119,44 @@ class FileIter(object):
     method that takes a size hint).
 
     ``block_size`` is an optional block size for iteration.
+
+    When the iterator is used as the app_iter of a response answering a
+    ``Range`` request, its ``app_iter_range`` method seeks straight to the
+    start of the range, so ``file`` must also have a ``seek`` method in that
+    case.
     """
     def __init__(self, file, block_size=_BLOCK_SIZE):
         self.file = file
         self.block_size = block_size
+        self.remaining = None # bytes left to serve, if not all of the file
 
     def __iter__(self):
         return self
 
     def next(self):
-        val = self.file.read(self.block_size)
+        size = self.block_size
+        if self.remaining is not None:
+            if self.remaining <= 0:
+                raise StopIteration
+            size = min(size, self.remaining)
+        val = self.file.read(size)
         if not val:
             raise StopIteration
+        if self.remaining is not None:
+            self.remaining -= len(val)
         return val
 
     __next__ = next # py3
 
+    def app_iter_range(self, start, stop):
+        """ Serve only the bytes from offset ``start`` up to (but not
+        including) offset ``stop`` of the file, or to its end if ``stop`` is
+        ``None``; called by :term:`WebOb` to answer ``Range`` requests."""
+        self.file.seek(start)
+        if stop is not None:
+            self.remaining = stop - start
+        return self
+
     def close(self):
         self.file.close()
 
@@ -199,3 +199,43 @@ class Router(object):
         finally:
             manager.pop()
 
+
+class HostDispatcher(object):
+    """ A WSGI application which passes each request on to the WSGI
+    application (usually a :app:`Pyramid` router) registered for the host
+    the request is addressed to, for example to serve each tenant of a
+    multi-tenant application with its own router (see
+    :meth:`pyramid.config.Configurator.overlay`).
+
+    ``apps`` is a dictionary mapping host names to WSGI applications.  A
+    host name may include a port (e.g. ``example.com:8080``), in which case
+    it only matches requests for that port; otherwise it matches requests
+    for any port.  Requests for any other host are passed to the ``default``
+    WSGI application or, if it is ``None``, answered with a ``404 Not
+    Found`` response."""
+    def __init__(self, apps=None, default=None):
+        self.apps = {}
+        self.default = default
+        for host, app in (apps or {}).items():
+            self.add(host, app)
+
+    def add(self, host, app):
+        """ Pass requests for ``host`` to the WSGI application ``app``."""
+        self.apps[host.lower()] = app
+
+    def __call__(self, environ, start_response):
+        host = environ.get('HTTP_HOST')
+        if host is None:
+            host = '%s:%s' % (environ['SERVER_NAME'], environ['SERVER_PORT'])
+        host = host.lower()
+        apps = self.apps
+        app = apps.get(host)
+        if app is None:
+            name, sep, port = host.rpartition(':')
+            if name and not port.endswith(']'): # not an IPv6 address alone
+                app = apps.get(name)
+            if app is None:
+                app = self.default
+                if app is None:
+                    app = HTTPNotFound('No application for host %s' % host)
+        return app(environ, start_response)
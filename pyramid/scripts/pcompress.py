@@ -0,0 +1,107 @@
+import mimetypes
+import optparse
+import os
+import sys
+import textwrap
+
+from pyramid.path import AssetResolver
+from pyramid.static import (
+    compressible,
+    gzip_compress,
+    )
+
+def main(argv=sys.argv, quiet=False):
+    command = PCompressCommand(argv, quiet)
+    return command.run()
+
+class PCompressCommand(object):
+    usage = '%prog directory [directory ...]'
+    description = """\
+    Write a gzip compressed copy of every compressible file (text,
+    JavaScript, JSON, XML and SVG files) found in the given directories,
+    recursively, next to the file itself, named after it plus ".gz".  Static
+    views created with "gzip=True" (e.g. "config.add_static_view('static',
+    'myapp:static', gzip=True)") serve those copies to clients which accept
+    gzip compressed responses, instead of compressing the files themselves.
+
+    Directories may be given as filesystem paths or as asset specifications,
+    e.g. "myapp:static".  Compressed copies which are newer than their
+    original are left alone (unless --force is passed), and no copy is
+    written for files which compression doesn't make smaller.  Run this
+    command again whenever the static files change.
+
+    """
+    parser = optparse.OptionParser(
+        usage,
+        description=textwrap.dedent(description),
+        )
+    parser.add_option('-f', '--force',
+                      dest='force',
+                      action='store_true',
+                      help='Compress files even if their compressed copy is '
+                           'up to date')
+    parser.add_option('-m', '--min-size',
+                      dest='min_size',
+                      type='int',
+                      default=256,
+                      help='Skip files smaller than this number of bytes '
+                           '(default: 256)')
+
+    def __init__(self, argv, quiet=False):
+        self.quiet = quiet
+        self.options, self.args = self.parser.parse_args(argv[1:])
+
+    def out(self, msg): # pragma: no cover
+        if not self.quiet:
+            print(msg)
+
+    def run(self):
+        if not self.args:
+            self.out('Requires at least one directory argument')
+            return 2
+        directories = []
+        for arg in self.args:
+            directory = AssetResolver(None).resolve(arg).abspath()
+            if not os.path.isdir(directory):
+                self.out('Not a directory: %s' % arg)
+                return 2
+            directories.append(directory)
+        for directory in directories:
+            for dirpath, dirnames, filenames in os.walk(directory):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    self.compress(os.path.join(dirpath, name))
+        return 0
+
+    def compress(self, path):
+        if path.endswith('.gz'):
+            return
+        content_type, content_encoding = mimetypes.guess_type(path,
+                                                              strict=False)
+        if content_type is None:
+            return
+        if not compressible(content_type, content_encoding):
+            return
+        gzpath = path + '.gz'
+        if not self.options.force and os.path.exists(gzpath):
+            if os.path.getmtime(gzpath) >= os.path.getmtime(path):
+                return
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < self.options.min_size:
+            self.remove_stale(gzpath)
+            return
+        compressed = gzip_compress(data)
+        if len(compressed) >= len(data):
+            self.remove_stale(gzpath)
+            return
+        with open(gzpath, 'wb') as f:
+            f.write(compressed)
+        self.out('%-10s  %s (%d -> %d bytes)' % (
+            'compressed', path, len(data), len(compressed)))
+
+    def remove_stale(self, gzpath):
+        if os.path.exists(gzpath):
+            # a stale copy of an earlier version of the file
+            os.remove(gzpath)
+            self.out('%-10s  %s' % ('removed', gzpath))
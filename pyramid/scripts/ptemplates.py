@@ -0,0 +1,70 @@
+import optparse
+import sys
+import textwrap
+
+from pyramid.paster import bootstrap
+from pyramid.renderers import compile_templates
+
+def main(argv=sys.argv, quiet=False):
+    command = PTemplatesCommand(argv, quiet)
+    return command.run()
+
+class PTemplatesCommand(object):
+    usage = '%prog config_uri'
+    description = """\
+    Compile every template used as the renderer of a view in a Pyramid
+    application, and print the outcome for each one.  Run it after a deploy
+    with the "pyramid.template_cache_directory" (Chameleon) and/or
+    "mako.module_directory" (Mako) settings pointed at a directory shared by
+    the application's worker processes, and the workers will load compiled
+    templates from there instead of compiling them on first render.
+
+    This command accepts one positional argument named "config_uri" which
+    specifies the PasteDeploy config file to use for the interactive
+    shell. The format is "inifile#name". If the name is left off, "main"
+    will be assumed.  Example: "ptemplates myapp.ini#main".
+
+    The exit status is 1 if any template failed to compile.
+
+    """
+    parser = optparse.OptionParser(
+        usage,
+        description=textwrap.dedent(description),
+        )
+
+    stdout = sys.stdout
+    bootstrap = (bootstrap,) # testing
+
+    def __init__(self, argv, quiet=False):
+        self.quiet = quiet
+        self.options, self.args = self.parser.parse_args(argv[1:])
+
+    def _compile_templates(self, registry):
+        return compile_templates(registry)
+
+    def out(self, msg): # pragma: no cover
+        if not self.quiet:
+            print(msg)
+
+    def run(self):
+        if not self.args:
+            self.out('Requires a config file argument')
+            return 2
+        config_uri = self.args[0]
+        env = self.bootstrap[0](config_uri)
+        try:
+            results = self._compile_templates(env['registry'])
+        finally:
+            env['closer']()
+        status = 0
+        fmt = '%-10s  %s'
+        for name, exc in results:
+            if exc is None:
+                self.out(fmt % ('compiled', name))
+            else:
+                status = 1
+                self.out(fmt % ('FAILED', name))
+                self.out(fmt % ('', '%s: %s' % (exc.__class__.__name__, exc)))
+        if not results:
+            self.out('No templates found')
+        return status
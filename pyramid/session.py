@@ -2,12 +2,20 @@ from hashlib import sha1
 import base64
 import binascii
 import hmac
+import itertools
+import json
 import time
 import os
+import tempfile
+import threading
+import zlib
+
+from repoze.lru import LRUCache
 
 from zope.interface import implementer
 
 from pyramid.compat import (
+    dbm,
     pickle,
     PY3,
     text_,
@@ -15,24 +23,230 @@ from pyramid.compat import (
     native_,
     )
 
-from pyramid.interfaces import ISession
+from pyramid.interfaces import (
+    ISession,
+    ISessionStorage,
+    )
 from pyramid.util import strings_differ
 
 def manage_accessed(wrapped):
-    """ Decorator which causes a cookie to be set when a wrapped
-    method is called"""
+    """ Decorator which sets the access timestamp of the session when a
+    wrapped method is called, and causes a cookie to be set if the
+    session's reissue time has elapsed since the cookie was last set"""
     def accessed(session, *arg, **kw):
-        session.accessed = int(time.time())
-        if not session._dirty:
-            session._dirty = True
-            def set_cookie_callback(request, response):
-                session._set_cookie(response)
-                session.request = None # explicitly break cycle for gc
-            session.request.add_response_callback(set_cookie_callback)
+        session.accessed = now = int(time.time())
+        reissue_time = session._reissue_time
+        if reissue_time is not None and now - session.renewed >= reissue_time:
+            session.changed()
         return wrapped(session, *arg, **kw)
     accessed.__doc__ = wrapped.__doc__
     return accessed
 
+def manage_loaded(wrapped):
+    """ Decorator which causes a server-side session to be loaded from
+    its storage before a wrapped method is called"""
+    def loaded(session, *arg, **kw):
+        if not session._loaded:
+            session._load()
+        return wrapped(session, *arg, **kw)
+    loaded.__doc__ = wrapped.__doc__
+    return loaded
+
+def manage_changed(wrapped):
+    """ Decorator which causes a cookie to be set when a wrapped
+    method is called"""
+    def changed(session, *arg, **kw):
+        session.accessed = int(time.time())
+        session.changed()
+        return wrapped(session, *arg, **kw)
+    changed.__doc__ = wrapped.__doc__
+    return changed
+
+def signed_serialize(data, secret):
+    """ Serialize any pickleable structure (``data``) and sign it
+    using the ``secret`` (must be a string).  Return the
+    serialization, which includes the signature as its first 40 bytes.
+    The ``signed_deserialize`` method will deserialize such a value.
+
+    This function is useful for creating signed cookies.  For example:
+
+    .. code-block:: python
+
+       cookieval = signed_serialize({'a':1}, 'secret')
+       response.set_cookie('signed_cookie', cookieval)
+    """
+    pickled = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+    sig = hmac.new(bytes_(secret), pickled, sha1).hexdigest()
+    return sig + native_(base64.b64encode(pickled))
+
+def signed_deserialize(serialized, secret, hmac=hmac):
+    """ Deserialize the value returned from ``signed_serialize``.  If
+    the value cannot be deserialized for any reason, a
+    :exc:`ValueError` exception will be raised.
+
+    This function is useful for deserializing a signed cookie value
+    created by ``signed_serialize``.  For example:
+
+    .. code-block:: python
+
+       cookieval = request.cookies['signed_cookie']
+       data = signed_deserialize(cookieval, 'secret')
+    """
+    # hmac parameterized only for unit tests
+    try:
+        input_sig, pickled = (serialized[:40],
+                              base64.b64decode(bytes_(serialized[40:])))
+    except (binascii.Error, TypeError) as e:
+        # Badly formed data can make base64 die
+        raise ValueError('Badly formed base64 data: %s' % e)
+
+    sig = hmac.new(bytes_(secret), pickled, sha1).hexdigest()
+
+    # Avoid timing attacks (see
+    # http://seb.dbzteam.org/crypto/python-oauth-timing-hmac.pdf)
+    if strings_differ(sig, input_sig):
+        raise ValueError('Invalid signature')
+
+    return pickle.loads(pickled)
+
+def signed_json_serialize(data, secret):
+    """ Serialize a JSON-compatible structure (``data``) and sign it
+    using the ``secret`` (must be a string).  Return the serialization
+    as a URL-safe base64 string.  The ``signed_json_deserialize``
+    function will deserialize such a value.
+
+    The result is usually much shorter than the one produced by
+    :func:`pyramid.session.signed_serialize`: the data is encoded as JSON
+    without whitespace, compressed with :mod:`zlib` when that makes it
+    smaller, and signed with a 20 byte binary HMAC-SHA1 digest rather than
+    a 40 character hex digest.  Only JSON types survive the round trip;
+    for example, tuples are deserialized as lists.
+
+    It may be passed as the ``signed_serialize`` argument of
+    :func:`pyramid.session.UnencryptedCookieSessionFactoryConfig`
+    (along with ``signed_json_deserialize`` as ``signed_deserialize``).
+    """
+    payload = bytes_(json.dumps(data, separators=(',', ':')), 'utf-8')
+    compressed = zlib.compress(payload, 9)
+    if len(compressed) < len(payload):
+        body = b'z' + compressed
+    else:
+        body = b'j' + payload
+    sig = hmac.new(bytes_(secret), body, sha1).digest()
+    return native_(base64.urlsafe_b64encode(sig + body).rstrip(b'='))
+
+def signed_json_deserialize(serialized, secret, hmac=hmac):
+    """ Deserialize the value returned from ``signed_json_serialize``.
+    If the value cannot be deserialized for any reason, a
+    :exc:`ValueError` exception will be raised."""
+    # hmac parameterized only for unit tests
+    serialized = bytes_(serialized)
+    try:
+        raw = base64.urlsafe_b64decode(
+            serialized + b'=' * (-len(serialized) % 4))
+    except (binascii.Error, TypeError) as e:
+        # Badly formed data can make base64 die
+        raise ValueError('Badly formed base64 data: %s' % e)
+
+    input_sig, body = raw[:20], raw[20:]
+    sig = hmac.new(bytes_(secret), body, sha1).digest()
+
+    if strings_differ(sig, input_sig):
+        raise ValueError('Invalid signature')
+
+    kind, payload = body[:1], body[1:]
+    if kind == b'z':
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as e:
+            raise ValueError('Badly formed compressed data: %s' % e)
+    elif kind != b'j':
+        raise ValueError('Unknown serialization format %r' % kind)
+    return json.loads(text_(payload, 'utf-8'))
+
+@implementer(ISession)
+class _Session(dict):
+    """ The behavior shared by the dictionary-like session objects created
+    by the session factories in this module.  Subclasses load the session
+    data in ``_load`` and store it in ``_save``, which is called with the
+    response once the session has changed."""
+
+    # dirty and loaded flags
+    _dirty = False
+    _loaded = False
+
+    # ISession methods
+    @manage_loaded
+    def changed(self):
+        if not self._dirty:
+            self._dirty = True
+            def save_callback(request, response):
+                self._save(response)
+                self.request = None # explicitly break cycle for gc
+            self.request.add_response_callback(save_callback)
+
+    # non-modifying dictionary methods
+    get = manage_loaded(manage_accessed(dict.get))
+    __getitem__ = manage_loaded(manage_accessed(dict.__getitem__))
+    items = manage_loaded(manage_accessed(dict.items))
+    values = manage_loaded(manage_accessed(dict.values))
+    keys = manage_loaded(manage_accessed(dict.keys))
+    copy = manage_loaded(manage_accessed(dict.copy))
+    __contains__ = manage_loaded(manage_accessed(dict.__contains__))
+    __len__ = manage_loaded(manage_accessed(dict.__len__))
+    __iter__ = manage_loaded(manage_accessed(dict.__iter__))
+
+    if not PY3:
+        iteritems = manage_loaded(manage_accessed(dict.iteritems))
+        itervalues = manage_loaded(manage_accessed(dict.itervalues))
+        iterkeys = manage_loaded(manage_accessed(dict.iterkeys))
+        has_key = manage_loaded(manage_accessed(dict.has_key))
+
+    # modifying dictionary methods
+    clear = manage_loaded(manage_changed(dict.clear))
+    update = manage_loaded(manage_changed(dict.update))
+    setdefault = manage_loaded(manage_changed(dict.setdefault))
+    pop = manage_loaded(manage_changed(dict.pop))
+    popitem = manage_loaded(manage_changed(dict.popitem))
+    __setitem__ = manage_loaded(manage_changed(dict.__setitem__))
+    __delitem__ = manage_loaded(manage_changed(dict.__delitem__))
+
+    # flash API methods
+    @manage_loaded
+    @manage_changed
+    def flash(self, msg, queue='', allow_duplicate=True):
+        storage = self.setdefault('_f_' + queue, [])
+        if allow_duplicate or (msg not in storage):
+            storage.append(msg)
+
+    @manage_loaded
+    @manage_changed
+    def pop_flash(self, queue=''):
+        storage = self.pop('_f_' + queue, [])
+        return storage
+
+    @manage_loaded
+    @manage_accessed
+    def peek_flash(self, queue=''):
+        storage = self.get('_f_' + queue, [])
+        return storage
+
+    # CSRF API methods
+    @manage_loaded
+    @manage_changed
+    def new_csrf_token(self):
+        token = text_(binascii.hexlify(os.urandom(20)))
+        self['_csrft_'] = token
+        return token
+
+    @manage_loaded
+    @manage_accessed
+    def get_csrf_token(self):
+        token = self.get('_csrft_', None)
+        if token is None:
+            token = self.new_csrf_token()
+        return token
+
 def UnencryptedCookieSessionFactoryConfig(
     secret,
     timeout=1200,
@@ -43,6 +257,11 @@ def UnencryptedCookieSessionFactoryConfig(
     cookie_secure=False, 
     cookie_httponly=False,
     cookie_on_exception=True,
+    reissue_time=0,
+    signed_serialize=signed_serialize,
+    signed_deserialize=signed_deserialize,
+    lazy=False,
+    cookie_cache_size=0,
     ):
     """
     Configure a :term:`session factory` which will provide unencrypted
@@ -89,10 +308,60 @@ def UnencryptedCookieSessionFactoryConfig(
       If ``True``, set a session cookie even if an exception occurs
       while rendering a view.  Default: ``True``.
 
+    ``reissue_time``
+      The number of seconds that must pass after the session cookie was
+      last set before merely reading the session (without changing it)
+      causes the cookie to be set again with a fresh access time.  Changing
+      the session always causes the cookie to be set.  ``None`` means that
+      reading the session never causes the cookie to be set.  As the
+      session times out ``timeout`` seconds after its cookie was last set,
+      ``reissue_time`` should be well below ``timeout``.  Default: ``0``
+      (reading the session always sets the cookie).
+
+    ``signed_serialize``
+      A callable which accepts a data structure and a secret and returns
+      a signed serialization of the data suitable for use as a cookie
+      value.  Default: :func:`pyramid.session.signed_serialize` (which
+      uses :mod:`pickle`).  Use
+      :func:`pyramid.session.signed_json_serialize` for a considerably
+      more compact cookie if your session only contains JSON-compatible
+      data.
+
+    ``signed_deserialize``
+      A callable which accepts a value created by ``signed_serialize`` and
+      a secret and returns the original data structure, raising a
+      :exc:`ValueError` if the value cannot be deserialized or its
+      signature is invalid.  Default:
+      :func:`pyramid.session.signed_deserialize`.  This must be the
+      counterpart of ``signed_serialize``.
+
+    ``lazy``
+      If ``True``, the session cookie is not verified and deserialized
+      when the session is created, but only when the session is first
+      used, so that requests which never use the session they create don't
+      pay for it.  Note that, as a result, ``dict(session)`` may not be
+      used to copy a session which has not been used yet; use
+      ``session.copy()`` instead.  Default: ``False``.
+
+    ``cookie_cache_size``
+      The number of distinct session cookie values whose verified and
+      deserialized contents are kept in a least-recently-used cache, so
+      that requests carrying a session cookie seen recently needn't verify
+      and deserialize it again.  Cached values are stored pickled, so
+      sessions never share mutable data.  Default: ``0`` (no cache).
+
+    After a session cookie has been set on a response, the ``cookie_size``
+    attribute of the session is the length of the serialized cookie value
+    in bytes; it is ``None`` until then.  Compare it against the 4064 byte
+    limit to keep an eye on how much room the session has left.
     """
 
-    @implementer(ISession)
-    class UnencryptedCookieSessionFactory(dict):
+    if cookie_cache_size:
+        cookie_cache = LRUCache(cookie_cache_size)
+    else:
+        cookie_cache = None
+
+    class UnencryptedCookieSessionFactory(_Session):
         """ Dictionary-like session object """
 
         # configuration parameters
@@ -105,23 +374,38 @@ def UnencryptedCookieSessionFactoryConfig(
         _cookie_on_exception = cookie_on_exception
         _secret = secret
         _timeout = timeout
+        _reissue_time = reissue_time
+        _signed_serialize = staticmethod(signed_serialize)
+        _signed_deserialize = staticmethod(signed_deserialize)
+        _cookie_cache = cookie_cache
 
-        # dirty flag
-        _dirty = False
+        # length of the most recently serialized cookie value
+        cookie_size = None
 
         def __init__(self, request):
             self.request = request
-            now = time.time()
+            self._cookieval = request.cookies.get(self._cookie_name)
+            if not lazy:
+                self._load()
+
+        def __getattr__(self, name):
+            # these are only missing when loading the session was deferred
+            if name in ('new', 'created', 'accessed', 'renewed'):
+                if not self._loaded:
+                    self._load()
+                    return getattr(self, name)
+            raise AttributeError(name)
+
+        def _load(self):
+            self._loaded = True
+            now = int(time.time())
             created = accessed = now
             new = True
             value = None
             state = {}
-            cookieval = request.cookies.get(self._cookie_name)
+            cookieval = self._cookieval
             if cookieval is not None:
-                try:
-                    value = signed_deserialize(cookieval, self._secret)
-                except ValueError:
-                    value = None
+                value = self._deserialize(cookieval)
 
             if value is not None:
                 accessed, created, state = value
@@ -130,89 +414,51 @@ def UnencryptedCookieSessionFactoryConfig(
                     state = {}
 
             self.created = created
-            self.accessed = accessed
+            self.accessed = self.renewed = accessed
             self.new = new
-            dict.__init__(self, state)
+            dict.update(self, state)
+
+        def _deserialize(self, cookieval):
+            cache = self._cookie_cache
+            if cache is not None:
+                pickled = cache.get(cookieval)
+                if pickled is not None:
+                    return pickle.loads(pickled)
+            try:
+                value = self._signed_deserialize(cookieval, self._secret)
+            except ValueError:
+                return None
+            if cache is not None:
+                cache.put(cookieval,
+                          pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+            return value
 
         # ISession methods
-        def changed(self):
-            """ This is intentionally a noop; the session is
-            serialized on every access, so unnecessary"""
-            pass
-
+        @manage_loaded
         def invalidate(self):
             self.clear() # XXX probably needs to unset cookie
 
-        # non-modifying dictionary methods
-        get = manage_accessed(dict.get)
-        __getitem__ = manage_accessed(dict.__getitem__)
-        items = manage_accessed(dict.items)
-        values = manage_accessed(dict.values)
-        keys = manage_accessed(dict.keys)
-        __contains__ = manage_accessed(dict.__contains__)
-        __len__ = manage_accessed(dict.__len__)
-        __iter__ = manage_accessed(dict.__iter__)
-
-        if not PY3:
-            iteritems = manage_accessed(dict.iteritems)
-            itervalues = manage_accessed(dict.itervalues)
-            iterkeys = manage_accessed(dict.iterkeys)
-            has_key = manage_accessed(dict.has_key)
-
-        # modifying dictionary methods
-        clear = manage_accessed(dict.clear)
-        update = manage_accessed(dict.update)
-        setdefault = manage_accessed(dict.setdefault)
-        pop = manage_accessed(dict.pop)
-        popitem = manage_accessed(dict.popitem)
-        __setitem__ = manage_accessed(dict.__setitem__)
-        __delitem__ = manage_accessed(dict.__delitem__)
-
-        # flash API methods
-        @manage_accessed
-        def flash(self, msg, queue='', allow_duplicate=True):
-            storage = self.setdefault('_f_' + queue, [])
-            if allow_duplicate or (msg not in storage):
-                storage.append(msg)
-
-        @manage_accessed
-        def pop_flash(self, queue=''):
-            storage = self.pop('_f_' + queue, [])
-            return storage
-
-        @manage_accessed
-        def peek_flash(self, queue=''):
-            storage = self.get('_f_' + queue, [])
-            return storage
-
-        # CSRF API methods
-        @manage_accessed
-        def new_csrf_token(self):
-            token = text_(binascii.hexlify(os.urandom(20)))
-            self['_csrft_'] = token
-            return token
-
-        @manage_accessed
-        def get_csrf_token(self):
-            token = self.get('_csrft_', None)
-            if token is None:
-                token = self.new_csrf_token()
-            return token
-
         # non-API methods
+        def _save(self, response):
+            return self._set_cookie(response)
+
         def _set_cookie(self, response):
             if not self._cookie_on_exception:
                 exception = getattr(self.request, 'exception', None)
                 if exception is not None: # dont set a cookie during exceptions
                     return False
-            cookieval = signed_serialize(
-                (self.accessed, self.created, dict(self)), self._secret
-                )
+            value = (int(self.accessed), int(self.created), dict(self))
+            cookieval = self._signed_serialize(value, self._secret)
+            self.cookie_size = len(cookieval)
             if len(cookieval) > 4064:
                 raise ValueError(
                     'Cookie value is too long to store (%s bytes)' %
                     len(cookieval)
                     )
+            if self._cookie_cache is not None:
+                # the next request will most likely carry this value
+                self._cookie_cache.put(
+                    cookieval, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
             response.set_cookie(
                 self._cookie_name,
                 value=cookieval,
@@ -226,50 +472,377 @@ def UnencryptedCookieSessionFactoryConfig(
 
     return UnencryptedCookieSessionFactory
 
-def signed_serialize(data, secret):
-    """ Serialize any pickleable structure (``data``) and sign it
-    using the ``secret`` (must be a string).  Return the
-    serialization, which includes the signature as its first 40 bytes.
-    The ``signed_deserialize`` method will deserialize such a value.
+def ServerSideSessionFactoryConfig(
+    secret,
+    storage,
+    timeout=1200,
+    reissue_time=120,
+    sweep_interval=60,
+    cookie_name='session',
+    cookie_max_age=None,
+    cookie_path='/',
+    cookie_domain=None,
+    cookie_secure=False,
+    cookie_httponly=False,
+    cookie_on_exception=True,
+    ):
+    """
+    Configure a :term:`session factory` which will provide sessions whose
+    data is kept on the server.  The cookie sent to the browser contains
+    only a randomly generated, signed session id.  The return value of
+    this function is a :term:`session factory`, which may be provided as
+    the ``session_factory`` argument of a
+    :class:`pyramid.config.Configurator` constructor, or used as the
+    ``session_factory`` argument of the
+    :meth:`pyramid.config.Configurator.set_session_factory` method.
 
-    This function is useful for creating signed cookies.  For example:
+    A session is not read from its storage until it is first used, and it
+    is only written back to its storage when it has been changed (or when
+    ``reissue_time`` has passed, see below).  Note that, as sessions are
+    loaded lazily, ``dict(session)`` may not be used to copy a session
+    which has not been used yet; use ``session.copy()`` instead.
 
-    .. code-block:: python
+    Parameters:
 
-       cookieval = signed_serialize({'a':1}, 'secret')
-       response.set_cookie('signed_cookie', cookieval)
-    """
-    pickled = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
-    sig = hmac.new(bytes_(secret), pickled, sha1).hexdigest()
-    return sig + native_(base64.b64encode(pickled))
+    ``secret``
+      A string which is used to sign the session id in the cookie.
 
-def signed_deserialize(serialized, secret, hmac=hmac):
-    """ Deserialize the value returned from ``signed_serialize``.  If
-    the value cannot be deserialized for any reason, a
-    :exc:`ValueError` exception will be raised.
+    ``storage``
+      An object implementing :class:`pyramid.interfaces.ISessionStorage`
+      which keeps the session data, e.g. an instance of
+      :class:`pyramid.session.MemorySessionStorage`,
+      :class:`pyramid.session.FileSessionStorage` or
+      :class:`pyramid.session.DBMSessionStorage`.
 
-    This function is useful for deserializing a signed cookie value
-    created by ``signed_serialize``.  For example:
+    ``timeout``
+      A number of seconds of inactivity before a session times out.
 
-    .. code-block:: python
+    ``reissue_time``
+      The number of seconds that must pass after the session was last
+      written to its storage before merely reading the session (without
+      changing it) causes it to be written again with a fresh access time.
+      As the session times out ``timeout`` seconds after it was last
+      written, ``reissue_time`` should be well below ``timeout``.  ``None``
+      means that reading the session never causes it to be written.
+      Default: ``120``.
+
+    ``sweep_interval``
+      The minimum number of seconds between two removals of timed out
+      sessions from the storage.  Removals happen as part of writing a
+      session.  ``None`` disables them; in that case you'll need to call
+      the ``sweep`` method of the storage yourself.  Default: ``60``.
 
-       cookieval = request.cookies['signed_cookie']
-       data = signed_deserialize(cookieval, 'secret')
+    ``cookie_name``
+      The name of the cookie used for sessioning.  Default: ``session``.
+
+    ``cookie_max_age``
+      The maximum age of the cookie used for sessioning (in seconds).
+      When set, the cookie is renewed whenever the session is written.
+      Default: ``None`` (browser scope).
+
+    ``cookie_path``
+      The path used for the session cookie.  Default: ``/``.
+
+    ``cookie_domain``
+      The domain used for the session cookie.  Default: ``None`` (no domain).
+
+    ``cookie_secure``
+      The 'secure' flag of the session cookie.  Default: ``False``.
+
+    ``cookie_httponly``
+      The 'httpOnly' flag of the session cookie.  Default: ``False``.
+
+    ``cookie_on_exception``
+      If ``True``, save the session and set a session cookie even if an
+      exception occurs while rendering a view.  Default: ``True``.
     """
-    # hmac parameterized only for unit tests
-    try:
-        input_sig, pickled = (serialized[:40],
-                              base64.b64decode(bytes_(serialized[40:])))
-    except (binascii.Error, TypeError) as e:
-        # Badly formed data can make base64 die
-        raise ValueError('Badly formed base64 data: %s' % e)
 
-    sig = hmac.new(bytes_(secret), pickled, sha1).hexdigest()
+    sweep_lock = threading.Lock()
 
-    # Avoid timing attacks (see
-    # http://seb.dbzteam.org/crypto/python-oauth-timing-hmac.pdf)
-    if strings_differ(sig, input_sig):
-        raise ValueError('Invalid signature')
+    class ServerSideSession(_Session):
+        """ Dictionary-like session object """
 
-    return pickle.loads(pickled)
+        # configuration parameters
+        _cookie_name = cookie_name
+        _cookie_max_age = cookie_max_age
+        _cookie_path = cookie_path
+        _cookie_domain = cookie_domain
+        _cookie_secure = cookie_secure
+        _cookie_httponly = cookie_httponly
+        _cookie_on_exception = cookie_on_exception
+        _secret = secret
+        _storage = storage
+        _timeout = timeout
+        _reissue_time = reissue_time
+        _sweep_interval = sweep_interval
+
+        # time of the next sweep of timed out sessions; shared by all
+        # sessions created by this factory
+        _next_sweep = 0
+
+        def __init__(self, request):
+            self.request = request
+            session_id = None
+            cookieval = request.cookies.get(self._cookie_name)
+            if cookieval is not None:
+                session_id = _unsign_session_id(cookieval, self._secret)
+            self.session_id = session_id
+
+        def _load(self):
+            self._loaded = True
+            now = int(time.time())
+            value = None
+            if self.session_id is not None:
+                value = self._storage.load(self.session_id)
+            if value is not None and now - value[0] <= self._timeout:
+                accessed, created, state = value
+                self._new = False
+            else:
+                accessed = created = now
+                state = {}
+                self._new = True
+                self.session_id = _new_session_id()
+            self._created = created
+            self.accessed = self.renewed = accessed
+            dict.update(self, state)
+
+        @property
+        def new(self):
+            if not self._loaded:
+                self._load()
+            return self._new
+
+        @property
+        def created(self):
+            if not self._loaded:
+                self._load()
+            return self._created
+
+        # ISession methods
+        @manage_loaded
+        def invalidate(self):
+            if not self._new:
+                self._storage.delete(self.session_id)
+            dict.clear(self)
+            self.session_id = _new_session_id()
+            self._new = True
+            self._created = self.accessed = self.renewed = int(time.time())
+
+        # non-API methods
+        def _save(self, response):
+            if not self._cookie_on_exception:
+                exception = getattr(self.request, 'exception', None)
+                if exception is not None: # dont save during exceptions
+                    return False
+            if self._new and not dict.__len__(self):
+                # don't store (and send a cookie for) an empty session
+                return False
+            self._storage.save(
+                self.session_id,
+                (int(self.accessed), int(self._created), dict(self))
+                )
+            if self._new or self._cookie_max_age is not None:
+                response.set_cookie(
+                    self._cookie_name,
+                    value=_sign_session_id(self.session_id, self._secret),
+                    max_age = self._cookie_max_age,
+                    path = self._cookie_path,
+                    domain = self._cookie_domain,
+                    secure = self._cookie_secure,
+                    httponly = self._cookie_httponly,
+                    )
+            self._sweep()
+            return True
+
+        def _sweep(self):
+            if self._sweep_interval is None:
+                return
+            now = time.time()
+            cls = self.__class__
+            # sweeping is skipped rather than waited for if another thread
+            # is already doing it
+            if now >= cls._next_sweep and sweep_lock.acquire(False):
+                try:
+                    cls._next_sweep = now + self._sweep_interval
+                    self._storage.sweep(int(now) - self._timeout)
+                finally:
+                    sweep_lock.release()
+
+    return ServerSideSession
+
+def _new_session_id():
+    """ Return a new random session id (a string of 40 hex digits)."""
+    return native_(binascii.hexlify(os.urandom(20)))
+
+def _sign_session_id(session_id, secret):
+    """ Return the cookie value for ``session_id``: the id followed by
+    its 40 character HMAC-SHA1 signature made using ``secret``."""
+    sig = hmac.new(bytes_(secret), bytes_(session_id), sha1).hexdigest()
+    return session_id + sig
+
+def _unsign_session_id(cookieval, secret):
+    """ Return the session id contained in a cookie value created by
+    ``sign_session_id`` or ``None`` if its signature is invalid."""
+    session_id, input_sig = cookieval[:-40], cookieval[-40:]
+    sig = hmac.new(bytes_(secret), bytes_(session_id), sha1).hexdigest()
+    if not session_id or strings_differ(sig, input_sig):
+        return None
+    return session_id
+
+@implementer(ISessionStorage)
+class MemorySessionStorage(object):
+    """ A :term:`session` storage which keeps sessions in the memory of the
+    current process, discarding the least recently used sessions (a tenth
+    of them at a time) once more than ``max_sessions`` sessions are stored.
+    Sessions are lost when the process ends and aren't shared between
+    processes."""
+    def __init__(self, max_sessions=10000):
+        self.max_sessions = max_sessions
+        # session id -> [last use, access time, pickled value]
+        self.sessions = {}
+        self._uses = itertools.count()
+        self._lock = threading.Lock()
+
+    def load(self, session_id):
+        entry = self.sessions.get(session_id)
+        if entry is not None:
+            entry[0] = next(self._uses)
+            # values are pickled to avoid sharing mutable state between
+            # concurrently served requests
+            return pickle.loads(entry[2])
+
+    def save(self, session_id, value):
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self.sessions[session_id] = [next(self._uses), value[0], pickled]
+        if len(self.sessions) > self.max_sessions:
+            self._discard()
+
+    def delete(self, session_id):
+        self.sessions.pop(session_id, None)
+
+    def sweep(self, expired):
+        for session_id, entry in list(self.sessions.items()):
+            if entry[1] < expired:
+                self.sessions.pop(session_id, None)
+
+    def _discard(self):
+        # discard the least recently used sessions in a batch, so that
+        # sorting the sessions by use is rarely needed
+        with self._lock:
+            keep = self.max_sessions - self.max_sessions // 10
+            excess = len(self.sessions) - keep
+            if excess <= 0:
+                return
+            uses = sorted((entry[0], session_id) for session_id, entry
+                          in list(self.sessions.items()))
+            for use, session_id in uses[:excess]:
+                self.sessions.pop(session_id, None)
+
+@implementer(ISessionStorage)
+class FileSessionStorage(object):
+    """ A :term:`session` storage which keeps each session in a file of its
+    own in ``directory``, which is created if it doesn't exist.  Files are
+    replaced atomically, so the storage may be shared by all processes of
+    an application running on the same host."""
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+    def _path(self, session_id):
+        if not session_id.isalnum():
+            raise ValueError('Invalid session id %r' % session_id)
+        return os.path.join(self.directory, session_id)
+
+    def load(self, session_id):
+        try:
+            with open(self._path(session_id), 'rb') as f:
+                return pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save(self, session_id, value):
+        path = self._path(session_id)
+        fd, tmp = tempfile.mkstemp(prefix='.', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+            # the modification time of the file is its access time, so
+            # sweeping needn't unpickle each session
+            os.utime(tmp, (value[0], value[0]))
+            try:
+                os.rename(tmp, path)
+            except OSError: # pragma: no cover (windows)
+                os.remove(path)
+                os.rename(tmp, path)
+        except:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def delete(self, session_id):
+        try:
+            os.remove(self._path(session_id))
+        except OSError:
+            pass
 
+    def sweep(self, expired):
+        for name in os.listdir(self.directory):
+            if name.startswith('.'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < expired:
+                    os.remove(path)
+            except OSError:
+                pass
+
+@implementer(ISessionStorage)
+class DBMSessionStorage(object):
+    """ A :term:`session` storage which keeps sessions in the :mod:`dbm`
+    style database named ``filename`` (which is created if it doesn't
+    exist).  The database is kept open by this storage, so it must not be
+    used by more than one process at a time."""
+    def __init__(self, filename):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.db = dbm.open(filename, 'c')
+
+    def load(self, session_id):
+        with self.lock:
+            try:
+                pickled = self.db[bytes_(session_id)]
+            except KeyError:
+                return None
+        return pickle.loads(pickled)
+
+    def save(self, session_id, value):
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.db[bytes_(session_id)] = pickled
+            self._sync()
+
+    def delete(self, session_id):
+        with self.lock:
+            try:
+                del self.db[bytes_(session_id)]
+            except KeyError:
+                pass
+            self._sync()
+
+    def sweep(self, expired):
+        with self.lock:
+            for key in list(self.db.keys()):
+                if pickle.loads(self.db[key])[0] < expired:
+                    del self.db[key]
+            self._sync()
+
+    def _sync(self):
+        sync = getattr(self.db, 'sync', None)
+        if sync is not None:
+            sync()
+
+    def close(self):
+        """ Close the database."""
+        with self.lock:
+            self.db.close()
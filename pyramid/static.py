@@ -1,5 +1,10 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import json
+import mimetypes
 import os
+import time
+import zlib
 
 from os.path import (
     normcase,
@@ -9,25 +14,45 @@ from os.path import (
     exists,
     )
 
+from stat import S_ISREG
+
 from pkg_resources import (
     resource_exists,
     resource_filename,
     resource_isdir,
     )
 
-from repoze.lru import lru_cache
+from zope.interface import implementer
+
+from repoze.lru import (
+    LRUCache,
+    lru_cache,
+    )
 
 from pyramid.asset import resolve_asset_spec
 
-from pyramid.compat import text_
+from pyramid.compat import (
+    text_,
+    url_quote,
+    )
 
 from pyramid.httpexceptions import (
     HTTPNotFound,
     HTTPMovedPermanently,
     )
 
-from pyramid.path import caller_package
-from pyramid.response import FileResponse
+from pyramid.interfaces import ICacheBuster
+
+from pyramid.path import (
+    AssetResolver,
+    caller_package,
+    )
+from pyramid.response import (
+    FileResponse,
+    Response,
+    _BLOCK_SIZE,
+    _file_app_iter,
+    )
 from pyramid.traversal import traversal_path_info
 
 slash = text_('/')
@@ -67,6 +92,46 @@ class static_view(object):
     the static application will consider request.environ[``PATH_INFO``] as
     ``PATH_INFO`` input. By default, this is ``False``.
 
+    ``file_cache_size`` is the number of files about which information is
+    kept in memory between requests: the file they resolve to, their size,
+    modification time, MIME type and ETag and, if they are no larger than
+    ``file_cache_max_body`` bytes (default 65536), their contents.  Serving a
+    cached file requires no filesystem access at all, except every
+    ``file_cache_interval`` seconds (default 1), when the file is checked for
+    changes.  By default, ``file_cache_size`` is ``0``, meaning that no such
+    cache is used.
+
+    If ``gzip`` is ``True``, files are served gzip compressed to clients
+    which accept that encoding.  If a file has a sibling with the same
+    name plus ``.gz`` (see the ``pcompress`` command) which is not older
+    than the file, that sibling is served.  Otherwise, text files (as well as JavaScript, JSON, XML and SVG
+    files) of up to one megabyte are compressed when first served, and the
+    compressed bytes are kept in memory.  Responses for files which have a
+    compressed variant carry a ``Vary: Accept-Encoding`` header.  By default,
+    ``gzip`` is ``False``.
+
+    ``block_size`` is the number of bytes read from a file at a time while
+    serving it (default 262144).  Requests for a byte range of a file
+    (``Range`` requests) are answered by reading just that range.
+
+    If ``sendfile_header`` is not ``None``, files are not served by the view
+    itself: its responses instead carry a header by that name, such as
+    ``X-Sendfile`` or ``X-Accel-Redirect``, telling a front-end web server
+    which file to send.  The header's value is the absolute path of the file
+    or, if ``sendfile_prefix`` is not ``None``, ``sendfile_prefix`` followed
+    by the path of the file relative to ``root_dir`` (e.g. ``/protected/``
+    for an nginx ``internal`` location serving ``root_dir``).  The file
+    cache and the ``gzip`` option are not used in this mode; the front-end
+    server is expected to handle compression and ``Range`` requests itself.
+    By default, ``sendfile_header`` is ``None``.
+
+    ``cachebust`` is an object implementing
+    :class:`pyramid.interfaces.ICacheBuster` (see
+    :meth:`pyramid.config.Configurator.add_static_view`).  Requests whose
+    path it matches are answered with headers allowing the response to be
+    cached for a year without revalidation, regardless of
+    ``cache_max_age``.  By default, ``cachebust`` is ``None``.
+
     .. note::
 
        If the ``root_dir`` is relative to a :term:`package`, or is a
@@ -78,7 +143,10 @@ class static_view(object):
     """
 
     def __init__(self, root_dir, cache_max_age=3600, package_name=None,
-                 use_subpath=False, index='index.html'):
+                 use_subpath=False, index='index.html', file_cache_size=0,
+                 file_cache_max_body=65536, file_cache_interval=1,
+                 gzip=False, block_size=_BLOCK_SIZE, sendfile_header=None,
+                 sendfile_prefix=None, cachebust=None):
         # package_name is for bw compat; it is preferred to pass in a
         # package-relative path as root_dir
         # (e.g. ``anotherpackage:foo/static``).
@@ -91,6 +159,20 @@ class static_view(object):
         self.docroot = docroot
         self.norm_docroot = normcase(normpath(docroot))
         self.index = index
+        if file_cache_size:
+            self.file_cache = LRUCache(file_cache_size)
+        else:
+            self.file_cache = None
+        self.file_cache_max_body = file_cache_max_body
+        self.file_cache_interval = file_cache_interval
+        if gzip:
+            self.gzip_cache = LRUCache(256)
+        else:
+            self.gzip_cache = None
+        self.block_size = block_size
+        self.sendfile_header = sendfile_header
+        self.sendfile_prefix = sendfile_prefix
+        self.cachebust = cachebust
 
     def __call__(self, context, request):
         if self.use_subpath:
@@ -98,20 +180,108 @@ class static_view(object):
         else:
             path_tuple = traversal_path_info(request.environ['PATH_INFO'])
 
+        immutable = False
+        if self.cachebust is not None:
+            requested = slash.join(path_tuple)
+            subpath = self.cachebust.match(tuple(path_tuple))
+            if subpath is not None:
+                path_tuple = tuple(subpath)
+                immutable = True
+
         path = _secure_path(path_tuple)
 
         if path is None:
             return HTTPNotFound('Out of bounds: %s' % request.url)
 
+        if immutable:
+            # only the URL the cache buster generates for the asset as it is
+            # now may be cached forever; a stale or made up one is served
+            # with the usual caching headers
+            subpath = self.cachebust.pregenerate(self._pathspec(path), path,
+                                                 {})[0]
+            immutable = subpath == requested
+
+        response = self._response(path, request)
+        if immutable and response.status_int == 200:
+            response.cache_expires = _IMMUTABLE_MAX_AGE
+            response.headers['Cache-Control'] = _IMMUTABLE_CACHE_CONTROL
+        return response
+
+    def _pathspec(self, path):
+        # the asset specification (or absolute filename) of ``path``
+        if self.package_name:
+            return '%s:%s/%s' % (self.package_name, self.docroot.rstrip('/'),
+                                 path)
+        return normpath(join(self.norm_docroot, path))
+
+    def _response(self, path, request):
+        if self.sendfile_header is not None:
+            return self._sendfile_response(path, request)
+
+        if self.file_cache is not None:
+            return self._cached_response(path, request)
+
+        filepath, index, response = self._resolve(path, request)
+
+        if response is not None:
+            return response
+
+        if self.gzip_cache is not None:
+            return self._gzip_response(filepath, request)
+
+        return FileResponse(filepath, request, self.cache_max_age,
+                            block_size=self.block_size)
+
+    def _gzip_response(self, filepath, request):
+        # Without a file cache to keep them, file bodies aren't read into
+        # memory: the variant to send is chosen first, then served from its
+        # file (or from the gzip cache when compressed on the fly).
+        st = os.stat(filepath)
+        content_type, content_encoding = _guess_type(filepath)
+        etag = _etag(st.st_mtime, st.st_size)
+        variant = _gzip_variant(filepath, st.st_mtime, st.st_size,
+                                content_type, content_encoding,
+                                self.gzip_cache)
+        accept_encoding = request.environ.get('HTTP_ACCEPT_ENCODING')
+        if variant is not None and _accepts_gzip(accept_encoding):
+            gzpath, length, body = variant
+            if body is None:
+                response = FileResponse(gzpath, request, self.cache_max_age,
+                                        content_type=content_type,
+                                        block_size=self.block_size)
+            else:
+                response = Response(conditional_response=True)
+                response.content_type = content_type
+                response.body = body
+                if self.cache_max_age is not None:
+                    response.cache_expires = self.cache_max_age
+            response.content_encoding = 'gzip'
+            response.last_modified = st.st_mtime
+            response.etag = etag + '-gz'
+        else:
+            response = FileResponse(filepath, request, self.cache_max_age,
+                                    block_size=self.block_size)
+            response.etag = etag
+        if variant is not None:
+            response.vary = ('Accept-Encoding',)
+        return response
+
+    def _resolve(self, path, request):
+        # Return a (filepath, index, response) tuple: the name of the file
+        # ``path`` refers to and whether it is a directory index, or a
+        # redirect or not found response if it doesn't refer to a file.
+        index = False
+
         if self.package_name: # package resource
 
             resource_path ='%s/%s' % (self.docroot.rstrip('/'), path)
             if resource_isdir(self.package_name, resource_path):
                 if not request.path_url.endswith('/'):
-                    return self.add_slash_redirect(request)
+                    return None, index, self.add_slash_redirect(request)
                 resource_path = '%s/%s' % (resource_path.rstrip('/'),self.index)
+                index = True
             if not resource_exists(self.package_name, resource_path):
-                return HTTPNotFound(request.url)
+                return None, index, HTTPNotFound(request.url)
             filepath = resource_filename(self.package_name, resource_path)
 
         else: # filesystem file
@@ -120,12 +290,51 @@ class static_view(object):
             filepath = normcase(normpath(join(self.norm_docroot, path)))
             if isdir(filepath):
                 if not request.path_url.endswith('/'):
-                    return self.add_slash_redirect(request)
+                    return None, index, self.add_slash_redirect(request)
                 filepath = join(filepath, self.index)
+                index = True
             if not exists(filepath):
-                return HTTPNotFound(request.url)
+                return None, index, HTTPNotFound(request.url)
 
-        return FileResponse(filepath, request, self.cache_max_age)
+        return filepath, index, None
+
+    def _sendfile_response(self, path, request):
+        filepath, index, response = self._resolve(path, request)
+        if response is not None:
+            return response
+        value = None
+        if self.sendfile_prefix is not None:
+            if index:
+                path = '%s/%s' % (path.rstrip('/'), self.index)
+            value = '%s/%s' % (self.sendfile_prefix.rstrip('/'),
+                               url_quote(path.encode('utf-8')))
+        return FileResponse(filepath, request, self.cache_max_age,
+                            sendfile_header=self.sendfile_header,
+                            sendfile_value=value)
+
+    def _cached_response(self, path, request):
+        now = time.time()
+        entry = self.file_cache.get(path)
+        if entry is not None and now >= entry.next_check:
+            entry = entry.revalidate(now + self.file_cache_interval)
+            if entry is None:
+                self.file_cache.invalidate(path)
+            else:
+                self.file_cache.put(path, entry)
+
+        if entry is None:
+            filepath, index, response = self._resolve(path, request)
+            if response is not None:
+                return response
+            entry = _CachedFile(filepath, index, self.file_cache_max_body,
+                                now + self.file_cache_interval,
+                                self.gzip_cache)
+            self.file_cache.put(path, entry)
+
+        elif entry.index and not request.path_url.endswith('/'):
+            return self.add_slash_redirect(request)
+
+        return entry.response(request, self.cache_max_age, self.block_size)
 
     def add_slash_redirect(self, request):
         url = request.path_url + '/'
@@ -134,6 +343,316 @@ class static_view(object):
             url = url + '?' + qs
         return HTTPMovedPermanently(url)
 
+# cache-busted URLs may be cached for a year, the longest time allowed by
+# HTTP/1.1, and never need to be revalidated
+_IMMUTABLE_MAX_AGE = 31536000
+_IMMUTABLE_CACHE_CONTROL = 'max-age=%d, public, immutable' % (
+    _IMMUTABLE_MAX_AGE,)
+
+@implementer(ICacheBuster)
+class PathSegmentMd5CacheBuster(object):
+    """ A cache buster (see :class:`pyramid.interfaces.ICacheBuster`) which
+    inserts the MD5 checksum of the contents of an asset as the first path
+    segment of the subpath of its URL, e.g. ``/static/<md5>/css/main.css``.
+    This is what ``cachebust=True`` means in a call to
+    :meth:`pyramid.config.Configurator.add_static_view`.
+
+    The checksum of an asset is computed when its URL is first generated and
+    remembered along with the modification time and size of its file.  The
+    file is checked each time the checksum is used (when a URL is generated
+    or a cache-busted URL is requested), and the checksum is computed again
+    if the file has changed, so an asset which changes while the application
+    runs gets a new URL, and its former URL is no longer served with
+    far-future caching headers."""
+
+    def __init__(self):
+        # pathspec -> (filename, (mtime, size), checksum)
+        self.tokens = {}
+
+    def token(self, pathspec):
+        """ Return the checksum of the asset named by ``pathspec``, or
+        ``None`` if it is not a file."""
+        entry = self.tokens.get(pathspec)
+        if entry is None:
+            filename = AssetResolver(None).resolve(pathspec).abspath()
+        else:
+            filename = entry[0]
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        if not S_ISREG(st.st_mode):
+            return None
+        version = (st.st_mtime, st.st_size)
+        if entry is not None and entry[1] == version:
+            return entry[2]
+        token = _md5_file(filename)
+        if token is not None:
+            self.tokens[pathspec] = (filename, version, token)
+        return token
+
+    def pregenerate(self, pathspec, subpath, kw):
+        token = self.token(pathspec)
+        if token is None:
+            return subpath, kw
+        return '%s/%s' % (token, subpath), kw
+
+    def match(self, subpath):
+        if len(subpath) > 1 and _is_md5(subpath[0]):
+            return subpath[1:]
+        return None
+
+def _md5_file(filename):
+    # the hex MD5 checksum of the contents of a file, or None if it can't
+    # be read
+    try:
+        f = open(filename, 'rb')
+    except (IOError, OSError):
+        return None
+    try:
+        md5 = hashlib.md5()
+        while True:
+            data = f.read(_BLOCK_SIZE)
+            if not data:
+                break
+            md5.update(data)
+    finally:
+        f.close()
+    return md5.hexdigest()
+
+_hexdigits = frozenset('0123456789abcdef')
+
+def _is_md5(segment):
+    return len(segment) == 32 and _hexdigits.issuperset(segment)
+
+@implementer(ICacheBuster)
+class ManifestCacheBuster(object):
+    """ A cache buster (see :class:`pyramid.interfaces.ICacheBuster`) for
+    static assets which a build tool copies under versioned names, and
+    whose original and versioned names it lists in a JSON manifest, e.g.
+    ``{"css/main.css": "css/main-678b7c80.css"}``.  The names are relative
+    to the root of the static view.  URLs generated for an asset listed in
+    the manifest point at its versioned copy; other assets get plain
+    URLs.
+
+    ``manifest_spec`` is an :term:`asset specification` or a path naming
+    the manifest.  A relative ``manifest_spec`` is considered relative to
+    the package of the module which creates the cache buster.  The manifest
+    is read once, when the cache buster is created."""
+
+    def __init__(self, manifest_spec):
+        resolver = AssetResolver(caller_package())
+        f = resolver.resolve(manifest_spec).stream()
+        try:
+            manifest = json.loads(f.read().decode('utf-8'))
+        finally:
+            f.close()
+        self.manifest = manifest
+        self.versioned = frozenset(
+            tuple(name.split('/')) for name in manifest.values())
+
+    def pregenerate(self, pathspec, subpath, kw):
+        return self.manifest.get(subpath, subpath), kw
+
+    def match(self, subpath):
+        if subpath in self.versioned:
+            return subpath
+        return None
+
+class _CachedFile(object):
+    """ Information about a file served by a ``static_view``, from which
+    responses can be created without accessing the filesystem.  If
+    ``gzip_cache`` is not ``None``, a gzip compressed variant of the file is
+    prepared too, if possible."""
+    def __init__(self, filepath, index, max_body, next_check,
+                 gzip_cache=None, stat=None):
+        if stat is None:
+            stat = os.stat(filepath)
+        self.filepath = filepath
+        self.index = index # the file is the index of a directory
+        self.max_body = max_body
+        self.next_check = next_check
+        self.gzip_cache = gzip_cache
+        self.mtime = stat.st_mtime
+        self.size = stat.st_size
+        content_type, content_encoding = _guess_type(filepath)
+        etag = _etag(self.mtime, self.size)
+        self.gzip = None
+        if gzip_cache is not None:
+            self.gzip = self._gzip_variant(content_type, content_encoding,
+                                           etag)
+        vary = self.gzip is not None
+        self.identity = _FileVariant(
+            filepath, self.size, max_body,
+            _headerlist(self.mtime, content_type, content_encoding, etag,
+                        self.size, vary),
+            )
+
+    def _gzip_variant(self, content_type, content_encoding, etag):
+        variant = _gzip_variant(self.filepath, self.mtime, self.size,
+                                content_type, content_encoding,
+                                self.gzip_cache)
+        if variant is None:
+            return None
+        gzpath, length, body = variant
+        headerlist = _headerlist(self.mtime, content_type, 'gzip',
+                                 etag + '-gz', length, True)
+        return _FileVariant(gzpath, length, self.max_body, headerlist, body)
+
+    def revalidate(self, next_check):
+        """ Return an up to date entry for the file or ``None`` if it no
+        longer exists."""
+        try:
+            stat = os.stat(self.filepath)
+        except OSError:
+            return None
+        if stat.st_mtime == self.mtime and stat.st_size == self.size:
+            self.next_check = next_check
+            return self
+        return self.__class__(self.filepath, self.index, self.max_body,
+                              next_check, self.gzip_cache, stat)
+
+    def response(self, request, cache_max_age, block_size=_BLOCK_SIZE):
+        variant = self.identity
+        if self.gzip is not None:
+            if _accepts_gzip(request.environ.get('HTTP_ACCEPT_ENCODING')):
+                variant = self.gzip
+        response = Response(headerlist=list(variant.headerlist),
+                            app_iter=variant.app_iter(request, block_size),
+                            conditional_response=True)
+        if cache_max_age is not None:
+            response.cache_expires = cache_max_age
+        return response
+
+class _FileVariant(object):
+    """ A representation of a file: its response headers and either its
+    body or the name of the file containing it."""
+    def __init__(self, filepath, size, max_body, headerlist, body=None):
+        self.filepath = filepath
+        self.headerlist = headerlist
+        if body is None and size <= max_body:
+            with open(filepath, 'rb') as f:
+                body = f.read()
+            if len(body) != size: # pragma: no cover (race)
+                body = None
+        self.body = body
+
+    def app_iter(self, request, block_size=_BLOCK_SIZE):
+        if self.body is not None:
+            return [self.body]
+        f = open(self.filepath, 'rb')
+        return _file_app_iter(f, request, block_size)
+
+def _guess_type(filepath):
+    # the content type and encoding files are served with
+    content_type, content_encoding = mimetypes.guess_type(filepath,
+                                                          strict=False)
+    if content_type is None:
+        content_type = 'application/octet-stream'
+    return content_type, content_encoding
+
+def _etag(mtime, size):
+    return '%x-%x' % (int(mtime * 1000), size)
+
+def _gzip_variant(filepath, mtime, size, content_type, content_encoding,
+                  gzip_cache):
+    # Return a ``(gzpath, length, body)`` tuple describing the gzip
+    # compressed variant of a file: either a precompressed sibling file
+    # (``body`` is None) or bytes compressed on the fly and kept in
+    # ``gzip_cache`` (``gzpath`` is None); or None if the file has no such
+    # variant worth serving.
+    gzpath = filepath + '.gz'
+    try:
+        gzstat = os.stat(gzpath)
+    except OSError:
+        gzstat = None
+    # a sibling older than the file was compressed from an earlier version
+    # of it and is ignored
+    if gzstat is not None and gzstat.st_mtime >= mtime:
+        return gzpath, gzstat.st_size, None
+
+    if not compressible(content_type, content_encoding):
+        return None
+    if size > _GZIP_MAX_SIZE:
+        return None
+    key = (filepath, mtime, size)
+    body = gzip_cache.get(key)
+    if body is None:
+        with open(filepath, 'rb') as f:
+            body = gzip_compress(f.read())
+        gzip_cache.put(key, body)
+    if len(body) >= size:
+        return None
+    return None, len(body), body
+
+def _headerlist(mtime, content_type, content_encoding, etag, length, vary):
+    # the headers are computed the same way FileResponse computes them
+    response = Response(conditional_response=True)
+    response.last_modified = mtime
+    response.content_type = content_type
+    response.content_encoding = content_encoding
+    response.etag = etag
+    response.content_length = length
+    if vary:
+        response.vary = ('Accept-Encoding',)
+    return response.headerlist
+
+# files larger than this aren't compressed on the fly
+_GZIP_MAX_SIZE = 1024 * 1024
+
+# MIME types, besides text/*, of files worth compressing
+_compressible_types = set([
+    'application/javascript',
+    'application/x-javascript',
+    'application/json',
+    'application/xml',
+    'application/xhtml+xml',
+    'application/rss+xml',
+    'application/atom+xml',
+    'image/svg+xml',
+    'image/x-icon',
+    'image/vnd.microsoft.icon',
+    ])
+
+def compressible(content_type, content_encoding=None):
+    """ Return ``True`` if a file of the MIME type ``content_type`` which
+    has no ``content_encoding`` is worth compressing: text, JavaScript,
+    JSON, XML, SVG and icon files are; anything already encoded isn't.  This
+    is what the ``gzip`` option of :class:`pyramid.static.static_view` and
+    the ``pcompress`` command consider compressible."""
+    if content_encoding is not None:
+        return False
+    return (content_type.startswith('text/') or
+            content_type in _compressible_types)
+
+def gzip_compress(data):
+    """ Return ``data`` (bytes) compressed in the gzip format."""
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+@lru_cache(100)
+def _accepts_gzip(accept_encoding):
+    # whether an Accept-Encoding header value allows a gzip response
+    if not accept_encoding:
+        return False
+    star = False
+    for item in accept_encoding.split(','):
+        params = item.split(';')
+        coding = params.pop(0).strip().lower()
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ('gzip', 'x-gzip'):
+            return q > 0
+        if coding == '*':
+            star = q > 0
+    return star
+
 _seps = set(['/', os.sep])
 def _contains_slash(item):
     for sep in _seps:
@@ -348,8 +348,10 @@ class TestAutkTktAuthenticationPolicy(unittest.TestCase):
         inst = self._getTargetClass()(
             'secret', callback=None, cookie_name=None, secure=False,
             include_ip=False, timeout=None, reissue_time=None,
+            cache_size=10, cache_ttl=60,
             )
         self.assertEqual(inst.callback, None)
+        self.assertEqual(inst.cookie.cache_ttl, 60)
 
     def test_class_implements_IAuthenticationPolicy(self):
         from zope.interface.verify import verifyClass
@@ -606,6 +608,74 @@ class TestAuthTktCookieHelper(unittest.TestCase):
         result = helper.identify(request)
         self.assertEqual(result, None)
     
+    def test_identify_cached(self):
+        helper = self._makeOne('secret', cache_size=10)
+        helper.now = 100
+        helper.auth_tkt.userid = '1'
+        helper.auth_tkt.user_data = 'userid_type:int'
+        helper.auth_tkt.tokens = ['a']
+        request = self._makeRequest('ticket')
+        result = helper.identify(request)
+        self.assertEqual(result['userid'], 1)
+        helper.auth_tkt.parse_raise = True
+        request = self._makeRequest('ticket')
+        result = helper.identify(request)
+        self.assertEqual(result['userid'], 1)
+        self.assertEqual(result['tokens'], ['a'])
+        self.assertEqual(request.environ['REMOTE_USER_TOKENS'], ['a'])
+
+    def test_identify_cached_ttl_expired(self):
+        helper = self._makeOne('secret', cache_size=10, cache_ttl=10)
+        helper.now = 100
+        request = self._makeRequest('ticket')
+        self.assertTrue(helper.identify(request))
+        helper.auth_tkt.parse_raise = True
+        helper.now = 111
+        request = self._makeRequest('ticket')
+        self.assertEqual(helper.identify(request), None)
+
+    def test_identify_cached_timed_out(self):
+        helper = self._makeOne('secret', cache_size=10, cache_ttl=100,
+                               timeout=10)
+        helper.auth_tkt.timestamp = 100
+        helper.now = 105
+        request = self._makeRequest('ticket')
+        self.assertTrue(helper.identify(request))
+        helper.now = 111
+        request = self._makeRequest('ticket')
+        self.assertEqual(helper.identify(request), None)
+
+    def test_identify_cached_reissue(self):
+        helper = self._makeOne('secret', cache_size=10, reissue_time=10)
+        helper.auth_tkt.timestamp = 100
+        helper.now = 105
+        request = self._makeRequest('ticket')
+        self.assertTrue(helper.identify(request))
+        self.assertEqual(len(request.callbacks), 0)
+        helper.now = 111
+        request = self._makeRequest('ticket')
+        self.assertTrue(helper.identify(request))
+        self.assertEqual(len(request.callbacks), 1)
+
+    def test_identify_cached_include_ip(self):
+        helper = self._makeOne('secret', cache_size=10, include_ip=True)
+        helper.now = 100
+        request = self._makeRequest('ticket')
+        self.assertTrue(helper.identify(request))
+        helper.auth_tkt.parse_raise = True
+        request = self._makeRequest('ticket')
+        request.environ['REMOTE_ADDR'] = '2.2.2.2'
+        self.assertEqual(helper.identify(request), None)
+
+    def test_identify_bad_cookie_not_cached(self):
+        helper = self._makeOne('secret', cache_size=10)
+        helper.auth_tkt.parse_raise = True
+        request = self._makeRequest('ticket')
+        self.assertEqual(helper.identify(request), None)
+        helper.auth_tkt.parse_raise = False
+        request = self._makeRequest('ticket')
+        self.assertTrue(helper.identify(request))
+
     def test_identify_cookie_timed_out(self):
         helper = self._makeOne('secret', timeout=1)
         request = self._makeRequest({'HTTP_COOKIE':'auth_tkt=bogus'})
@@ -895,6 +965,73 @@ class TestAuthTktCookieHelper(unittest.TestCase):
         self.assertEqual(values[0]['max-age'], '500')
         self.assertTrue(values[0]['expires'])
 
+    def test_remember_max_age_expires(self):
+        import time
+        helper = self._makeOne('secret')
+        request = self._makeRequest()
+        before = int(time.time())
+        result = helper.remember(request, 'userid', max_age=500)
+        values = self._parseHeaders(result)
+        expires = time.mktime(time.strptime(values[0]['expires'],
+                                            '%a, %d %b %Y %H:%M:%S GMT'))
+        expires -= time.mktime(time.gmtime(0))
+        self.assertTrue(before + 500 <= expires <= time.time() + 500)
+
+    def test_remember_max_age_flags_cached(self):
+        helper = self._makeOne('secret')
+        helper.now = 0.5
+        request = self._makeRequest()
+        result = helper.remember(request, 'userid', max_age=500)
+        self.assertTrue(result[0][1].endswith(
+            '; Max-Age=500; Expires=Thu, 01 Jan 1970 00:08:20 GMT'))
+        self.assertEqual(helper._max_age_flags[0], (500, 0))
+        helper._max_age_flags = ((500, 0), '; cached')
+        result = helper.remember(request, 'userid', max_age=500)
+        self.assertTrue(result[0][1].endswith('"; Path=/; cached'))
+        helper.now = 1
+        result = helper.remember(request, 'userid', max_age=500)
+        self.assertTrue(result[0][1].endswith(
+            '; Max-Age=500; Expires=Thu, 01 Jan 1970 00:08:21 GMT'))
+
+    def test_remember_host_with_port(self):
+        helper = self._makeOne('secret')
+        request = self._makeRequest()
+        request.environ['HTTP_HOST'] = 'example.com:8080'
+        result = helper.remember(request, 'userid')
+        self.assertTrue(result[1][1].endswith('; Domain=example.com'))
+        self.assertTrue(result[2][1].endswith('; Domain=.example.com'))
+
+    def test_remember_cookie_tails_cached_per_host(self):
+        helper = self._makeOne('secret')
+        request = self._makeRequest()
+        request.environ['HTTP_HOST'] = 'example.com'
+        helper.remember(request, 'userid')
+        self.assertEqual(len(helper._cookie_tails.get('example.com')), 3)
+        request.environ['HTTP_HOST'] = 'example.org'
+        result = helper.remember(request, 'userid')
+        self.assertTrue(result[1][1].endswith('; Domain=example.org'))
+
+    def test_remember_single_cookie_wild_domain(self):
+        helper = self._makeOne('secret', single_cookie=True)
+        request = self._makeRequest()
+        result = helper.remember(request, 'userid')
+        self.assertEqual(len(result), 1)
+        self.assertTrue(result[0][1].endswith('; Domain=.localhost'))
+
+    def test_remember_single_cookie_no_wild_domain(self):
+        helper = self._makeOne('secret', single_cookie=True,
+                               wild_domain=False)
+        request = self._makeRequest()
+        result = helper.remember(request, 'userid')
+        self.assertEqual(len(result), 1)
+        self.assertTrue(result[0][1].endswith('"; Path=/'))
+
+    def test_forget_single_cookie(self):
+        helper = self._makeOne('secret', single_cookie=True)
+        request = self._makeRequest()
+        headers = helper.forget(request)
+        self.assertEqual(len(headers), 3)
+
     def test_remember_tokens(self):
         helper = self._makeOne('secret')
         request = self._makeRequest()
@@ -978,6 +1115,19 @@ class TestAuthTicket(unittest.TestCase):
         self.assertEqual(result,
                          '66f9cc3e423dc57c91df696cf3d1f0d80000000auserid!a,b!')
 
+class Test_encode_ip_timestamp(unittest.TestCase):
+    def _callFUT(self, ip, timestamp):
+        from pyramid.authentication import encode_ip_timestamp
+        return encode_ip_timestamp(ip, timestamp)
+
+    def test_it(self):
+        result = self._callFUT('1.2.3.4', 0x05060708)
+        self.assertEqual(result, b'\x01\x02\x03\x04\x05\x06\x07\x08')
+
+    def test_float_timestamp(self):
+        result = self._callFUT('0.0.0.0', 10.9)
+        self.assertEqual(result, b'\x00\x00\x00\x00\x00\x00\x00\x0a')
+
 class TestBadTicket(unittest.TestCase):
     def _makeOne(self, msg, expected=None):
         from pyramid.authentication import BadTicket
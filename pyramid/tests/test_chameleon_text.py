@@ -73,6 +73,26 @@ class TextTemplateRendererTests(Base, unittest.TestCase):
         template  = instance.template
         self.assertEqual(template.debug, True)
 
+    @skip_on('java')
+    def test_template_with_module_loader(self):
+        import os
+        import shutil
+        import tempfile
+        from chameleon.loader import ModuleLoader
+        minimal = self._getTemplatePath('minimal.txt')
+        tmpdir = tempfile.mkdtemp()
+        try:
+            lookup = DummyLookup()
+            lookup.debug = False
+            lookup.module_loader = ModuleLoader(tmpdir)
+            instance = self._makeOne(minimal, lookup)
+            template = instance.template
+            self.assertTrue(template.loader is lookup.module_loader)
+            instance({}, {})
+            self.assertTrue(os.listdir(tmpdir))
+        finally:
+            shutil.rmtree(tmpdir)
+
     @skip_on('java')
     def test_template_with_reload_templates(self):
         minimal = self._getTemplatePath('minimal.txt')
@@ -205,5 +225,6 @@ class GetTemplateTests(Base, unittest.TestCase):
 class DummyLookup(object):
     auto_reload=True
     debug = True
+    module_loader = None
     def translate(self, msg): pass
     
@@ -111,6 +111,18 @@ class TestAssetsConfiguratorMixin(unittest.TestCase):
                                                  name='package')
         self.assertEqual(overrides.inserted, [('path', 'opackage', 'oprefix')])
         self.assertEqual(overrides.package, package)
+        self.assertFalse(hasattr(overrides, 'cache_resolved'))
+
+    def test__override_not_yet_registered_reload_assets(self):
+        from pyramid.interfaces import IPackageOverrides
+        package = DummyPackage('package')
+        opackage = DummyPackage('opackage')
+        config = self._makeOne(settings={'pyramid.reload_assets':'true'})
+        config._override(package, 'path', opackage, 'oprefix',
+                         PackageOverrides=DummyPackageOverrides)
+        overrides = config.registry.queryUtility(IPackageOverrides,
+                                                 name='package')
+        self.assertEqual(overrides.cache_resolved, False)
 
     def test__override_already_registered(self):
         from pyramid.interfaces import IPackageOverrides
@@ -502,6 +514,63 @@ class TestPackageOverrides(unittest.TestCase):
         po.overrides= overrides
         self.assertEqual(po.listdir('whatever'), None)
 
+    def test_resolve(self):
+        overrides = [ DummyOverride(None), DummyOverride(
+            ('pyramid.tests.test_config', 'test_assets.py'))]
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        po.overrides= overrides
+        self.assertEqual(po.resolve('whatever'),
+                         ('pyramid.tests.test_config', 'test_assets.py'))
+
+    def test_resolve_cached(self):
+        override = DummyOverride(('pyramid.tests.test_config', 'test_assets.py'))
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        po.overrides= [override]
+        po.resolve('whatever')
+        self.assertEqual(po.resolve('whatever'),
+                         ('pyramid.tests.test_config', 'test_assets.py'))
+        self.assertEqual(override.called, ['whatever'])
+
+    def test_resolve_doesnt_exist_cached(self):
+        override = DummyOverride(('pyramid.tests.test_config', 'wont_exist'))
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        po.overrides= [override]
+        po.resolve('whatever')
+        self.assertEqual(po.resolve('whatever'), None)
+        self.assertEqual(override.called, ['whatever'])
+
+    def test_resolve_cache_resolved_false(self):
+        override = DummyOverride(('pyramid.tests.test_config', 'test_assets.py'))
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        po.overrides= [override]
+        po.cache_resolved = False
+        po.resolve('whatever')
+        po.resolve('whatever')
+        self.assertEqual(override.called, ['whatever', 'whatever'])
+
+    def test_resolve_cache_bounded(self):
+        override = DummyOverride(('pyramid.tests.test_config', 'wont_exist'))
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        po.overrides= [override]
+        size = po.resolved_cache_size
+        for i in range(size * 2):
+            self.assertEqual(po.resolve('notfound%s' % i), None)
+        self.assertEqual(len(po._resolved.data), size)
+
+    def test_insert_invalidates_resolved(self):
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        self.assertEqual(po.resolve('test_assets.py'), None)
+        po.insert('test_assets.py', 'pyramid.tests.test_config',
+                  'test_assets.py')
+        self.assertEqual(po.resolve('test_assets.py'),
+                         ('pyramid.tests.test_config', 'test_assets.py'))
+
 class TestDirectoryOverride(unittest.TestCase):
     def _getTargetClass(self):
         from pyramid.config.assets import DirectoryOverride
@@ -543,8 +612,10 @@ class TestFileOverride(unittest.TestCase):
 class DummyOverride:
     def __init__(self, result):
         self.result = result
+        self.called = []
 
     def __call__(self, resource_name):
+        self.called.append(resource_name)
         return self.result
 
 class DummyOverrides:
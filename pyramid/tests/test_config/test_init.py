@@ -163,6 +163,26 @@ class ConfiguratorTests(unittest.TestCase):
         config.commit()
         self.assertEqual(config.registry.queryUtility(IRootFactory), factory)
 
+    def test_ctor_introspection_setting_false(self):
+        config = self._makeOne(settings={'pyramid.introspection':'false'})
+        self.assertEqual(config.introspection, False)
+        config.add_route('a', '/a')
+        config.commit()
+        self.assertEqual(config.registry.introspector.categories(), [])
+
+    def test_ctor_introspection_setting_false_with_registry(self):
+        from pyramid.registry import Registry
+        registry = Registry()
+        registry.settings = {'pyramid.introspection':False}
+        config = self._makeOne(registry=registry)
+        self.assertEqual(config.introspection, False)
+
+    def test_ctor_introspection_setting_default(self):
+        config = self._makeOne()
+        self.assertEqual(config.introspection, True)
+        config.commit()
+        self.assertTrue(config.registry.introspector.categories())
+
     def test_ctor_alternate_renderers(self):
         from pyramid.interfaces import IRendererFactory
         renderer = object()
@@ -233,6 +253,89 @@ class ConfiguratorTests(unittest.TestCase):
         config = self._makeOne(introspection=False)
         self.assertEqual(config.introspection, False)
 
+    def _overlayApps(self):
+        from pyramid.response import Response
+        def base_view(request):
+            return Response('base')
+        def tenant_view(request):
+            return Response('tenant')
+        config = self._makeOne(settings={'a':'1'})
+        config.add_route('base', '/base')
+        config.add_view(base_view, route_name='base')
+        config.add_route('other', '/other')
+        config.add_view(base_view, route_name='other')
+        tenant = config.overlay('tenant', settings={'b':'2'})
+        tenant.add_route('extra', '/extra')
+        tenant.add_view(tenant_view, route_name='extra')
+        tenant.add_view(tenant_view, route_name='other')
+        return config, tenant, config.make_wsgi_app(), tenant.make_wsgi_app()
+
+    def _get(self, app, path):
+        from pyramid.request import Request
+        response = Request.blank(path).get_response(app)
+        return response.status_int, response.body
+
+    def test_overlay(self):
+        config, tenant, base_app, tenant_app = self._overlayApps()
+        self.assertEqual(tenant.registry.__name__, 'tenant')
+        self.assertEqual(tenant.registry.__bases__, (config.registry,))
+        self.assertEqual(self._get(base_app, '/base'), (200, b'base'))
+        self.assertEqual(self._get(base_app, '/other'), (200, b'base'))
+        self.assertEqual(self._get(base_app, '/extra')[0], 404)
+        self.assertEqual(self._get(tenant_app, '/base'), (200, b'base'))
+        self.assertEqual(self._get(tenant_app, '/other'), (200, b'tenant'))
+        self.assertEqual(self._get(tenant_app, '/extra'), (200, b'tenant'))
+
+    def test_overlay_routes_copied_on_write(self):
+        config, tenant, base_app, tenant_app = self._overlayApps()
+        base_mapper = config.get_routes_mapper()
+        tenant_mapper = tenant.get_routes_mapper()
+        self.assertFalse(base_mapper is tenant_mapper)
+        self.assertEqual([r.name for r in base_mapper.get_routes()],
+                         ['base', 'other'])
+        self.assertEqual([r.name for r in tenant_mapper.get_routes()],
+                         ['base', 'other', 'extra'])
+        self.assertTrue(tenant_mapper.get_route('base') is
+                        base_mapper.get_route('base'))
+
+    def test_overlay_settings(self):
+        config, tenant, base_app, tenant_app = self._overlayApps()
+        self.assertEqual(tenant.registry.settings['a'], '1')
+        self.assertEqual(tenant.registry.settings['b'], '2')
+        self.assertFalse('b' in config.registry.settings)
+
+    def test_overlay_no_settings(self):
+        config = self._makeOne(settings={'a':'1'})
+        tenant = config.overlay('tenant')
+        self.assertTrue(tenant.registry.settings is config.registry.settings)
+
+    def test_overlay_commits(self):
+        config = self._makeOne()
+        config.add_route('base', '/base')
+        config.overlay('tenant')
+        self.assertEqual(config.action_state.actions, [])
+        self.assertEqual(len(config.get_routes_mapper().get_routes()), 1)
+
+    def test_overlay_tweens_copied_on_write(self):
+        from pyramid.interfaces import ITweens
+        config = self._makeOne()
+        config.add_tween('pyramid.tests.test_config.dummy_tween_factory')
+        config.commit()
+        tenant = config.overlay('tenant')
+        tenant.add_tween('pyramid.tests.test_config.dummy_tween_factory2')
+        tenant.commit()
+        base_tweens = config.registry.getUtility(ITweens)
+        tenant_tweens = tenant.registry.getUtility(ITweens)
+        self.assertEqual(len(base_tweens.implicit()), 2)
+        self.assertEqual(len(tenant_tweens.implicit()), 3)
+
+    def test_overlay_introspection_setting(self):
+        config = self._makeOne()
+        tenant = config.overlay('tenant',
+                                settings={'pyramid.introspection':'false'})
+        self.assertEqual(tenant.introspection, False)
+        self.assertEqual(config.introspection, True)
+
     def test_with_package_module(self):
         from pyramid.tests.test_config import test_init
         import pyramid.tests
@@ -986,6 +1089,178 @@ pyramid.tests.test_config.dummy_include2""",
         config.scan('pyramid.tests.test_config.pkgs.scanextrakw', a=1)
         self.assertEqual(config.a, 1)
 
+    def test_scan_snapshot(self):
+        import os
+        import shutil
+        import tempfile
+        from zope.interface import alsoProvides
+        from pyramid.interfaces import IRequest
+        from pyramid.view import render_view_to_response
+        directory = tempfile.mkdtemp()
+        try:
+            snapshot = os.path.join(directory, 'snapshot')
+            config = self._makeOne(autocommit=True)
+            config.scan('pyramid.tests.test_config.pkgs.scannable',
+                        snapshot=snapshot)
+            self.assertTrue(os.path.exists(snapshot))
+            config = self._makeOne(autocommit=True)
+            config.venusian = None # no scan happens
+            config.scan('pyramid.tests.test_config.pkgs.scannable',
+                        snapshot=snapshot)
+        finally:
+            shutil.rmtree(directory)
+
+        ctx = DummyContext()
+        req = DummyRequest()
+        alsoProvides(req, IRequest)
+        req.registry = config.registry
+        req.method = 'GET'
+        result = render_view_to_response(ctx, req, '')
+        self.assertEqual(result, 'grokked')
+        result = render_view_to_response(ctx, req, 'grokked_instance')
+        self.assertEqual(result, 'grokked_instance')
+        result = render_view_to_response(ctx, req, 'stacked_method2')
+        self.assertEqual(result, 'stacked_method')
+        result = render_view_to_response(ctx, req, 'subpackage_init')
+        self.assertEqual(result, 'subpackage_init')
+
+    def test_scan_snapshot_settings_changed(self):
+        import os
+        import shutil
+        import tempfile
+        directory = tempfile.mkdtemp()
+        try:
+            snapshot = os.path.join(directory, 'snapshot')
+            config = self._makeOne(autocommit=True)
+            config.scan('pyramid.tests.test_config.pkgs.scannable',
+                        snapshot=snapshot)
+            config = self._makeOne(autocommit=True, settings={'a':'1'})
+            config.venusian = None
+            self.assertRaises(AttributeError, config.scan,
+                              'pyramid.tests.test_config.pkgs.scannable',
+                              snapshot=snapshot)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_scan_snapshot_with_extra_kw(self):
+        import os
+        import shutil
+        import tempfile
+        directory = tempfile.mkdtemp()
+        try:
+            snapshot = os.path.join(directory, 'snapshot')
+            config = self._makeOne(autocommit=True)
+            config.scan('pyramid.tests.test_config.pkgs.scanextrakw',
+                        snapshot=snapshot, a=1)
+            self.assertEqual(config.a, 1)
+            self.assertFalse(os.path.exists(snapshot))
+        finally:
+            shutil.rmtree(directory)
+
+    def _scannedViews(self, config):
+        return sorted(
+            [intr['introspectable'].discriminator for intr in
+             config.registry.introspector.get_category('views')])
+
+    def test_scan_profile(self):
+        from pyramid.compat import NativeIO
+        package = 'pyramid.tests.test_config.pkgs.scannable'
+        config = self._makeOne(autocommit=True)
+        config.scan(package)
+        expected = self._scannedViews(config)
+        out = NativeIO()
+        config = self._makeOne(autocommit=True)
+        config.scan(package, profile=out)
+        self.assertEqual(self._scannedViews(config), expected)
+        report = out.getvalue()
+        self.assertTrue(report.startswith('Module'))
+        self.assertTrue(package + '.another ' in report)
+        self.assertTrue(package + '.subpackage.subsubpackage ' in report)
+        self.assertTrue('5 modules' in report)
+
+    def test_scan_profile_with_ignore(self):
+        from pyramid.compat import NativeIO
+        package = 'pyramid.tests.test_config.pkgs.scannable'
+        out = NativeIO()
+        config = self._makeOne(autocommit=True)
+        config.scan(package, ignore='.subpackage', profile=out)
+        report = out.getvalue()
+        self.assertTrue(package + '.another ' in report)
+        self.assertFalse(package + '.subpackage' in report)
+
+    def test_scan_index(self):
+        import os
+        import shutil
+        import tempfile
+        package = 'pyramid.tests.test_config.pkgs.scannable'
+        config = self._makeOne(autocommit=True)
+        config.scan(package)
+        expected = self._scannedViews(config)
+        directory = tempfile.mkdtemp()
+        try:
+            index = os.path.join(directory, 'index')
+            config = self._makeOne(autocommit=True)
+            config.scan(package, index=index)
+            self.assertEqual(self._scannedViews(config), expected)
+            with open(index) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines[1:], [
+                package,
+                package + '.another',
+                package + '.subpackage',
+                package + '.subpackage.notinit',
+                package + '.subpackage.subsubpackage',
+                ])
+            # only the modules listed by the index are scanned
+            with open(index, 'w') as f:
+                f.write(lines[0] + '\n' + package + '.another\n')
+            config = self._makeOne(autocommit=True)
+            config.scan(package, index=index)
+            views = self._scannedViews(config)
+            self.assertTrue(views)
+            for discriminator in views:
+                self.assertTrue(discriminator in expected)
+            self.assertTrue(len(views) < len(expected))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_scan_index_settings_changed(self):
+        import os
+        import shutil
+        import tempfile
+        package = 'pyramid.tests.test_config.pkgs.scannable'
+        directory = tempfile.mkdtemp()
+        try:
+            index = os.path.join(directory, 'index')
+            config = self._makeOne(autocommit=True)
+            config.scan(package, index=index)
+            with open(index) as f:
+                key = f.readline()
+            with open(index, 'w') as f:
+                f.write(key)
+            config = self._makeOne(autocommit=True, settings={'a':'1'})
+            config.scan(package, index=index)
+            self.assertTrue(self._scannedViews(config))
+            with open(index) as f:
+                self.assertNotEqual(f.readline(), key)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_scan_index_with_extra_kw(self):
+        import os
+        import shutil
+        import tempfile
+        directory = tempfile.mkdtemp()
+        try:
+            index = os.path.join(directory, 'index')
+            config = self._makeOne(autocommit=True)
+            config.scan('pyramid.tests.test_config.pkgs.scanextrakw',
+                        index=index, a=1)
+            self.assertEqual(config.a, 1)
+            self.assertFalse(os.path.exists(index))
+        finally:
+            shutil.rmtree(directory)
+
     def test_scan_integration_with_onerror(self):
         # fancy sys.path manipulation here to appease "setup.py test" which
         # fails miserably when it can't import something in the package
@@ -1052,6 +1327,16 @@ pyramid.tests.test_config.dummy_include2""",
         finally:
             getSiteManager.reset()
 
+    def test_commit_with_timings(self):
+        config = self._makeOne()
+        def view(request): pass
+        config.add_route('a', '/a')
+        config.add_view(view, route_name='a')
+        timings = {}
+        config.commit(timings=timings)
+        self.assertEqual(timings['routes'][0], 1)
+        self.assertEqual(timings['views'][0], 1)
+
     def test_commit_conflict_simple(self):
         config = self._makeOne()
         def view1(request): pass
@@ -1666,6 +1951,38 @@ class TestActionState(unittest.TestCase):
         self.assertRaises(ConfigurationExecutionError, c.execute_actions)
         self.assertEqual(output, [('f', (1,), {}), ('f', (2,), {})])
 
+    def test_execute_actions_with_timings(self):
+        def f(*a, **k):
+            pass
+        c = self._makeOne()
+        intr = DummyIntrospectable()
+        intr.category_name = 'views'
+        c.actions = [
+            (('route', 'a'), f),
+            (('route', 'b'), f),
+            ('plain', f),
+            {'discriminator':('view', 'x'), 'callable':f, 'args':(), 'kw':{},
+             'order':0, 'includepath':(), 'info':None,
+             'introspectables':(intr,)},
+            ]
+        timings = {'route':[1, 0.5]}
+        c.execute_actions(introspector=object(), timings=timings)
+        self.assertEqual(sorted(timings.keys()), ['plain', 'route', 'views'])
+        self.assertEqual(timings['route'][0], 3)
+        self.assertTrue(timings['route'][1] >= 0.5)
+        self.assertEqual(timings['plain'][0], 1)
+        self.assertEqual(timings['views'][0], 1)
+
+    def test_execute_actions_with_timings_no_discriminator(self):
+        def f(*a, **k):
+            pass
+        c = self._makeOne()
+        c.actions = [(None, f), (None, f)]
+        timings = {}
+        c.execute_actions(timings=timings)
+        self.assertEqual(list(timings.keys()), [None])
+        self.assertEqual(timings[None][0], 2)
+
 class Test_resolveConflicts(unittest.TestCase):
     def _callFUT(self, actions):
         from pyramid.config import resolveConflicts
@@ -47,3 +47,56 @@ class TestRenderingConfiguratorMixin(unittest.TestCase):
         self.assertEqual(config.registry.getUtility(IRendererFactory, 'name'),
                          pyramid.tests.test_config)
 
+
+    def test_compile_templates(self):
+        import os
+        from pyramid.threadlocal import get_current_registry
+        here = os.path.dirname(os.path.dirname(__file__))
+        path = os.path.join(here, 'fixtures', 'minimal.pt')
+        config = self._makeOne()
+        config.add_view(lambda *arg: {}, renderer=path)
+        registries = []
+        def compile_templates(registry):
+            registries.append(get_current_registry())
+            return [(path, None)]
+        from pyramid import renderers
+        original = renderers.compile_templates
+        renderers.compile_templates = compile_templates
+        try:
+            result = config.compile_templates()
+        finally:
+            renderers.compile_templates = original
+        self.assertEqual(result, [(path, None)])
+        self.assertEqual(registries, [config.registry])
+        self.assertEqual(len(config.introspector.get_category('templates')), 1)
+
+class TestLazyRendererFactory(unittest.TestCase):
+    def _makeOne(self, name):
+        from pyramid.config.rendering import LazyRendererFactory
+        return LazyRendererFactory(name)
+
+    def test_call_resolves_once(self):
+        import os
+        inst = self._makeOne('os.path.basename')
+        self.assertEqual(inst.factory, None)
+        self.assertEqual(inst('a/b'), 'b')
+        self.assertTrue(inst.factory is os.path.basename)
+        inst.name = 'nonexistent.module'
+        self.assertEqual(inst('a/c'), 'c')
+
+    def test_repr(self):
+        inst = self._makeOne('a.b')
+        self.assertEqual(repr(inst), '<LazyRendererFactory a.b>')
+
+    def test_template_engines_not_imported(self):
+        import os
+        import subprocess
+        import sys
+        code = ('import sys; import pyramid.config; '
+                'print(sorted(set(name.split(".")[0] for name in sys.modules '
+                'if name.startswith(("chameleon", "mako")))))')
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        proc = subprocess.Popen([sys.executable, '-c', code],
+                                stdout=subprocess.PIPE, env=env)
+        out = proc.communicate()[0]
+        self.assertEqual(out.strip(), b'[]')
@@ -242,6 +242,70 @@ class TestSettings(unittest.TestCase):
         self.assertEqual(result['pyramid.reload_assets'], True)
         self.assertEqual(result['pyramid.reload_resources'], True)
 
+    def test_reload_assets_interval(self):
+        result = self._makeOne({})
+        self.assertEqual(result['reload_assets_interval'], 0)
+        self.assertEqual(result['pyramid.reload_assets_interval'], 0)
+        result = self._makeOne({'reload_assets_interval':'2.5'})
+        self.assertEqual(result['reload_assets_interval'], 2.5)
+        self.assertEqual(result['pyramid.reload_assets_interval'], 2.5)
+        result = self._makeOne({'reload_assets_interval':'2',
+                                'pyramid.reload_assets_interval':'3'})
+        self.assertEqual(result['reload_assets_interval'], 3)
+        self.assertEqual(result['pyramid.reload_assets_interval'], 3)
+        result = self._makeOne({'pyramid.reload_assets_interval':'3'},
+                               {'PYRAMID_RELOAD_ASSETS_INTERVAL':'4'})
+        self.assertEqual(result['reload_assets_interval'], 4)
+        self.assertEqual(result['pyramid.reload_assets_interval'], 4)
+
+    def test_template_cache_directory(self):
+        result = self._makeOne({})
+        self.assertEqual(result['template_cache_directory'], None)
+        self.assertEqual(result['pyramid.template_cache_directory'], None)
+        result = self._makeOne({'template_cache_directory':'/a'})
+        self.assertEqual(result['template_cache_directory'], '/a')
+        self.assertEqual(result['pyramid.template_cache_directory'], '/a')
+        result = self._makeOne({'template_cache_directory':'/a',
+                                'pyramid.template_cache_directory':'/b'})
+        self.assertEqual(result['template_cache_directory'], '/b')
+        self.assertEqual(result['pyramid.template_cache_directory'], '/b')
+        result = self._makeOne({'pyramid.template_cache_directory':'/b'},
+                               {'PYRAMID_TEMPLATE_CACHE_DIRECTORY':'/c'})
+        self.assertEqual(result['template_cache_directory'], '/c')
+        self.assertEqual(result['pyramid.template_cache_directory'], '/c')
+
+    def test_capture_action_info(self):
+        result = self._makeOne({})
+        self.assertEqual(result['capture_action_info'], True)
+        self.assertEqual(result['pyramid.capture_action_info'], True)
+        result = self._makeOne({'capture_action_info':'false'})
+        self.assertEqual(result['capture_action_info'], False)
+        self.assertEqual(result['pyramid.capture_action_info'], False)
+        result = self._makeOne({'capture_action_info':'false',
+                                'pyramid.capture_action_info':'true'})
+        self.assertEqual(result['capture_action_info'], True)
+        self.assertEqual(result['pyramid.capture_action_info'], True)
+        result = self._makeOne({'pyramid.capture_action_info':'true'},
+                               {'PYRAMID_CAPTURE_ACTION_INFO':'0'})
+        self.assertEqual(result['capture_action_info'], False)
+        self.assertEqual(result['pyramid.capture_action_info'], False)
+
+    def test_introspection(self):
+        result = self._makeOne({})
+        self.assertEqual(result['introspection'], True)
+        self.assertEqual(result['pyramid.introspection'], True)
+        result = self._makeOne({'introspection':'false'})
+        self.assertEqual(result['introspection'], False)
+        self.assertEqual(result['pyramid.introspection'], False)
+        result = self._makeOne({'introspection':'false',
+                                'pyramid.introspection':'true'})
+        self.assertEqual(result['introspection'], True)
+        self.assertEqual(result['pyramid.introspection'], True)
+        result = self._makeOne({'pyramid.introspection':'true'},
+                               {'PYRAMID_INTROSPECTION':'0'})
+        self.assertEqual(result['introspection'], False)
+        self.assertEqual(result['pyramid.introspection'], False)
+
     def test_reload_all(self):
         result = self._makeOne({})
         self.assertEqual(result['reload_templates'], False)
@@ -170,6 +170,27 @@ class TestTweens(unittest.TestCase):
         from pyramid.config.tweens import Tweens
         return Tweens()
 
+    def test___copy__(self):
+        import copy
+        tweens = self._makeOne()
+        tweens.add_explicit('name', 'factory')
+        tweens.add_implicit('name2', 'factory2', over='name3')
+        result = copy.copy(tweens)
+        result.add_explicit('name4', 'factory4')
+        result.add_implicit('name5', 'factory5', under='name2')
+        self.assertEqual(tweens.explicit, [('name', 'factory')])
+        self.assertEqual(tweens.names, ['name2'])
+        self.assertEqual(tweens.factories, {'name2':'factory2'})
+        self.assertEqual(tweens.order, [('name2', 'name3')])
+        self.assertEqual(tweens.req_over, set(['name2']))
+        self.assertEqual(tweens.req_under, set())
+        self.assertEqual(result.explicit, [('name', 'factory'),
+                                           ('name4', 'factory4')])
+        self.assertEqual(result.names, ['name2', 'name5'])
+        self.assertEqual(result.order, [('name2', 'name3'),
+                                        ('name2', 'name5')])
+        self.assertEqual(result.req_under, set(['name5']))
+
     def test_add_explicit(self):
         tweens = self._makeOne()
         tweens.add_explicit('name', 'factory')
@@ -368,6 +368,322 @@ class TestActionInfo(unittest.TestCase):
         self.assertEqual(str(inst),
                          "Line 0 of file filename:\n       linerepr  ")
 
+    def test_src_read_lazily(self):
+        import sys
+        f = sys._getframe()
+        inst = self._getTargetClass()(__file__, f.f_lineno, 'function')
+        self.assertEqual(inst.src,
+                         "inst = self._getTargetClass()(__file__, "
+                         "f.f_lineno, 'function')")
+
+    def test_src_no_file(self):
+        inst = self._getTargetClass()(None, 0, '')
+        self.assertEqual(inst.src, '')
+        self.assertEqual(str(inst), 'Line 0 of file None:\n    ')
+
+class Test_call_site_info(unittest.TestCase):
+    def _callFUT(self, registry, backframes=2):
+        from pyramid.config.util import call_site_info
+        return call_site_info(registry, backframes)
+
+    def _directive(self, registry):
+        from pyramid.config.util import call_site_info
+        return call_site_info(registry)
+
+    def test_caller_of_caller(self):
+        info = self._directive(None) # call site
+        self.assertEqual(info.function, 'test_caller_of_caller')
+        self.assertEqual(info.file.rstrip('co'), __file__.rstrip('co'))
+        self.assertEqual(info.src, 'info = self._directive(None) # call site')
+
+    def test_backframes(self):
+        info = self._callFUT(None, 1)
+        self.assertEqual(info.function, '_callFUT')
+
+    def test_capture_enabled(self):
+        registry = Dummy()
+        registry.settings = {'pyramid.capture_action_info':True}
+        info = self._directive(registry)
+        self.assertEqual(info.function, 'test_capture_enabled')
+
+    def test_capture_disabled(self):
+        registry = Dummy()
+        registry.settings = {'pyramid.capture_action_info':False}
+        info = self._directive(registry)
+        self.assertEqual(info.file, None)
+        self.assertEqual(info.line, 0)
+        self.assertEqual(info.src, '')
+
+class TestScanRecorder(unittest.TestCase):
+    def _makeOne(self, config, records):
+        from pyramid.config.util import ScanRecorder
+        return ScanRecorder(config, records)
+
+    def test_method_call_recorded(self):
+        config = DummyScanConfig()
+        records = []
+        inst = self._makeOne(config, records)
+        result = inst.add_thing(1, a=2, _info=('f', 1, 'fn', 'src'))
+        self.assertEqual(result, 'added')
+        self.assertEqual(config.calls, [(None, (1,), {
+            'a':2, '_info':('f', 1, 'fn', 'src')})])
+        self.assertEqual(records, [(None, 'add_thing', (1,),
+                                    {'a':2, '_info':('f', 1, 'fn', 'src')})])
+
+    def test_method_call_info_is_caller(self):
+        records = []
+        inst = self._makeOne(DummyScanConfig(), records)
+        inst.add_thing() # line of this call
+        info = records[0][3]['_info']
+        self.assertEqual(info[2], 'test_method_call_info_is_caller')
+        from pyramid.config.util import ActionInfo
+        self.assertEqual(ActionInfo(*info).src,
+                         'inst.add_thing() # line of this call')
+
+    def test_with_package(self):
+        import pyramid.tests
+        config = DummyScanConfig()
+        records = []
+        inst = self._makeOne(config, records)
+        inst.with_package(pyramid.tests).add_thing(_info=None)
+        self.assertEqual(config.calls, [(pyramid.tests, (), {'_info':None})])
+        self.assertEqual(records,
+                         [('pyramid.tests', 'add_thing', (), {'_info':None})])
+
+    def test_other_attribute_access(self):
+        config = DummyScanConfig()
+        records = []
+        inst = self._makeOne(config, records)
+        self.assertEqual(inst.registry, config.registry)
+        self.assertEqual(records, [None])
+
+class Test_replay_scan(unittest.TestCase):
+    def _callFUT(self, config, records):
+        from pyramid.config.util import replay_scan
+        return replay_scan(config, records)
+
+    def test_it(self):
+        config = DummyScanConfig()
+        self._callFUT(config, [(None, 'add_thing', (1,), {}),
+                               ('pyramid.tests', 'add_thing', (), {'a':1})])
+        self.assertEqual(config.calls, [(None, (1,), {}),
+                                        ('pyramid.tests', (), {'a':1})])
+
+class Test_scan_snapshot_key(unittest.TestCase):
+    def setUp(self):
+        import os
+        import tempfile
+        import types
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'mod.py')
+        with open(self.filename, 'w') as f:
+            f.write('')
+        self.module = types.ModuleType('mod')
+        self.module.__file__ = self.filename + 'c'
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.directory)
+
+    def _callFUT(self, package, categories=None, ignore=None, settings=None):
+        from pyramid.config.util import scan_snapshot_key
+        return scan_snapshot_key(package, categories, ignore, settings)
+
+    def test_stable(self):
+        self.assertEqual(self._callFUT(self.module), self._callFUT(self.module))
+
+    def test_module_changed(self):
+        key = self._callFUT(self.module)
+        with open(self.filename, 'w') as f:
+            f.write('changed = True')
+        self.assertNotEqual(self._callFUT(self.module), key)
+
+    def test_arguments_and_settings(self):
+        key = self._callFUT(self.module)
+        self.assertNotEqual(self._callFUT(self.module, categories=['a']), key)
+        self.assertNotEqual(self._callFUT(self.module, ignore='a'), key)
+        self.assertNotEqual(self._callFUT(self.module, settings={'a':'1'}),
+                            key)
+
+    def test_package(self):
+        import os
+        import pyramid.tests.test_config.pkgs.scannable as package
+        key = self._callFUT(package)
+        here = os.path.dirname(package.__file__)
+        filename = os.path.join(here, 'subpackage', '__init__.py')
+        mtime = os.path.getmtime(filename)
+        os.utime(filename, (mtime, mtime + 1))
+        try:
+            self.assertNotEqual(self._callFUT(package), key)
+        finally:
+            os.utime(filename, (mtime, mtime))
+        self.assertEqual(self._callFUT(package), key)
+
+    def test_callable_ignore(self):
+        self.assertEqual(self._callFUT(self.module, ignore=[len]), None)
+
+class Test_scan_snapshots(unittest.TestCase):
+    def setUp(self):
+        import os
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'snapshot')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.directory)
+
+    def _write(self, key, records):
+        from pyramid.config.util import write_scan_snapshot
+        return write_scan_snapshot(self.filename, key, records)
+
+    def _read(self, key):
+        from pyramid.config.util import read_scan_snapshot
+        return read_scan_snapshot(self.filename, key)
+
+    def test_roundtrip(self):
+        from pyramid.renderers import null_renderer
+        records = [('pkg', 'add_view', (Dummy,),
+                    {'renderer':null_renderer, 'name':text_('n'),
+                     '_info':('f', 1, 'fn', 'src')})]
+        self.assertTrue(self._write('key', records))
+        result = self._read('key')
+        self.assertEqual(result, records)
+        self.assertTrue(result[0][3]['renderer'] is null_renderer)
+        self.assertTrue(result[0][2][0] is Dummy)
+
+    def test_wrong_key(self):
+        self._write('key', [])
+        self.assertEqual(self._read('other'), None)
+
+    def test_missing(self):
+        self.assertEqual(self._read('key'), None)
+
+    def test_damaged(self):
+        with open(self.filename, 'wb') as f:
+            f.write(b'garbage')
+        self.assertEqual(self._read('key'), None)
+
+    def test_not_replayable(self):
+        import os
+        self.assertFalse(self._write('key', [None]))
+        self.assertFalse(os.path.exists(self.filename))
+
+    def test_unrecordable_object(self):
+        import os
+        self.assertFalse(self._write('key', [(None, 'a', (Dummy(),), {})]))
+        self.assertEqual(os.listdir(self.directory), [])
+
+class Test_scan_index(unittest.TestCase):
+    def setUp(self):
+        import os
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'index')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.directory)
+
+    def _write(self, key, names):
+        from pyramid.config.util import write_scan_index
+        return write_scan_index(self.filename, key, names)
+
+    def _read(self, key):
+        from pyramid.config.util import read_scan_index
+        return read_scan_index(self.filename, key)
+
+    def test_roundtrip(self):
+        self._write('key', ['a', 'a.b'])
+        self.assertEqual(self._read('key'), ['a', 'a.b'])
+
+    def test_empty(self):
+        self._write('key', [])
+        self.assertEqual(self._read('key'), [])
+
+    def test_wrong_key(self):
+        self._write('key', ['a'])
+        self.assertEqual(self._read('other'), None)
+
+    def test_missing(self):
+        self.assertEqual(self._read('key'), None)
+
+class Test_scan_modules(unittest.TestCase):
+    def _callFUT(self, scanner, package, **kw):
+        from pyramid.config.util import scan_modules
+        return scan_modules(scanner, package, **kw)
+
+    def test_package(self):
+        import pyramid.tests.test_config.pkgs.scannable as package
+        records = []
+        scanner = DummyScanner(records)
+        stats = self._callFUT(scanner, package, records=records)
+        name = package.__name__
+        self.assertEqual([s[0] for s in stats], [
+            name,
+            name + '.another',
+            name + '.subpackage',
+            name + '.subpackage.notinit',
+            name + '.subpackage.subsubpackage',
+            ])
+        self.assertEqual([s[3] for s in stats], [1] * 5)
+        self.assertEqual([m.__name__ for m, kw in scanner.scanned],
+                         [s[0] for s in stats])
+        # submodules of a package aren't scanned with it
+        ignore = scanner.scanned[0][1]['ignore']
+        self.assertTrue(ignore[1](name + '.another'))
+        self.assertFalse(ignore[1](name + '.grokked'))
+
+    def test_modules(self):
+        import pyramid.tests.test_config.pkgs.scannable as package
+        scanner = DummyScanner()
+        name = package.__name__ + '.subpackage.notinit'
+        stats = self._callFUT(scanner, package, modules=[name])
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0][0], name)
+        self.assertEqual(stats[0][3], None)
+
+    def test_ignore(self):
+        import pyramid.tests.test_config.pkgs.scannable as package
+        name = package.__name__
+        stats = self._callFUT(DummyScanner(), package,
+                              ignore=['.subpackage', name + '.another'])
+        self.assertEqual([s[0] for s in stats], [name])
+
+    def test_import_error(self):
+        import pyramid.tests.test_config.pkgs.scannable as package
+        self.assertRaises(ImportError, self._callFUT, DummyScanner(),
+                          package, modules=['nonexistent.module'])
+
+    def test_import_error_onerror(self):
+        import pyramid.tests.test_config.pkgs.scannable as package
+        errors = []
+        stats = self._callFUT(DummyScanner(), package,
+                              modules=['nonexistent.module'],
+                              onerror=errors.append)
+        self.assertEqual(stats, [])
+        self.assertEqual(errors, ['nonexistent.module'])
+
+class Test_write_scan_profile(unittest.TestCase):
+    def _callFUT(self, out, stats):
+        from pyramid.config.util import write_scan_profile
+        return write_scan_profile(out, stats)
+
+    def test_it(self):
+        from pyramid.compat import NativeIO
+        out = NativeIO()
+        self._callFUT(out, [('fast', 0.001, 0.001, 0),
+                            ('slow.module', 0.5, 0.25, 2)])
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines, [
+            'Module          Import       Scan      Total',
+            '-----------  ---------  ---------  ---------',
+            'slow.module    0.5000s    0.2500s    0.7500s',
+            'fast           0.0010s    0.0010s    0.0020s',
+            '-----------  ---------  ---------  ---------',
+            '2 modules      0.5010s    0.2510s    0.7520s',
+            ])
+
 class DummyCustomPredicate(object):
     def __init__(self):
         self.__text__ = 'custom predicate'
@@ -382,6 +698,31 @@ class DummyCustomPredicate(object):
 class Dummy:
     pass
 
+class DummyScanConfig(object):
+    registry = object()
+    def __init__(self, package=None, calls=None):
+        self.package = package
+        if calls is None:
+            calls = []
+        self.calls = calls
+
+    def with_package(self, package):
+        return self.__class__(package, self.calls)
+
+    def add_thing(self, *arg, **kw):
+        self.calls.append((self.package, arg, kw))
+        return 'added'
+
+class DummyScanner(object):
+    def __init__(self, records=None):
+        self.scanned = []
+        self.records = records
+
+    def scan(self, module, **kw):
+        self.scanned.append((module, kw))
+        if self.records is not None:
+            self.records.append(module.__name__)
+
 class DummyRequest:
     subpath = ()
     matchdict = None
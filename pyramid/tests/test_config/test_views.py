@@ -540,6 +540,46 @@ class TestViewsConfigurationMixin(unittest.TestCase):
         self.assertTrue(IMultiView.providedBy(wrapper))
         self.assertEqual(wrapper(None, None), 'OK')
 
+    def test_add_view_overlay_merges_view_from_base(self):
+        from pyramid.renderers import null_renderer
+        from pyramid.interfaces import IMultiView
+        base = self._makeOne(autocommit=True)
+        base.add_view(view=lambda *arg: 'GET', renderer=null_renderer,
+                      request_method='GET')
+        config = base.overlay('tenant')
+        config.add_view(view=lambda *arg: 'POST', renderer=null_renderer,
+                        request_method='POST')
+        wrapper = self._getViewCallable(config)
+        self.assertTrue(IMultiView.providedBy(wrapper))
+        request = DummyRequest()
+        request.method = 'GET'
+        self.assertEqual(wrapper(None, request), 'GET')
+        request.method = 'POST'
+        self.assertEqual(wrapper(None, request), 'POST')
+        base_view = self._getViewCallable(base)
+        self.assertFalse(IMultiView.providedBy(base_view))
+
+    def test_add_view_overlay_copies_multiview_from_base(self):
+        from pyramid.renderers import null_renderer
+        from pyramid.interfaces import IMultiView
+        base = self._makeOne(autocommit=True)
+        base.add_view(view=lambda *arg: 'GET', renderer=null_renderer,
+                      request_method='GET')
+        base.add_view(view=lambda *arg: 'PUT', renderer=null_renderer,
+                      request_method='PUT')
+        config = base.overlay('tenant')
+        config.add_view(view=lambda *arg: 'POST', renderer=null_renderer,
+                        request_method='POST')
+        wrapper = self._getViewCallable(config)
+        base_wrapper = self._getViewCallable(base)
+        self.assertTrue(IMultiView.providedBy(wrapper))
+        self.assertFalse(wrapper is base_wrapper)
+        self.assertEqual(len(wrapper.views), 3)
+        self.assertEqual(len(base_wrapper.views), 2)
+        request = DummyRequest()
+        request.method = 'GET'
+        self.assertEqual(wrapper(None, request), 'GET')
+
     def test_add_view_exc_multiview_replaces_existing_view(self):
         from pyramid.renderers import null_renderer
         from zope.interface import implementedBy
@@ -2018,6 +2058,25 @@ class TestMultiView(unittest.TestCase):
                                     (99, 'view2', None),
                                     (100, 'view', None)])
 
+    def test___copy__(self):
+        import copy
+        mv = self._makeOne()
+        mv.add('view', 100)
+        mv.add('view2', 100, 'text/html', 'a')
+        result = copy.copy(mv)
+        result.add('view3', 99)
+        result.add('view4', 99, 'text/html', 'b')
+        result.add('view5', 99, 'text/xml')
+        self.assertEqual(result.name, 'name')
+        self.assertEqual(mv.views, [(100, 'view', None)])
+        self.assertEqual(mv.media_views, {'text/html':[(100, 'view2', 'a')]})
+        self.assertEqual(mv.accepts, ['text/html'])
+        self.assertEqual(result.views,
+                         [(99, 'view3', None), (100, 'view', None)])
+        self.assertEqual(result.media_views['text/html'],
+                         [(99, 'view4', 'b'), (100, 'view2', 'a')])
+        self.assertEqual(set(result.accepts), set(['text/html', 'text/xml']))
+
     def test_add_with_phash(self):
         mv = self._makeOne()
         mv.add('view', 100, phash='abc')
@@ -3311,6 +3370,70 @@ class TestViewDeriver(unittest.TestCase):
         def view(request): pass
         self.assertRaises(ConfigurationError, deriver, view)
 
+    def test_flattened_all_options(self):
+        from pyramid.response import Response
+        response = Response('OK')
+        def view(context, request):
+            return response
+        self._registerSecurityPolicy(True)
+        predicate = lambda *arg: True
+        deriver = self._makeOne(permission='view', predicates=[predicate],
+                                http_cache=3600, accept='text/html',
+                                phash='abc')
+        result = deriver(view)
+        # one guard wrapper, one response wrapper, then the view itself
+        self.assertTrue(result.__wraps__.__wraps__ is view)
+        self.assertTrue(result.__call_permissive__ is result.__wraps__)
+        self.assertEqual(result.__predicates__, [predicate])
+        self.assertEqual(result.__accept__, 'text/html')
+        self.assertEqual(result.__phash__, 'abc')
+        self.assertEqual(result.__permission__, 'view')
+        request = self._makeRequest()
+        self.assertEqual(result(None, request), response)
+        self.assertTrue('Cache-Control' in dict(response.headerlist))
+
+    def test_flattened_attrs_on_response_wrapper(self):
+        response = DummyResponse()
+        def view(context, request):
+            return response
+        deriver = self._makeOne(phash='abc')
+        result = deriver(view)
+        self.assertTrue(result.__wraps__ is view)
+        self.assertEqual(result.__phash__, 'abc')
+        self.assertFalse(hasattr(view, '__phash__'))
+        self.assertEqual(result(None, None), response)
+
+    def test_flattened_null_renderer_attrs_dont_decorate_view(self):
+        from pyramid.renderers import null_renderer
+        def view(context, request): pass
+        deriver = self._makeOne(phash='abc', renderer=null_renderer)
+        result = deriver(view)
+        self.assertTrue(result.__wraps__ is view)
+        self.assertEqual(result.__phash__, 'abc')
+        self.assertFalse(hasattr(view, '__phash__'))
+
+    def test_flattened_decorator_result_is_http_cached(self):
+        import datetime
+        from pyramid.response import Response
+        response = Response('OK')
+        def view(request):
+            return response
+        decorated = []
+        def decorator(wrapped):
+            def inner(context, request):
+                decorated.append(True)
+                return wrapped(context, request)
+            return inner
+        deriver = self._makeOne(decorator=decorator, http_cache=3600)
+        result = deriver(view)
+        when = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        request = self._makeRequest()
+        result = result(None, request)
+        self.assertEqual(decorated, [True])
+        headers = dict(result.headerlist)
+        expires = parse_httpdate(headers['Expires'])
+        assert_similar_datetime(expires, when)
+
 class TestDefaultViewMapper(unittest.TestCase):
     def setUp(self):
         self.config = testing.setUp()
@@ -3593,6 +3716,22 @@ class TestStaticURLInfo(unittest.TestCase):
         request.registry = DummyRegistry()
         return request
 
+    def test_registrations_from_base_registry(self):
+        inst = self._makeOne()
+        base = DummyRegistry()
+        base._static_url_registrations = [
+            ('http://example.com/', 'package:path/', None, None)]
+        registry = DummyRegistry()
+        registry.__bases__ = (base,)
+        request = self._makeRequest()
+        request.registry = registry
+        result = inst.generate('package:path/abc', request)
+        self.assertEqual(result, 'http://example.com/abc')
+        # registrations added to the overlay don't affect the base
+        inst._get_registrations(registry).append(
+            ('http://example.com/2/', 'package:path2/', None, None))
+        self.assertEqual(len(base._static_url_registrations), 1)
+
     def _assertRegistrations(self, config, expected):
         self.assertEqual(config.registry._static_url_registrations, expected)
 
@@ -3613,8 +3752,9 @@ class TestStaticURLInfo(unittest.TestCase):
 
     def test_generate_registration_miss(self):
         inst = self._makeOne()
-        registrations = [(None, 'spec', 'route_name'),
-                         ('http://example.com/foo/', 'package:path/', None)]
+        registrations = [(None, 'spec', 'route_name', None),
+                         ('http://example.com/foo/', 'package:path/', None,
+                          None)]
         inst._get_registrations = lambda *x: registrations
         request = self._makeRequest()
         result = inst.generate('package:path/abc', request)
@@ -3622,7 +3762,8 @@ class TestStaticURLInfo(unittest.TestCase):
 
     def test_generate_registration_no_registry_on_request(self):
         inst = self._makeOne()
-        registrations = [('http://example.com/foo/', 'package:path/', None)]
+        registrations = [
+            ('http://example.com/foo/', 'package:path/', None, None)]
         inst._get_registrations = lambda *x: registrations
         request = self._makeRequest()
         del request.registry
@@ -3631,7 +3772,8 @@ class TestStaticURLInfo(unittest.TestCase):
 
     def test_generate_slash_in_name1(self):
         inst = self._makeOne()
-        registrations = [('http://example.com/foo/', 'package:path/', None)]
+        registrations = [
+            ('http://example.com/foo/', 'package:path/', None, None)]
         inst._get_registrations = lambda *x: registrations
         request = self._makeRequest()
         result = inst.generate('package:path/abc', request)
@@ -3639,7 +3781,8 @@ class TestStaticURLInfo(unittest.TestCase):
 
     def test_generate_slash_in_name2(self):
         inst = self._makeOne()
-        registrations = [('http://example.com/foo/', 'package:path/', None)]
+        registrations = [
+            ('http://example.com/foo/', 'package:path/', None, None)]
         inst._get_registrations = lambda *x: registrations
         request = self._makeRequest()
         result = inst.generate('package:path/', request)
@@ -3659,7 +3802,7 @@ class TestStaticURLInfo(unittest.TestCase):
 
     def test_generate_route_url(self):
         inst = self._makeOne()
-        registrations = [(None, 'package:path/', '__viewname/')]
+        registrations = [(None, 'package:path/', '__viewname/', None)]
         inst._get_registrations = lambda *x: registrations
         def route_url(n, **kw):
             self.assertEqual(n, '__viewname/')
@@ -3672,7 +3815,7 @@ class TestStaticURLInfo(unittest.TestCase):
 
     def test_generate_url_unquoted_local(self):
         inst = self._makeOne()
-        registrations = [(None, 'package:path/', '__viewname/')]
+        registrations = [(None, 'package:path/', '__viewname/', None)]
         inst._get_registrations = lambda *x: registrations
         def route_url(n, **kw):
             self.assertEqual(n, '__viewname/')
@@ -3685,32 +3828,152 @@ class TestStaticURLInfo(unittest.TestCase):
 
     def test_generate_url_quoted_remote(self):
         inst = self._makeOne()
-        registrations = [('http://example.com/', 'package:path/', None)]
+        registrations = [('http://example.com/', 'package:path/', None, None)]
         inst._get_registrations = lambda *x: registrations
         request = self._makeRequest()
         result = inst.generate('package:path/abc def', request, a=1)
         self.assertEqual(result, 'http://example.com/abc%20def')
 
+    def test_generate_longest_prefix(self):
+        inst = self._makeOne()
+        registrations = [
+            ('http://example.com/foo/', 'package:path/', None, None),
+            ('http://example.com/bar/', 'package:path/sub/', None, None),
+            ('http://example.com/baz/', 'package:path/', None, None),
+            ]
+        inst._get_registrations = lambda *x: registrations
+        request = self._makeRequest()
+        self.assertEqual(inst.generate('package:path/sub/abc', request),
+                         'http://example.com/bar/abc')
+        self.assertEqual(inst.generate('package:path/abc', request),
+                         'http://example.com/foo/abc')
+        self.assertEqual(inst.generate('package:path/x/sub/abc', request),
+                         'http://example.com/foo/x/sub/abc')
+
+    def test_generate_remote_dot_segments(self):
+        inst = self._makeOne()
+        registrations = [
+            ('http://example.com/foo/', 'package:path/', None, None)]
+        inst._get_registrations = lambda *x: registrations
+        request = self._makeRequest()
+        result = inst.generate('package:path/a/../b', request)
+        self.assertEqual(result, 'http://example.com/foo/b')
+
+    def test_generate_index_invalidated_by_add(self):
+        config = testing.setUp(autocommit=True)
+        try:
+            config.add_static_view('http://example.com/foo',
+                                   path='mypkg:templates')
+            request = testing.DummyRequest()
+            request.registry = config.registry
+            inst = self._makeOne()
+            self.assertEqual(inst.generate('mypkg:templates/sub/a', request),
+                             'http://example.com/foo/sub/a')
+            config.add_static_view('http://example.com/bar',
+                                   path='mypkg:templates/sub')
+            self.assertEqual(inst.generate('mypkg:templates/sub/a', request),
+                             'http://example.com/bar/a')
+        finally:
+            testing.tearDown()
+
+    def test_generate_route_fast_path_same_as_route_url(self):
+        from pyramid.request import Request
+        config = testing.setUp(autocommit=True)
+        try:
+            config.route_prefix = 'pre'
+            config.add_static_view('images', path='mypkg:templates')
+            inst = self._makeOne()
+            request = Request.blank('/', base_url='http://example.com/app')
+            request.registry = config.registry
+            route_name = '__pre/images/'
+            for subpath in ('a b/c.png', text_(b'La Pe\xc3\xb1a', 'utf-8')):
+                path = 'mypkg:templates/' + subpath
+                expected = request.route_url(route_name, subpath=subpath)
+                self.assertEqual(inst.generate(path, request), expected)
+                self.assertEqual(inst.generate(path, request), expected)
+                expected = request.route_url(route_name, subpath=subpath,
+                                             _app_url='/app')
+                self.assertEqual(
+                    inst.generate(path, request, _app_url='/app'), expected)
+            self.assertEqual(
+                inst.generate('mypkg:templates/a', request, _query={'x':1}),
+                'http://example.com/app/pre/images/a?x=1')
+        finally:
+            testing.tearDown()
+
+    def test_generate_route_with_pregenerator(self):
+        config = testing.setUp(autocommit=True)
+        try:
+            def pregenerator(request, elements, kw):
+                kw['subpath'] = 'other/' + kw['subpath']
+                return elements, kw
+            config.add_static_view('images', path='mypkg:templates',
+                                   pregenerator=pregenerator)
+            inst = self._makeOne()
+            request = testing.DummyRequest()
+            request.registry = config.registry
+            result = inst.generate('mypkg:templates/a', request)
+            self.assertEqual(result, 'http://example.com/images/other/a')
+        finally:
+            testing.tearDown()
+
+    def test_generate_route_not_registered(self):
+        inst = self._makeOne()
+        registrations = [(None, 'package:path/', '__viewname/', None)]
+        inst._get_registrations = lambda *x: registrations
+        request = testing.DummyRequest()
+        request.registry = self._makeConfig().registry
+        request.registry.queryUtility = lambda *arg: None
+        request.route_url = lambda n, **kw: 'url'
+        self.assertEqual(inst.generate('package:path/abc', request), 'url')
+
+    def test_generate_cachebust(self):
+        inst = self._makeOne()
+        cachebust = DummyCacheBuster('abc')
+        registrations = [(None, 'package:path/', '__viewname/', cachebust)]
+        inst._get_registrations = lambda *x: registrations
+        def route_url(n, **kw):
+            self.assertEqual(n, '__viewname/')
+            self.assertEqual(kw, {'subpath':'abc/foo', 'a':1, 'x':'foo'})
+            return 'url'
+        request = self._makeRequest()
+        request.route_url = route_url
+        result = inst.generate('package:path/foo', request, a=1)
+        self.assertEqual(result, 'url')
+        self.assertEqual(cachebust.pathspec, 'package:path/foo')
+
+    def test_generate_cachebust_remote(self):
+        inst = self._makeOne()
+        registrations = [('http://example.com/', 'package:path/', None,
+                          DummyCacheBuster('abc'))]
+        inst._get_registrations = lambda *x: registrations
+        request = self._makeRequest()
+        result = inst.generate('package:path/foo', request)
+        self.assertEqual(result, 'http://example.com/abc/foo')
+
     def test_add_already_exists(self):
         inst = self._makeOne()
         config = self._makeConfig(
-            [('http://example.com/', 'package:path/', None)])
+            [('http://example.com/', 'package:path/', None, None)])
         inst.add(config, 'http://example.com', 'anotherpackage:path')
-        expected = [('http://example.com/',  'anotherpackage:path/', None)]
+        expected = [
+            ('http://example.com/', 'anotherpackage:path/', None, None)]
         self._assertRegistrations(config, expected)
 
     def test_add_url_withendslash(self):
         inst = self._makeOne()
         config = self._makeConfig()
         inst.add(config, 'http://example.com/', 'anotherpackage:path')
-        expected = [('http://example.com/', 'anotherpackage:path/', None)]
+        expected = [
+            ('http://example.com/', 'anotherpackage:path/', None, None)]
         self._assertRegistrations(config, expected)
 
     def test_add_url_noendslash(self):
         inst = self._makeOne()
         config = self._makeConfig()
         inst.add(config, 'http://example.com', 'anotherpackage:path')
-        expected = [('http://example.com/', 'anotherpackage:path/', None)]
+        expected = [
+            ('http://example.com/', 'anotherpackage:path/', None, None)]
         self._assertRegistrations(config, expected)
 
     def test_add_viewname(self):
@@ -3719,18 +3982,69 @@ class TestStaticURLInfo(unittest.TestCase):
         config = self._makeConfig()
         inst = self._makeOne()
         inst.add(config, 'view', 'anotherpackage:path', cache_max_age=1)
-        expected = [(None, 'anotherpackage:path/', '__view/')]
+        expected = [(None, 'anotherpackage:path/', '__view/', None)]
         self._assertRegistrations(config, expected)
         self.assertEqual(config.route_args, ('__view/', 'view/*subpath'))
         self.assertEqual(config.view_kw['permission'], NO_PERMISSION_REQUIRED)
         self.assertEqual(config.view_kw['view'].__class__, static_view)
 
+    def test_add_viewname_with_file_cache(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', file_cache_size=10,
+                 file_cache_max_body=100, file_cache_interval=5)
+        view = config.view_kw['view']
+        self.assertEqual(view.file_cache.size, 10)
+        self.assertEqual(view.file_cache_max_body, 100)
+        self.assertEqual(view.file_cache_interval, 5)
+        self.assertFalse('file_cache_size' in config.route_kw)
+
+    def test_add_viewname_with_gzip(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', gzip=True)
+        view = config.view_kw['view']
+        self.assertNotEqual(view.gzip_cache, None)
+        self.assertFalse('gzip' in config.route_kw)
+
+    def test_add_viewname_with_sendfile(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', block_size=10,
+                 sendfile_header='X-Accel-Redirect',
+                 sendfile_prefix='/protected')
+        view = config.view_kw['view']
+        self.assertEqual(view.block_size, 10)
+        self.assertEqual(view.sendfile_header, 'X-Accel-Redirect')
+        self.assertEqual(view.sendfile_prefix, '/protected')
+        self.assertFalse('sendfile_header' in config.route_kw)
+
+    def test_add_viewname_with_cachebust_True(self):
+        from pyramid.static import PathSegmentMd5CacheBuster
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', cachebust=True)
+        cachebust = config.registry._static_url_registrations[0][3]
+        self.assertTrue(isinstance(cachebust, PathSegmentMd5CacheBuster))
+        self.assertTrue(config.view_kw['view'].cachebust is cachebust)
+        self.assertFalse('cachebust' in config.route_kw)
+
+    def test_add_url_with_cachebust(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        cachebust = DummyCacheBuster('abc')
+        inst.add(config, 'http://example.com/', 'anotherpackage:path',
+                 cachebust=cachebust)
+        expected = [
+            ('http://example.com/', 'anotherpackage:path/', None, cachebust)]
+        self._assertRegistrations(config, expected)
+
     def test_add_viewname_with_route_prefix(self):
         config = self._makeConfig()
         config.route_prefix = '/abc'
         inst = self._makeOne()
         inst.add(config, 'view', 'anotherpackage:path',)
-        expected = [(None, 'anotherpackage:path/', '__/abc/view/')]
+        expected = [(None, 'anotherpackage:path/', '__/abc/view/', None)]
         self._assertRegistrations(config, expected)
         self.assertEqual(config.route_args, ('__/abc/view/', 'view/*subpath'))
 
@@ -3921,3 +4235,12 @@ class DummyViewDefaultsClass(object):
         pass
     def __call__(self):
         return 'OK'
+
+class DummyCacheBuster(object):
+    def __init__(self, token):
+        self.token = token
+
+    def pregenerate(self, pathspec, subpath, kw):
+        self.pathspec = pathspec
+        kw['x'] = subpath
+        return '%s/%s' % (self.token, subpath), kw
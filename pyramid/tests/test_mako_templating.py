@@ -119,6 +119,37 @@ class Test_renderer_factory(Base, unittest.TestCase):
         lookup = self._getLookup()
         self.assertEqual(lookup.module_directory, fixtures)
 
+    def test_module_directory_defaults_to_template_cache_directory(self):
+        import os
+        settings = {'mako.directories':self.templates_dir,
+                    'pyramid.template_cache_directory':'/tmp/cache'}
+        info = DummyRendererInfo({
+            'name':'helloworld.mak',
+            'package':None,
+            'registry':self.config.registry,
+            'settings':settings,
+            })
+        self._callFUT(info)
+        lookup = self._getLookup()
+        self.assertEqual(lookup.module_directory,
+                         os.path.join(os.path.abspath('/tmp/cache'), 'mako'))
+
+    def test_module_directory_overrides_template_cache_directory(self):
+        import os
+        fixtures = os.path.join(os.path.dirname(__file__), 'fixtures')
+        settings = {'mako.directories':self.templates_dir,
+                    'mako.module_directory':fixtures,
+                    'template_cache_directory':'/tmp/cache'}
+        info = DummyRendererInfo({
+            'name':'helloworld.mak',
+            'package':None,
+            'registry':self.config.registry,
+            'settings':settings,
+            })
+        self._callFUT(info)
+        lookup = self._getLookup()
+        self.assertEqual(lookup.module_directory, fixtures)
+
     def test_with_input_encoding(self):
         settings = {'mako.directories':self.templates_dir,
                     'mako.input_encoding':'utf-16'}
@@ -473,6 +504,78 @@ class TestPkgResourceTemplateLookup(unittest.TestCase):
         self.assertRaises(TopLevelLookupException, inst.get_template,
                           'pyramid.tests:fixtures/notthere.mak')
 
+    def test_get_template_asset_spec_path_cached(self):
+        inst = self._makeOne(filesystem_checks=False)
+        uri = 'pyramid.tests:fixtures/helloworld.mak'
+        result = inst.get_template(uri)
+        self.assertEqual(inst._asset_paths[uri], result.filename)
+        del inst._collection[uri]
+        import pyramid.mako_templating as mako_templating
+        original = mako_templating.resolve_asset_spec
+        def resolve_asset_spec(*arg): # pragma: no cover
+            raise AssertionError('should not be called')
+        mako_templating.resolve_asset_spec = resolve_asset_spec
+        try:
+            result2 = inst.get_template(uri)
+        finally:
+            mako_templating.resolve_asset_spec = original
+        self.assertFalse(result2 is result)
+        self.assertEqual(result2.filename, result.filename)
+
+    def test_get_template_asset_spec_path_not_cached_with_fs_checks(self):
+        inst = self._makeOne(filesystem_checks=True)
+        inst.get_template('pyramid.tests:fixtures/helloworld.mak')
+        self.assertEqual(inst._asset_paths, {})
+
+    def test__load_uses_per_template_lock(self):
+        fixturedir = self.get_fixturedir()
+        inst = self._makeOne(directories=[fixturedir])
+        # the lookup-wide mutex is not needed to load a template
+        inst._mutex.acquire()
+        try:
+            result = inst.get_template('helloworld.mak')
+        finally:
+            inst._mutex.release()
+        self.assertTrue(inst._collection['helloworld.mak'] is result)
+        self.assertTrue('helloworld.mak' in inst._load_locks)
+
+    def test__load_already_loaded(self):
+        fixturedir = self.get_fixturedir()
+        inst = self._makeOne(directories=[fixturedir])
+        template = object()
+        inst._collection['helloworld.mak'] = template
+        result = inst._load('/wont/exist', 'helloworld.mak')
+        self.assertTrue(result is template)
+
+    def test__load_with_modulename_callable(self):
+        import os
+        fixturedir = self.get_fixturedir()
+        L = []
+        def modulename_callable(filename, uri):
+            L.append((filename, uri))
+            return None
+        inst = self._makeOne(directories=[fixturedir],
+                             modulename_callable=modulename_callable)
+        inst.get_template('helloworld.mak')
+        self.assertEqual(
+            L, [(os.path.join(fixturedir, 'helloworld.mak'),
+                 'helloworld.mak')])
+
+    def test__load_compile_failure_not_cached(self):
+        from mako.exceptions import SyntaxException
+        import os
+        import shutil
+        import tempfile
+        tmpdir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(tmpdir, 'bad.mak'), 'w') as f:
+                f.write('${')
+            inst = self._makeOne(directories=[tmpdir])
+            self.assertRaises(SyntaxException, inst.get_template, 'bad.mak')
+            self.assertFalse('bad.mak' in inst._collection)
+        finally:
+            shutil.rmtree(tmpdir)
+
 class TestMakoRenderingException(unittest.TestCase):
     def _makeOne(self, text):
         from pyramid.mako_templating import MakoRenderingException
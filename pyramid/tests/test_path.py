@@ -485,6 +485,70 @@ class TestDottedNameResolver(unittest.TestCase):
         self.assertRaises(ImportError, typ._pkg_resources_style,
                           ':notexisting', pyramid)
 
+    def test__pkg_resources_style_resolve_whitespace(self):
+        typ = self._makeOne()
+        result = typ._pkg_resources_style(
+            ' pyramid.tests.test_path : TestDottedNameResolver ', None)
+        self.assertEqual(result, self.__class__)
+
+    def test__pkg_resources_style_resolve_module(self):
+        import pyramid.tests.test_path
+        typ = self._makeOne()
+        result = typ._pkg_resources_style('pyramid.tests.test_path', None)
+        self.assertEqual(result, pyramid.tests.test_path)
+
+    def test__pkg_resources_style_resolve_dotted_attrs(self):
+        typ = self._makeOne()
+        result = typ._pkg_resources_style(
+            'pyramid.tests.test_path:TestDottedNameResolver._makeOne', None)
+        self.assertEqual(result, self.__class__._makeOne)
+
+    def test__pkg_resources_style_resolve_extras(self):
+        typ = self._makeOne()
+        result = typ._pkg_resources_style(
+            'pyramid.tests.test_path:TestDottedNameResolver [extra]', None)
+        self.assertEqual(result, self.__class__)
+
+    def test__pkg_resources_style_invalid(self):
+        typ = self._makeOne()
+        self.assertRaises(ValueError, typ._pkg_resources_style,
+                          'pyramid.tests.test_path:', None)
+
+    def test_resolve_cached(self):
+        typ = self._makeOne()
+        typ._cache['pyramid.tests.test_path.TestDottedNameResolver'] = 'abc'
+        self.assertEqual(
+            typ.resolve('pyramid.tests.test_path.TestDottedNameResolver'),
+            'abc')
+
+    def test_resolve_caches_result(self):
+        typ = self._makeOne()
+        typ.resolve('pyramid.tests.test_path:TestDottedNameResolver')
+        self.assertEqual(
+            typ._cache,
+            {'pyramid.tests.test_path:TestDottedNameResolver':self.__class__})
+
+    def test_resolve_relative_cached_per_package(self):
+        import pyramid
+        import pyramid.tests
+        typ = self._makeOne()
+        self.assertEqual(typ._resolve('.tests', pyramid), pyramid.tests)
+        self.assertRaises(ImportError, typ._resolve, '.tests', pyramid.tests)
+        self.assertEqual(typ._cache, {('.tests', pyramid):pyramid.tests})
+
+    def test_resolve_missing_not_cached(self):
+        typ = self._makeOne()
+        self.assertRaises(ImportError, typ.resolve, 'cant.be.found')
+        self.assertEqual(typ._cache, {})
+
+    def test_clear_cache(self):
+        typ = self._makeOne()
+        typ._cache['pyramid.tests.test_path.TestDottedNameResolver'] = 'abc'
+        typ.clear_cache()
+        self.assertEqual(
+            typ.resolve('pyramid.tests.test_path.TestDottedNameResolver'),
+            self.__class__)
+
     def test_resolve_not_a_string(self):
         typ = self._makeOne()
         e = self.config_exc(typ.resolve, None)
@@ -518,6 +582,13 @@ class TestDottedNameResolver(unittest.TestCase):
         self.assertEqual(typ.maybe_resolve('.test_path.TestDottedNameResolver'),
                          self.__class__)
 
+    def test_maybe_resolve_caller_package_absolute(self):
+        from pyramid.path import CALLER_PACKAGE
+        name = 'pyramid.tests.test_path.TestDottedNameResolver'
+        typ = self._makeOne(CALLER_PACKAGE)
+        self.assertEqual(typ.maybe_resolve(name), self.__class__)
+        self.assertEqual(list(typ._cache), [name])
+
     def test_ctor_string_module_resolveable(self):
         import pyramid.tests
         typ = self._makeOne('pyramid.tests.test_path')
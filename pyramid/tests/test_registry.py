@@ -42,6 +42,20 @@ class TestRegistry(unittest.TestCase):
         registry.settings = 'foo'
         self.assertEqual(registry._settings, 'foo')
 
+    def test__get_settings_from_base(self):
+        base = self._makeOne()
+        base.settings = 'foo'
+        registry = self._getTargetClass()('overlay', bases=(base,))
+        self.assertEqual(registry.settings, 'foo')
+        registry.settings = 'bar'
+        self.assertEqual(registry.settings, 'bar')
+        self.assertEqual(base.settings, 'foo')
+
+    def test__get_settings_no_base_settings(self):
+        from zope.interface.registry import Components
+        registry = self._getTargetClass()('overlay', bases=(Components(),))
+        self.assertEqual(registry.settings, None)
+
 class TestIntrospector(unittest.TestCase):
     def _getTargetClass(slf):
         from pyramid.registry import Introspector
@@ -240,6 +254,73 @@ class TestIntrospector(unittest.TestCase):
                     ('category2', 'discriminator2'))
         self.assertEqual(inst.related(intr), [intr2])
 
+    def _makeOverlay(self):
+        base = self._makeOne()
+        intr = DummyIntrospectable()
+        intr2 = DummyIntrospectable()
+        intr2.discriminator = 'discriminator2'
+        intr2.discriminator_hash = 'discriminator2_hash'
+        base.add(intr)
+        base.add(intr2)
+        base.relate(('category', 'discriminator'),
+                    ('category', 'discriminator2'))
+        inst = self._getTargetClass()(base=base)
+        return base, inst, intr, intr2
+
+    def test_overlay_get(self):
+        base, inst, intr, intr2 = self._makeOverlay()
+        self.assertTrue(inst.get('category', 'discriminator') is intr)
+        self.assertEqual(inst.get('category', 'nope', 'default'), 'default')
+        self.assertEqual(inst.get('nope', 'nope'), None)
+
+    def test_overlay_add_overrides(self):
+        base, inst, intr, intr2 = self._makeOverlay()
+        intr3 = DummyIntrospectable()
+        inst.add(intr3)
+        self.assertEqual(intr3.order, 2)
+        self.assertTrue(inst.get('category', 'discriminator') is intr3)
+        self.assertTrue(base.get('category', 'discriminator') is intr)
+        self.assertEqual(
+            [x['introspectable'] for x in inst.get_category('category')],
+            [intr2, intr3])
+        self.assertEqual(
+            [x['introspectable'] for x in base.get_category('category')],
+            [intr, intr2])
+
+    def test_overlay_categories(self):
+        base, inst, intr, intr2 = self._makeOverlay()
+        intr3 = DummyIntrospectable()
+        intr3.category_name = 'category2'
+        inst.add(intr3)
+        self.assertEqual(inst.categories(), ['category', 'category2'])
+        self.assertEqual(base.categories(), ['category'])
+        self.assertEqual(
+            [x['introspectable'] for x in inst.get_category('category')],
+            [intr, intr2])
+        self.assertEqual(inst.get_category('nope', 'default'), 'default')
+
+    def test_overlay_relate_to_base(self):
+        base, inst, intr, intr2 = self._makeOverlay()
+        intr3 = DummyIntrospectable()
+        intr3.category_name = 'category2'
+        inst.add(intr3)
+        inst.relate(('category2', 'discriminator'),
+                    ('category', 'discriminator'))
+        self.assertEqual(inst.related(intr3), [intr])
+        self.assertEqual(inst.related(intr), [intr2, intr3])
+        self.assertEqual(base.related(intr), [intr2])
+
+    def test_overlay_related_fail(self):
+        base, inst, intr, intr2 = self._makeOverlay()
+        intr3 = DummyIntrospectable()
+        intr3.category_name = 'category2'
+        self.assertRaises(KeyError, inst.related, intr3)
+
+    def test_overlay_remove_base_intr(self):
+        base, inst, intr, intr2 = self._makeOverlay()
+        inst.remove('category', 'discriminator')
+        self.assertTrue(inst.get('category', 'discriminator') is intr)
+
     def test_related_fail(self):
         inst = self._makeOne()
         intr = DummyIntrospectable()
@@ -272,6 +353,12 @@ class TestIntrospectable(unittest.TestCase):
         verifyClass(IIntrospectable, self._getTargetClass())
         verifyObject(IIntrospectable, self._makeOnePopulated())
 
+    def test_no_instance_dict(self):
+        inst = self._makeOnePopulated()
+        self.assertFalse(hasattr(inst, '__dict__'))
+        self.assertEqual(inst.order, 0)
+        self.assertEqual(inst.action_info, None)
+
     def test_relate(self):
         inst = self._makeOnePopulated()
         inst.relate('a', 'b')
@@ -1,6 +1,7 @@
 import unittest
 
 from pyramid.testing import cleanUp
+from pyramid.testing import skip_on
 from pyramid import testing
 from pyramid.compat import text_
 
@@ -164,6 +165,33 @@ class TestChameleonRendererLookup(unittest.TestCase):
         lookup = self._makeOne(None)
         self.assertEqual(lookup.auto_reload, True)
 
+    def test_module_loader_settings_None(self):
+        self.config.registry.settings = None
+        lookup = self._makeOne(None)
+        self.assertEqual(lookup.module_loader, None)
+
+    def test_module_loader_no_directory(self):
+        self.config.registry.settings = {}
+        lookup = self._makeOne(None)
+        self.assertEqual(lookup.module_loader, None)
+
+    def test_module_loader_with_directory(self):
+        import os
+        import shutil
+        import tempfile
+        tmpdir = tempfile.mkdtemp()
+        try:
+            directory = os.path.join(tmpdir, 'cache')
+            self.config.registry.settings = {
+                'template_cache_directory':directory}
+            lookup = self._makeOne(None)
+            loader = lookup.module_loader
+            self.assertEqual(loader.path, directory)
+            self.assertTrue(os.path.isdir(directory))
+            self.assertTrue(lookup.module_loader is loader)
+        finally:
+            shutil.rmtree(tmpdir)
+
     def test___call__abspath_path_notexists(self):
         abspath = '/wont/exist'
         self._registerTemplateRenderer({}, abspath)
@@ -340,6 +368,146 @@ class TestChameleonRendererLookup(unittest.TestCase):
         self.assertNotEqual(reg.queryUtility(ITemplateRenderer, name=spec),
                             None)
 
+    def test___call__cached_without_registry_lookup(self):
+        import pyramid.tests
+        renderer = {}
+        factory = DummyFactory(renderer)
+        reg = self.config.registry
+        info = DummyRendererInfo({
+            'name':'test_renderers.py',
+            'package':pyramid.tests,
+            'registry':reg,
+            'settings':{},
+            'type':'type',
+            })
+        lookup = self._makeOne(factory)
+        result = lookup(info)
+        self.assertTrue(result is renderer)
+        info.registry = None # would blow up if it were used
+        result = lookup(info)
+        self.assertTrue(result is renderer)
+
+    def test___call__reload_assets_reuses_unchanged_template(self):
+        import pyramid.tests
+        settings = {'reload_assets':True}
+        factory = DummyFactory({})
+        info = DummyRendererInfo({
+            'name':'test_renderers.py',
+            'package':pyramid.tests,
+            'registry':self.config.registry,
+            'settings':settings,
+            'type':'type',
+            })
+        lookup = self._makeOne(factory)
+        first = lookup(info)
+        factory.renderer = {}
+        second = lookup(info)
+        self.assertTrue(first is second)
+
+    def test___call__reload_assets_reloads_changed_template(self):
+        import pyramid.tests
+        settings = {'reload_assets':True}
+        factory = DummyFactory({})
+        info = DummyRendererInfo({
+            'name':'test_renderers.py',
+            'package':pyramid.tests,
+            'registry':self.config.registry,
+            'settings':settings,
+            'type':'type',
+            })
+        lookup = self._makeOne(factory)
+        first = lookup(info)
+        key = ('test_renderers.py', pyramid.tests)
+        renderer, spec, (abspath, mtime), next_check = lookup.templates[key]
+        lookup.templates[key] = (renderer, spec, (abspath, mtime - 1),
+                                 next_check)
+        factory.renderer = {}
+        second = lookup(info)
+        self.assertFalse(first is second)
+        self.assertTrue(second is factory.renderer)
+
+    def test___call__reload_assets_interval_not_elapsed(self):
+        import pyramid.tests
+        settings = {'reload_assets':True, 'reload_assets_interval':3600}
+        factory = DummyFactory({})
+        info = DummyRendererInfo({
+            'name':'test_renderers.py',
+            'package':pyramid.tests,
+            'registry':self.config.registry,
+            'settings':settings,
+            'type':'type',
+            })
+        lookup = self._makeOne(factory)
+        first = lookup(info)
+        key = ('test_renderers.py', pyramid.tests)
+        renderer, spec, stamp, next_check = lookup.templates[key]
+        lookup.templates[key] = (renderer, spec, None, next_check)
+        factory.renderer = {}
+        second = lookup(info)
+        self.assertTrue(first is second)
+
+class Test_compile_templates(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _callFUT(self, registry):
+        from pyramid.renderers import compile_templates
+        return compile_templates(registry)
+
+    def _registerTemplate(self, name, discriminator, renderer=None):
+        helper = DummyTemplateHelper(name, renderer)
+        intr = self.config.introspectable('templates', discriminator, name,
+                                          'template')
+        intr['renderer'] = helper
+        self.config.introspector.add(intr)
+        return helper
+
+    def test_no_templates(self):
+        self.assertEqual(self._callFUT(self.config.registry), [])
+
+    def test_compiles_each_template_once(self):
+        template = DummyCookedTemplate()
+        renderer = DummyTemplateRenderer(template)
+        self._registerTemplate('foo.pt', 1, renderer)
+        self._registerTemplate('foo.pt', 2, renderer)
+        result = self._callFUT(self.config.registry)
+        self.assertEqual(result, [('foo.pt', None)])
+        self.assertEqual(template.cooked, 1)
+
+    def test_template_without_cook_check(self):
+        renderer = DummyTemplateRenderer(object())
+        self._registerTemplate('foo.mak', 1, renderer)
+        result = self._callFUT(self.config.registry)
+        self.assertEqual(result, [('foo.mak', None)])
+
+    def test_failure_reported(self):
+        exc = ValueError('wont compile')
+        template = DummyCookedTemplate(exc)
+        self._registerTemplate('bad.pt', 1, DummyTemplateRenderer(template))
+        self._registerTemplate('good.pt', 2,
+                               DummyTemplateRenderer(DummyCookedTemplate()))
+        result = self._callFUT(self.config.registry)
+        self.assertEqual(result, [('bad.pt', exc), ('good.pt', None)])
+
+    @skip_on('java')
+    def test_with_real_chameleon_template(self):
+        import os
+        from pyramid.renderers import RendererHelper
+        from pyramid.chameleon_zpt import renderer_factory
+        self.config.add_renderer('.pt', renderer_factory)
+        here = os.path.dirname(__file__)
+        path = os.path.join(here, 'fixtures', 'minimal.pt')
+        helper = RendererHelper(path, registry=self.config.registry)
+        intr = self.config.introspectable('templates', 1, path, 'template')
+        intr['renderer'] = helper
+        self.config.introspector.add(intr)
+        result = self._callFUT(self.config.registry)
+        self.assertEqual(result, [(path, None)])
+        self.assertTrue(helper.renderer.template._cooked)
+
 class Test_json_renderer_factory(unittest.TestCase):
     def setUp(self):
         self.config = testing.setUp()
@@ -894,6 +1062,32 @@ class DummyFactory:
         return self.renderer
     
 
+class DummyCookedTemplate(object):
+    cooked = 0
+    def __init__(self, exc=None):
+        self.exc = exc
+
+    def cook_check(self):
+        if self.exc is not None:
+            raise self.exc
+        self.cooked += 1
+
+class DummyTemplateRenderer(object):
+    def __init__(self, template):
+        self.template = template
+
+    def implementation(self):
+        return self.template
+
+class DummyTemplateHelper(object):
+    package = None
+    def __init__(self, name, renderer):
+        self.name = name
+        self.renderer = renderer
+
+    def get_renderer(self):
+        return self.renderer
+
 class DummyRendererInfo(object):
     def __init__(self, kw):
         self.__dict__.update(kw)
@@ -37,6 +37,75 @@ class TestFileResponse(unittest.TestCase):
         r = self._makeOne(path)
         self.assertEqual(r.content_type, 'text/plain')
 
+    def test_block_size(self):
+        path = self._getPath()
+        r = self._makeOne(path, block_size=2)
+        self.assertEqual(r.app_iter.block_size, 2)
+        self.assertEqual(next(r.app_iter), b'He')
+        r.app_iter.close()
+
+    def test_with_file_wrapper(self):
+        path = self._getPath()
+        request = testing.DummyRequest(
+            environ={'wsgi.file_wrapper': _wrapper})
+        r = self._makeOne(path, request=request, block_size=2)
+        self.assertEqual(r.app_iter.__class__, _wrapper)
+        self.assertEqual(r.app_iter.block_size, 2)
+        r.app_iter.file.close()
+
+    def test_with_file_wrapper_range_request(self):
+        from pyramid.response import FileIter
+        path = self._getPath()
+        request = testing.DummyRequest(
+            environ={'wsgi.file_wrapper': _wrapper, 'HTTP_RANGE': 'bytes=1-'})
+        r = self._makeOne(path, request=request)
+        self.assertEqual(r.app_iter.__class__, FileIter)
+        r.app_iter.close()
+
+    def test_range_request(self):
+        from webob import Request
+        path = self._getPath()
+        with open(path, 'rb') as f:
+            data = f.read()
+        request = Request.blank('/', headers={'Range': 'bytes=2-5'})
+        r = self._makeOne(path, request=request, block_size=1)
+        result = request.get_response(r)
+        self.assertEqual(result.status_int, 206)
+        self.assertEqual(result.body, data[2:6])
+        self.assertEqual(result.content_range.start, 2)
+        self.assertEqual(result.content_range.stop, 6)
+
+    def test_if_range_mismatch(self):
+        from webob import Request
+        path = self._getPath()
+        with open(path, 'rb') as f:
+            data = f.read()
+        request = Request.blank(
+            '/', headers={'Range': 'bytes=2-5',
+                          'If-Range': 'Thu, 01 Jan 1970 00:00:00 GMT'})
+        r = self._makeOne(path, request=request)
+        result = request.get_response(r)
+        self.assertEqual(result.status_int, 200)
+        self.assertEqual(result.body, data)
+
+    def test_sendfile_header(self):
+        path = self._getPath()
+        r = self._makeOne(path, sendfile_header='X-Sendfile')
+        self.assertEqual(r.headers['X-Sendfile'], os.path.abspath(path))
+        self.assertEqual(r.app_iter, [])
+        self.assertEqual(r.content_length, None)
+        self.assertEqual(r.content_type, 'text/plain')
+        self.assertTrue(r.last_modified)
+
+    def test_sendfile_header_with_value(self):
+        path = self._getPath()
+        r = self._makeOne(path, sendfile_header='X-Accel-Redirect',
+                          sendfile_value='/protected/minimal.txt',
+                          cache_max_age=60)
+        self.assertEqual(r.headers['X-Accel-Redirect'],
+                         '/protected/minimal.txt')
+        self.assertEqual(r.cache_control.max_age, 60)
+
 class TestFileIter(unittest.TestCase):
     def _makeOne(self, file, block_size):
         from pyramid.response import FileIter
@@ -57,6 +126,23 @@ class TestFileIter(unittest.TestCase):
             r+=x
         self.assertEqual(r, data)
 
+    def test_app_iter_range(self):
+        f = io.BytesIO(b'abcdef')
+        inst = self._makeOne(f, 2)
+        result = inst.app_iter_range(1, 4)
+        self.assertTrue(result is inst)
+        self.assertEqual(list(result), [b'bc', b'd'])
+
+    def test_app_iter_range_no_stop(self):
+        f = io.BytesIO(b'abcdef')
+        inst = self._makeOne(f, 4)
+        self.assertEqual(list(inst.app_iter_range(3, None)), [b'def'])
+
+    def test_app_iter_range_past_end(self):
+        f = io.BytesIO(b'abc')
+        inst = self._makeOne(f, 4)
+        self.assertEqual(list(inst.app_iter_range(1, 10)), [b'bc'])
+
     def test_close(self):
         f = io.BytesIO(b'abc')
         inst = self._makeOne(f, 1)
@@ -149,3 +235,8 @@ class DummyVenusian(object):
         self.attached.append((wrapped, fn, category))
 
         
+
+class _wrapper(object):
+    def __init__(self, file, block_size):
+        self.file = file
+        self.block_size = block_size
@@ -1131,6 +1131,68 @@ class TestRouter(unittest.TestCase):
         start_response = DummyStartResponse()
         self.assertRaises(RuntimeError, router, environ, start_response)
 
+class TestHostDispatcher(unittest.TestCase):
+    def _makeOne(self, apps=None, default=None):
+        from pyramid.router import HostDispatcher
+        return HostDispatcher(apps, default)
+
+    def _makeApp(self, name):
+        def app(environ, start_response):
+            start_response('200 OK', [])
+            return [name]
+        return app
+
+    def _call(self, dispatcher, **environ):
+        start_response = DummyStartResponse()
+        result = dispatcher(environ, start_response)
+        return start_response.status, result
+
+    def test_host(self):
+        dispatcher = self._makeOne({'Example.com':self._makeApp('a'),
+                                    'other.com':self._makeApp('b')})
+        self.assertEqual(self._call(dispatcher, HTTP_HOST='example.com'),
+                         ('200 OK', ['a']))
+        self.assertEqual(self._call(dispatcher, HTTP_HOST='OTHER.com'),
+                         ('200 OK', ['b']))
+
+    def test_host_any_port(self):
+        dispatcher = self._makeOne({'example.com':self._makeApp('a')})
+        self.assertEqual(self._call(dispatcher, HTTP_HOST='example.com:8080'),
+                         ('200 OK', ['a']))
+
+    def test_host_with_port(self):
+        dispatcher = self._makeOne({'example.com':self._makeApp('a')})
+        dispatcher.add('example.com:8080', self._makeApp('b'))
+        self.assertEqual(self._call(dispatcher, HTTP_HOST='example.com:8080'),
+                         ('200 OK', ['b']))
+        self.assertEqual(self._call(dispatcher, HTTP_HOST='example.com:80'),
+                         ('200 OK', ['a']))
+
+    def test_ipv6_host(self):
+        dispatcher = self._makeOne({'[::1]':self._makeApp('a')})
+        self.assertEqual(self._call(dispatcher, HTTP_HOST='[::1]'),
+                         ('200 OK', ['a']))
+        self.assertEqual(self._call(dispatcher, HTTP_HOST='[::1]:8080'),
+                         ('200 OK', ['a']))
+
+    def test_no_http_host(self):
+        dispatcher = self._makeOne({'example.com':self._makeApp('a')})
+        self.assertEqual(self._call(dispatcher, SERVER_NAME='example.com',
+                                    SERVER_PORT='80'),
+                         ('200 OK', ['a']))
+
+    def test_default(self):
+        dispatcher = self._makeOne({'example.com':self._makeApp('a')},
+                                   self._makeApp('default'))
+        self.assertEqual(self._call(dispatcher, HTTP_HOST='other.com'),
+                         ('200 OK', ['default']))
+
+    def test_not_found(self):
+        dispatcher = self._makeOne({'example.com':self._makeApp('a')})
+        status, result = self._call(dispatcher, HTTP_HOST='other.com',
+                                    REQUEST_METHOD='GET')
+        self.assertEqual(status, '404 Not Found')
+
 class DummyContext:
     pass
 
@@ -0,0 +1,121 @@
+import os
+import unittest
+
+class TestPCompressCommand(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+        self.css = b'body { color: black; }\n' * 20
+        self._write('style.css', self.css)
+        self._write('image.png', b'x' * 500)
+        os.mkdir(os.path.join(self.directory, 'sub'))
+        self._write(os.path.join('sub', 'script.js'), b'var a = 1;\n' * 100)
+        self._write('small.txt', b'x')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, body, mtime=None):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f:
+            f.write(body)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def _getTargetClass(self):
+        from pyramid.scripts.pcompress import PCompressCommand
+        return PCompressCommand
+
+    def _makeOne(self, *args):
+        cmd = self._getTargetClass()(['pcompress'] + list(args))
+        self.out = []
+        cmd.out = self.out.append
+        return cmd
+
+    def _exists(self, name):
+        return os.path.exists(os.path.join(self.directory, name))
+
+    def _decompress(self, name):
+        import zlib
+        with open(os.path.join(self.directory, name), 'rb') as f:
+            return zlib.decompress(f.read(), 16 + zlib.MAX_WBITS)
+
+    def test_no_args(self):
+        command = self._makeOne()
+        self.assertEqual(command.run(), 2)
+        self.assertEqual(self.out, ['Requires at least one directory argument'])
+
+    def test_not_a_directory(self):
+        path = os.path.join(self.directory, 'style.css')
+        command = self._makeOne(path)
+        self.assertEqual(command.run(), 2)
+        self.assertEqual(self.out, ['Not a directory: %s' % path])
+
+    def test_compresses(self):
+        command = self._makeOne(self.directory)
+        self.assertEqual(command.run(), 0)
+        self.assertEqual(self._decompress('style.css.gz'), self.css)
+        self.assertEqual(self._decompress(os.path.join('sub', 'script.js.gz')),
+                         b'var a = 1;\n' * 100)
+        self.assertFalse(self._exists('image.png.gz'))
+        self.assertFalse(self._exists('small.txt.gz'))
+        self.assertEqual(len(self.out), 2)
+        self.assertTrue(self.out[0].startswith('compressed'))
+
+    def test_asset_spec(self):
+        import pyramid.tests
+        command = self._makeOne('pyramid.tests:fixtures/static')
+        command.compress = self.out.append
+        self.assertEqual(command.run(), 0)
+        here = os.path.dirname(os.path.abspath(pyramid.tests.__file__))
+        expected = os.path.join(here, 'fixtures', 'static', 'index.html')
+        self.assertTrue(expected in self.out)
+
+    def test_up_to_date_skipped(self):
+        self._makeOne(self.directory).run()
+        self._write('style.css.gz', b'unchanged')
+        command = self._makeOne(self.directory)
+        command.run()
+        self.assertEqual(self.out, [])
+        with open(os.path.join(self.directory, 'style.css.gz'), 'rb') as f:
+            self.assertEqual(f.read(), b'unchanged')
+
+    def test_stale_recompressed(self):
+        self._write('style.css.gz', b'stale', mtime=1000)
+        self._makeOne(self.directory).run()
+        self.assertEqual(self._decompress('style.css.gz'), self.css)
+
+    def test_force(self):
+        self._makeOne(self.directory).run()
+        self._write('style.css.gz', b'unchanged')
+        self._makeOne('--force', self.directory).run()
+        self.assertEqual(self._decompress('style.css.gz'), self.css)
+
+    def test_min_size(self):
+        self._makeOne('--min-size', '1000', self.directory).run()
+        self.assertFalse(self._exists('style.css.gz'))
+        self.assertTrue(self._exists(os.path.join('sub', 'script.js.gz')))
+
+    def test_min_size_removes_stale_copy(self):
+        self._write('style.css', self.css, mtime=2000)
+        self._write('style.css.gz', b'stale', mtime=1000)
+        self._makeOne('--min-size', '1000', self.directory).run()
+        self.assertFalse(self._exists('style.css.gz'))
+
+    def test_incompressible_removes_stale_copy(self):
+        import random
+        data = bytes(bytearray(random.randint(0, 255) for i in range(2000)))
+        self._write('random.txt', data, mtime=2000)
+        self._write('random.txt.gz', b'stale', mtime=1000)
+        self._makeOne(self.directory).run()
+        self.assertFalse(self._exists('random.txt.gz'))
+
+class Test_main(unittest.TestCase):
+    def _callFUT(self, argv):
+        from pyramid.scripts.pcompress import main
+        return main(argv, quiet=True)
+
+    def test_it(self):
+        result = self._callFUT(['pcompress'])
+        self.assertEqual(result, 2)
@@ -0,0 +1,68 @@
+import unittest
+from pyramid.tests.test_scripts import dummy
+
+class TestPTemplatesCommand(unittest.TestCase):
+    def _getTargetClass(self):
+        from pyramid.scripts.ptemplates import PTemplatesCommand
+        return PTemplatesCommand
+
+    def _makeOne(self):
+        cmd = self._getTargetClass()([])
+        cmd.bootstrap = (dummy.DummyBootstrap(),)
+        cmd.args = ('/foo/bar/myapp.ini#myapp',)
+        return cmd
+
+    def test_command_no_config_uri(self):
+        command = self._makeOne()
+        command.args = ()
+        L = []
+        command.out = L.append
+        result = command.run()
+        self.assertEqual(result, 2)
+        self.assertEqual(L, ['Requires a config file argument'])
+
+    def test_command_no_templates(self):
+        command = self._makeOne()
+        command._compile_templates = lambda *arg: []
+        L = []
+        command.out = L.append
+        result = command.run()
+        self.assertEqual(result, 0)
+        self.assertEqual(L, ['No templates found'])
+        self.assertTrue(command.bootstrap[0].closer.called)
+
+    def test_command_all_compiled(self):
+        command = self._makeOne()
+        command._compile_templates = lambda *arg: [('a.pt', None),
+                                                   ('b.mak', None)]
+        L = []
+        command.out = L.append
+        result = command.run()
+        self.assertEqual(result, 0)
+        self.assertEqual(L, ['compiled    a.pt', 'compiled    b.mak'])
+
+    def test_command_compile_failure(self):
+        command = self._makeOne()
+        command._compile_templates = lambda *arg: [
+            ('a.pt', ValueError('bad')), ('b.mak', None)]
+        L = []
+        command.out = L.append
+        result = command.run()
+        self.assertEqual(result, 1)
+        self.assertEqual(L, ['FAILED      a.pt',
+                             '            ValueError: bad',
+                             'compiled    b.mak'])
+
+    def test__compile_templates(self):
+        from pyramid.registry import Registry
+        command = self._makeOne()
+        self.assertEqual(command._compile_templates(Registry()), [])
+
+class Test_main(unittest.TestCase):
+    def _callFUT(self, argv):
+        from pyramid.scripts.ptemplates import main
+        return main(argv, quiet=True)
+
+    def test_it(self):
+        result = self._callFUT(['ptemplates'])
+        self.assertEqual(result, 2)
@@ -113,6 +113,232 @@ class TestUnencryptedCookieSession(unittest.TestCase):
         self.assertEqual(secure, 'secure')
         self.assertEqual(httponly, 'HttpOnly')
 
+    def test__set_cookie_records_cookie_size(self):
+        import webob
+        request = testing.DummyRequest()
+        session = self._makeOne(request)
+        self.assertEqual(session.cookie_size, None)
+        session['abc'] = 'x'
+        response = webob.Response()
+        session._set_cookie(response)
+        cookieval = response.headerlist[-1][1].split(';')[0]
+        self.assertEqual(session.cookie_size, len(cookieval) - len('session='))
+
+    def test__set_cookie_cookieval_too_long_records_cookie_size(self):
+        request = testing.DummyRequest()
+        session = self._makeOne(request)
+        session['abc'] = 'x'*100000
+        response = DummyResponse()
+        self.assertRaises(ValueError, session._set_cookie, response)
+        self.assertTrue(session.cookie_size > 4064)
+
+    def test__set_cookie_integer_timestamps(self):
+        from pyramid.session import signed_deserialize
+        request = testing.DummyRequest()
+        session = self._makeOne(request)
+        session.accessed = session.created = 1000.5
+        response = DummyResponse()
+        session._set_cookie(response)
+        accessed, created, state = signed_deserialize(
+            response.cookieval, 'secret')
+        self.assertEqual((accessed, created), (1000, 1000))
+
+    def test_custom_serializer(self):
+        from pyramid.session import signed_json_serialize
+        from pyramid.session import signed_json_deserialize
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = signed_json_serialize(
+            (int(time.time()), 0, {'state':1}), 'secret')
+        session = self._makeOne(
+            request,
+            signed_serialize=signed_json_serialize,
+            signed_deserialize=signed_json_deserialize)
+        self.assertEqual(dict(session), {'state':1})
+        self.assertEqual(session.created, 0)
+        response = DummyResponse()
+        session._set_cookie(response)
+        accessed, created, state = signed_json_deserialize(
+            response.cookieval, 'secret')
+        self.assertEqual(state, {'state':1})
+
+    def test_custom_serializer_rejects_other_format(self):
+        from pyramid.session import signed_json_serialize
+        from pyramid.session import signed_json_deserialize
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(time.time(), {'state':1})
+        session = self._makeOne(
+            request,
+            signed_serialize=signed_json_serialize,
+            signed_deserialize=signed_json_deserialize)
+        self.assertEqual(dict(session), {})
+        self.assertTrue(session.new)
+
+    def test_changed_sets_cookie(self):
+        request = testing.DummyRequest()
+        session = self._makeOne(request)
+        session.changed()
+        session.changed()
+        self.assertEqual(len(request.response_callbacks), 1)
+        response = DummyResponse()
+        request.response_callbacks[0](request, response)
+        self.assertEqual(session.request, None)
+        self.assertTrue(response.cookieval)
+
+    def test_write_within_reissue_time_sets_cookie(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(
+            int(time.time()), {'state':1})
+        session = self._makeOne(request, reissue_time=60)
+        self.assertEqual(session['state'], 1)
+        self.assertTrue('state' in session)
+        self.assertEqual(session.get_csrf_token(), session['_csrft_'])
+        self.assertEqual(len(request.response_callbacks), 1)
+
+    def test_read_within_reissue_time_no_write(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(
+            int(time.time()), {'state':1})
+        session = self._makeOne(request, reissue_time=60)
+        self.assertEqual(session['state'], 1)
+        self.assertEqual(session.peek_flash(), [])
+        self.assertEqual(len(request.response_callbacks), 0)
+
+    def test_read_after_reissue_time_sets_cookie(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(
+            int(time.time()) - 61, {'state':1})
+        session = self._makeOne(request, reissue_time=60)
+        self.assertEqual(session['state'], 1)
+        self.assertEqual(len(request.response_callbacks), 1)
+
+    def test_read_with_reissue_time_None(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(
+            int(time.time()) - 1000, {'state':1})
+        session = self._makeOne(request, reissue_time=None)
+        self.assertEqual(session['state'], 1)
+        self.assertEqual(len(request.response_callbacks), 0)
+        session['state'] = 2
+        self.assertEqual(len(request.response_callbacks), 1)
+
+    def test_lazy_does_not_deserialize_in_ctor(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(int(time.time()),
+                                                     {'state':1})
+        deserialized = []
+        def deserialize(cookieval, secret):
+            from pyramid.session import signed_deserialize
+            deserialized.append(cookieval)
+            return signed_deserialize(cookieval, secret)
+        session = self._makeOne(request, lazy=True,
+                                signed_deserialize=deserialize)
+        self.assertEqual(deserialized, [])
+        self.assertFalse(session.new)
+        self.assertEqual(len(deserialized), 1)
+        self.assertEqual(session['state'], 1)
+        self.assertEqual(len(deserialized), 1)
+
+    def test_lazy_loads_on_first_dict_access(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(int(time.time()),
+                                                     {'state':1})
+        session = self._makeOne(request, lazy=True)
+        self.assertFalse(session._loaded)
+        self.assertEqual(session.get('state'), 1)
+        self.assertTrue(session._loaded)
+        self.assertFalse(session.new)
+
+    def test_lazy_copy_first(self):
+        import time
+        request = testing.DummyRequest()
+        request.cookies['session'] = self._serialize(int(time.time()),
+                                                     {'state':1})
+        session = self._makeOne(request, lazy=True)
+        result = session.copy()
+        self.assertEqual(result, {'state':1})
+        self.assertEqual(result.__class__, dict)
+
+    def test_lazy_write_first(self):
+        request = testing.DummyRequest()
+        session = self._makeOne(request, lazy=True)
+        session['a'] = 1
+        self.assertTrue(session.new)
+        response = DummyResponse()
+        request.response_callbacks[0](request, response)
+        self.assertTrue(response.cookieval)
+
+    def test_lazy_changed_first(self):
+        request = testing.DummyRequest()
+        session = self._makeOne(request, lazy=True)
+        session.changed()
+        self.assertTrue(session._loaded)
+
+    def test_lazy_missing_attribute(self):
+        request = testing.DummyRequest()
+        session = self._makeOne(request, lazy=True)
+        self.assertRaises(AttributeError, getattr, session, 'foo')
+        self.assertFalse(session._loaded)
+        session._load()
+        self.assertRaises(AttributeError, getattr, session, 'foo')
+
+    def test_cookie_cache(self):
+        from pyramid.session import UnencryptedCookieSessionFactoryConfig
+        import time
+        cookieval = self._serialize(int(time.time()), {'state':[1]})
+        deserialized = []
+        def deserialize(cookieval, secret):
+            from pyramid.session import signed_deserialize
+            deserialized.append(cookieval)
+            return signed_deserialize(cookieval, secret)
+        factory = UnencryptedCookieSessionFactoryConfig(
+            'secret', signed_deserialize=deserialize, cookie_cache_size=10)
+        request = testing.DummyRequest()
+        request.cookies['session'] = cookieval
+        session = factory(request)
+        self.assertEqual(session['state'], [1])
+        session['state'].append(2)
+        request = testing.DummyRequest()
+        request.cookies['session'] = cookieval
+        session = factory(request)
+        self.assertEqual(session['state'], [1])
+        self.assertEqual(deserialized, [cookieval])
+
+    def test_cookie_cache_invalid_cookie(self):
+        from pyramid.session import UnencryptedCookieSessionFactoryConfig
+        factory = UnencryptedCookieSessionFactoryConfig(
+            'secret', cookie_cache_size=10)
+        request = testing.DummyRequest()
+        request.cookies['session'] = 'abc'
+        session = factory(request)
+        self.assertTrue(session.new)
+        self.assertEqual(session._cookie_cache.get('abc'), None)
+
+    def test_cookie_cache_primed_by_set_cookie(self):
+        from pyramid.session import UnencryptedCookieSessionFactoryConfig
+        deserialized = []
+        def deserialize(cookieval, secret): # pragma: no cover
+            deserialized.append(cookieval)
+        factory = UnencryptedCookieSessionFactoryConfig(
+            'secret', signed_deserialize=deserialize, cookie_cache_size=10)
+        request = testing.DummyRequest()
+        session = factory(request)
+        session['a'] = 1
+        response = DummyResponse()
+        session._set_cookie(response)
+        request = testing.DummyRequest()
+        request.cookies['session'] = response.cookieval
+        session = factory(request)
+        self.assertEqual(session['a'], 1)
+        self.assertEqual(deserialized, [])
+
     def test_flash_default(self):
         request = testing.DummyRequest()
         session = self._makeOne(request)
@@ -262,6 +488,64 @@ class Test_manage_accessed(unittest.TestCase):
         self.assertEqual(result, None)
         self.assertEqual(session.response, response)
 
+class Test_manage_accessed_reissue(unittest.TestCase):
+    def _makeOne(self, wrapped):
+        from pyramid.session import manage_accessed
+        return manage_accessed(wrapped)
+
+    def test_within_reissue_time(self):
+        import time
+        request = testing.DummyRequest()
+        session = DummySessionFactory(request)
+        session._reissue_time = 60
+        session.renewed = int(time.time())
+        session['a'] = 1
+        wrapper = self._makeOne(session.__class__.get)
+        self.assertEqual(wrapper(session, 'a'), 1)
+        self.assertFalse(session._dirty)
+        self.assertEqual(len(request.response_callbacks), 0)
+
+    def test_reissue_time_elapsed(self):
+        import time
+        request = testing.DummyRequest()
+        session = DummySessionFactory(request)
+        session._reissue_time = 60
+        session.renewed = int(time.time()) - 61
+        wrapper = self._makeOne(session.__class__.get)
+        wrapper(session, 'a')
+        self.assertTrue(session._dirty)
+        self.assertEqual(len(request.response_callbacks), 1)
+
+    def test_reissue_time_None(self):
+        request = testing.DummyRequest()
+        session = DummySessionFactory(request)
+        session._reissue_time = None
+        wrapper = self._makeOne(session.__class__.get)
+        wrapper(session, 'a')
+        self.assertNotEqual(session.accessed, None)
+        self.assertFalse(session._dirty)
+
+class Test_manage_changed(unittest.TestCase):
+    def _makeOne(self, wrapped):
+        from pyramid.session import manage_changed
+        return manage_changed(wrapped)
+
+    def test_it(self):
+        import time
+        request = testing.DummyRequest()
+        session = DummySessionFactory(request)
+        session._reissue_time = None
+        session.renewed = int(time.time())
+        wrapper = self._makeOne(session.__class__.__setitem__)
+        self.assertEqual(wrapper.__doc__, session.__setitem__.__doc__)
+        wrapper(session, 'a', 1)
+        self.assertEqual(session['a'], 1)
+        self.assertTrue(session._dirty)
+        self.assertEqual(len(request.response_callbacks), 1)
+        response = DummyResponse()
+        request.response_callbacks[0](request, response)
+        self.assertEqual(session.response, response)
+
 def serialize(data, secret):
     import hmac
     import base64
@@ -314,6 +598,87 @@ class Test_signed_deserialize(unittest.TestCase):
         self.assertRaises(ValueError, self._callFUT, serialized, 'secret')
         
 
+class Test_signed_json_serialize(unittest.TestCase):
+    def _callFUT(self, data, secret):
+        from pyramid.session import signed_json_serialize
+        return signed_json_serialize(data, secret)
+
+    def _decode(self, serialized):
+        import base64
+        from pyramid.compat import bytes_
+        serialized = bytes_(serialized)
+        return base64.urlsafe_b64decode(
+            serialized + b'=' * (-len(serialized) % 4))
+
+    def test_it(self):
+        import hmac
+        from hashlib import sha1
+        result = self._callFUT({'a':[1, 2]}, 'secret')
+        raw = self._decode(result)
+        body = raw[20:]
+        self.assertEqual(body, b'j{"a":[1,2]}')
+        self.assertEqual(raw[:20], hmac.new(b'secret', body, sha1).digest())
+        self.assertFalse('=' in result)
+
+    def test_compressed(self):
+        import zlib
+        result = self._callFUT({'a':'x'*1000}, 'secret')
+        body = self._decode(result)[20:]
+        self.assertEqual(body[:1], b'z')
+        self.assertEqual(zlib.decompress(body[1:]),
+                         b'{"a":"' + b'x'*1000 + b'"}')
+
+    def test_smaller_than_signed_serialize(self):
+        from pyramid.session import signed_serialize
+        data = (1331000000, 1331000000, {'_csrft_':'a'*40, 'userid':12})
+        self.assertTrue(len(self._callFUT(data, 'secret')) <
+                        len(signed_serialize(data, 'secret')))
+
+class Test_signed_json_deserialize(unittest.TestCase):
+    def _callFUT(self, serialized, secret, hmac=None):
+        if hmac is None:
+            import hmac
+        from pyramid.session import signed_json_deserialize
+        return signed_json_deserialize(serialized, secret, hmac=hmac)
+
+    def _serialize(self, data, secret):
+        from pyramid.session import signed_json_serialize
+        return signed_json_serialize(data, secret)
+
+    def _sign(self, body, secret='secret'):
+        import base64
+        import hmac
+        from hashlib import sha1
+        from pyramid.compat import native_
+        sig = hmac.new(secret.encode('ascii'), body, sha1).digest()
+        return native_(base64.urlsafe_b64encode(sig + body))
+
+    def test_it(self):
+        serialized = self._serialize([1, 2, {'a':'b'}], 'secret')
+        result = self._callFUT(serialized, 'secret')
+        self.assertEqual(result, [1, 2, {'a':'b'}])
+
+    def test_it_compressed(self):
+        serialized = self._serialize({'a':'x'*1000}, 'secret')
+        result = self._callFUT(serialized, 'secret')
+        self.assertEqual(result, {'a':'x'*1000})
+
+    def test_invalid_bits(self):
+        serialized = self._serialize('123', 'secret')
+        self.assertRaises(ValueError, self._callFUT, serialized, 'seekrit')
+
+    def test_it_bad_encoding(self):
+        serialized = '!' + self._serialize('123', 'secret')
+        self.assertRaises(ValueError, self._callFUT, serialized, 'secret')
+
+    def test_it_bad_compressed_data(self):
+        serialized = self._sign(b'znotzlib')
+        self.assertRaises(ValueError, self._callFUT, serialized, 'secret')
+
+    def test_it_unknown_format(self):
+        serialized = self._sign(b'p123')
+        self.assertRaises(ValueError, self._callFUT, serialized, 'secret')
+
 class DummySessionFactory(dict):
     _dirty = False
     _cookie_name = 'session'
@@ -323,14 +688,371 @@ class DummySessionFactory(dict):
     _cookie_secure = False
     _cookie_httponly = False
     _timeout = 1200
+    _reissue_time = 0
     _secret = 'secret'
+    renewed = 0
     def __init__(self, request):
         self.request = request
         dict.__init__(self, {})
 
+    def changed(self):
+        if not self._dirty:
+            self._dirty = True
+            def set_cookie_callback(request, response):
+                self._set_cookie(response)
+            self.request.add_response_callback(set_cookie_callback)
+
     def _set_cookie(self, response):
         self.response = response
 
 class DummyResponse(object):
     def __init__(self):
         self.headerlist = []
+
+    def set_cookie(self, name, value=None, **kw):
+        self.cookieval = value
+
+class TestServerSideSession(unittest.TestCase):
+    def setUp(self):
+        from pyramid.session import MemorySessionStorage
+        self.storage = MemorySessionStorage()
+
+    def _makeOne(self, request, **kw):
+        from pyramid.session import ServerSideSessionFactoryConfig
+        kw.setdefault('storage', self.storage)
+        return ServerSideSessionFactoryConfig('secret', **kw)(request)
+
+    def _makeRequest(self, session_id=None, value=None):
+        from pyramid.session import _sign_session_id
+        request = testing.DummyRequest()
+        if session_id is not None:
+            request.cookies['session'] = _sign_session_id(session_id,
+                                                          'secret')
+            if value is not None:
+                self.storage.save(session_id, value)
+        return request
+
+    def test_ctor_no_cookie(self):
+        request = self._makeRequest()
+        session = self._makeOne(request)
+        self.assertEqual(session.session_id, None)
+        self.assertFalse(session._loaded)
+        self.assertEqual(session.copy(), {})
+        self.assertTrue(session.new)
+        self.assertEqual(len(session.session_id), 40)
+
+    def test_instance_conforms(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import ISession
+        request = self._makeRequest()
+        session = self._makeOne(request)
+        verifyObject(ISession, session)
+
+    def test_ctor_with_cookie_does_not_load(self):
+        storage = DummySessionStorage()
+        request = self._makeRequest('abc')
+        session = self._makeOne(request, storage=storage)
+        self.assertEqual(session.session_id, 'abc')
+        self.assertEqual(storage.loaded, [])
+
+    def test_load_on_first_access(self):
+        import time
+        now = int(time.time())
+        request = self._makeRequest('abc', (now, 10, {'state':1}))
+        session = self._makeOne(request)
+        self.assertEqual(session['state'], 1)
+        self.assertFalse(session.new)
+        self.assertEqual(session.created, 10)
+        self.assertEqual(session.session_id, 'abc')
+
+    def test_load_expired(self):
+        request = self._makeRequest('abc', (0, 0, {'state':1}))
+        session = self._makeOne(request)
+        self.assertEqual(session.copy(), {})
+        self.assertTrue(session.new)
+        self.assertNotEqual(session.session_id, 'abc')
+
+    def test_load_unknown_id(self):
+        request = self._makeRequest('abc')
+        session = self._makeOne(request)
+        self.assertTrue(session.new)
+        self.assertNotEqual(session.session_id, 'abc')
+
+    def test_ctor_with_bad_cookie(self):
+        request = self._makeRequest()
+        request.cookies['session'] = 'abc' + 'a' * 40
+        session = self._makeOne(request)
+        self.assertEqual(session.session_id, None)
+
+    def test_read_does_not_write(self):
+        import time
+        storage = DummySessionStorage()
+        now = int(time.time())
+        storage.sessions['abc'] = (now, now, {'state':1})
+        request = self._makeRequest('abc')
+        session = self._makeOne(request, storage=storage)
+        self.assertEqual(session.get('state'), 1)
+        self.assertEqual(session.peek_flash(), [])
+        self.assertEqual(len(request.response_callbacks), 0)
+
+    def test_read_after_reissue_time_writes(self):
+        import time
+        now = int(time.time())
+        request = self._makeRequest('abc', (now - 200, now - 200, {'a':1}))
+        session = self._makeOne(request)
+        self.assertEqual(session['a'], 1)
+        self.assertEqual(len(request.response_callbacks), 1)
+        response = DummyResponse()
+        request.response_callbacks[0](request, response)
+        self.assertEqual(self.storage.load('abc')[0], session.accessed)
+        self.assertFalse(hasattr(response, 'cookieval'))
+
+    def test_write_existing_session(self):
+        import time
+        now = int(time.time())
+        request = self._makeRequest('abc', (now, 10, {'a':1}))
+        session = self._makeOne(request)
+        session['b'] = 2
+        session['c'] = 3
+        self.assertEqual(len(request.response_callbacks), 1)
+        response = DummyResponse()
+        request.response_callbacks[0](request, response)
+        self.assertEqual(self.storage.load('abc')[1:],
+                         (10, {'a':1, 'b':2, 'c':3}))
+        self.assertFalse(hasattr(response, 'cookieval'))
+        self.assertEqual(session.request, None)
+
+    def test_write_new_session_sets_cookie(self):
+        from pyramid.session import _unsign_session_id
+        request = self._makeRequest()
+        session = self._makeOne(request)
+        session['a'] = 1
+        response = DummyResponse()
+        request.response_callbacks[0](request, response)
+        session_id = _unsign_session_id(response.cookieval, 'secret')
+        self.assertEqual(session_id, session.session_id)
+        self.assertEqual(self.storage.load(session_id)[2], {'a':1})
+
+    def test_write_with_cookie_max_age_renews_cookie(self):
+        import time
+        now = int(time.time())
+        request = self._makeRequest('abc', (now, now, {}))
+        session = self._makeOne(request, cookie_max_age=100)
+        session['a'] = 1
+        response = DummyResponse()
+        request.response_callbacks[0](request, response)
+        self.assertTrue(response.cookieval.startswith('abc'))
+
+    def test_empty_new_session_not_saved(self):
+        storage = DummySessionStorage()
+        request = self._makeRequest()
+        session = self._makeOne(request, storage=storage)
+        session.changed()
+        response = DummyResponse()
+        self.assertEqual(session._save(response), False)
+        self.assertEqual(storage.sessions, {})
+
+    def test__save_on_exception(self):
+        request = self._makeRequest()
+        request.exception = True
+        session = self._makeOne(request, cookie_on_exception=False)
+        session['a'] = 1
+        self.assertEqual(session._save(DummyResponse()), False)
+
+    def test_invalidate(self):
+        import time
+        now = int(time.time())
+        request = self._makeRequest('abc', (now, now, {'a':1}))
+        session = self._makeOne(request)
+        session.invalidate()
+        self.assertEqual(self.storage.load('abc'), None)
+        self.assertTrue(session.new)
+        self.assertNotEqual(session.session_id, 'abc')
+        self.assertFalse('a' in session)
+
+    def test_flash_and_csrf(self):
+        request = self._makeRequest()
+        session = self._makeOne(request)
+        session.flash('msg')
+        token = session.get_csrf_token()
+        response = DummyResponse()
+        request.response_callbacks[0](request, response)
+        request = self._makeRequest()
+        request.cookies['session'] = response.cookieval
+        session = self._makeOne(request)
+        self.assertEqual(session.get_csrf_token(), token)
+        self.assertEqual(session.pop_flash(), ['msg'])
+
+    def test_sweep(self):
+        storage = DummySessionStorage()
+        request = self._makeRequest()
+        session = self._makeOne(request, storage=storage)
+        session['a'] = 1
+        session._save(DummyResponse())
+        session._save(DummyResponse())
+        self.assertEqual(len(storage.swept), 1)
+
+    def test_sweep_disabled(self):
+        storage = DummySessionStorage()
+        request = self._makeRequest()
+        session = self._makeOne(request, storage=storage, sweep_interval=None)
+        session['a'] = 1
+        session._save(DummyResponse())
+        self.assertEqual(storage.swept, [])
+
+class Test_unsign_session_id(unittest.TestCase):
+    def _callFUT(self, cookieval, secret):
+        from pyramid.session import _unsign_session_id
+        return _unsign_session_id(cookieval, secret)
+
+    def test_it(self):
+        from pyramid.session import _sign_session_id
+        self.assertEqual(self._callFUT(_sign_session_id('abc', 'secret'),
+                                       'secret'), 'abc')
+
+    def test_invalid_signature(self):
+        from pyramid.session import _sign_session_id
+        self.assertEqual(self._callFUT(_sign_session_id('abc', 'secret'),
+                                       'seekrit'), None)
+
+    def test_too_short(self):
+        self.assertEqual(self._callFUT('abc', 'secret'), None)
+
+class SessionStorageTests(object):
+    def test_conforms(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import ISessionStorage
+        verifyObject(ISessionStorage, self._makeOne())
+
+    def test_load_missing(self):
+        storage = self._makeOne()
+        self.assertEqual(storage.load('abc'), None)
+
+    def test_save_and_load(self):
+        storage = self._makeOne()
+        storage.save('abc', (2, 1, {'a':[1]}))
+        value = storage.load('abc')
+        self.assertEqual(value, (2, 1, {'a':[1]}))
+        value[2]['a'].append(2)
+        self.assertEqual(storage.load('abc'), (2, 1, {'a':[1]}))
+        storage.save('abc', (3, 1, {}))
+        self.assertEqual(storage.load('abc'), (3, 1, {}))
+
+    def test_delete(self):
+        storage = self._makeOne()
+        storage.save('abc', (2, 1, {}))
+        storage.delete('abc')
+        storage.delete('abc')
+        self.assertEqual(storage.load('abc'), None)
+
+    def test_sweep(self):
+        storage = self._makeOne()
+        storage.save('old', (10, 1, {}))
+        storage.save('new', (30, 1, {}))
+        storage.sweep(20)
+        self.assertEqual(storage.load('old'), None)
+        self.assertEqual(storage.load('new'), (30, 1, {}))
+
+class TestMemorySessionStorage(SessionStorageTests, unittest.TestCase):
+    def _makeOne(self, max_sessions=10):
+        from pyramid.session import MemorySessionStorage
+        return MemorySessionStorage(max_sessions)
+
+    def test_max_sessions(self):
+        storage = self._makeOne(1)
+        storage.save('abc', (2, 1, {}))
+        storage.save('def', (2, 1, {}))
+        self.assertEqual(storage.load('abc'), None)
+
+    def test_max_sessions_least_recently_used_discarded(self):
+        storage = self._makeOne(10)
+        for i in range(10):
+            storage.save('s%s' % i, (2, 1, {}))
+        storage.load('s0')
+        storage.save('s10', (2, 1, {}))
+        self.assertEqual(len(storage.sessions), 9)
+        self.assertEqual(storage.load('s0'), (2, 1, {}))
+        self.assertEqual(storage.load('s1'), None)
+        self.assertEqual(storage.load('s2'), None)
+        self.assertEqual(storage.load('s10'), (2, 1, {}))
+
+class TestFileSessionStorage(SessionStorageTests, unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.directory)
+
+    def _makeOne(self):
+        from pyramid.session import FileSessionStorage
+        return FileSessionStorage(self.directory)
+
+    def test_creates_directory(self):
+        import os
+        from pyramid.session import FileSessionStorage
+        directory = os.path.join(self.directory, 'sessions')
+        FileSessionStorage(directory)
+        self.assertTrue(os.path.isdir(directory))
+
+    def test_invalid_session_id(self):
+        storage = self._makeOne()
+        self.assertRaises(ValueError, storage.save, '../abc', (2, 1, {}))
+
+    def test_load_corrupt(self):
+        import os
+        with open(os.path.join(self.directory, 'abc'), 'wb') as f:
+            f.write(b'')
+        self.assertEqual(self._makeOne().load('abc'), None)
+
+    def test_save_failure_removes_tempfile(self):
+        import os
+        storage = self._makeOne()
+        self.assertRaises(Exception, storage.save, 'abc',
+                          (2, 1, {'a':lambda: None}))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_sweep_ignores_tempfiles(self):
+        import os
+        open(os.path.join(self.directory, '.tmp'), 'wb').close()
+        self._makeOne().sweep(2000000000)
+        self.assertEqual(os.listdir(self.directory), ['.tmp'])
+
+class TestDBMSessionStorage(SessionStorageTests, unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+        self.storages = []
+
+    def tearDown(self):
+        import shutil
+        for storage in self.storages:
+            storage.close()
+        shutil.rmtree(self.directory)
+
+    def _makeOne(self):
+        import os
+        from pyramid.session import DBMSessionStorage
+        storage = DBMSessionStorage(os.path.join(self.directory, 'sessions'))
+        self.storages.append(storage)
+        return storage
+
+class DummySessionStorage(object):
+    def __init__(self):
+        self.sessions = {}
+        self.loaded = []
+        self.swept = []
+
+    def load(self, session_id):
+        self.loaded.append(session_id)
+        return self.sessions.get(session_id)
+
+    def save(self, session_id, value):
+        self.sessions[session_id] = value
+
+    def delete(self, session_id):
+        self.sessions.pop(session_id, None)
+
+    def sweep(self, expired):
+        self.swept.append(expired)
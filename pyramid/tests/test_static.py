@@ -364,9 +364,740 @@ class Test_static_view_use_subpath_True(unittest.TestCase):
         response = inst(context, request)
         self.assertEqual(response.status, '404 Not Found')
 
+class Test_static_view_file_cache(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.docroot = tempfile.mkdtemp()
+        self._write('file.css', b'body {}')
+        self._write('big.bin', b'x' * 100)
+        import os
+        os.mkdir(os.path.join(self.docroot, 'subdir'))
+        self._write('subdir/index.html', b'<html>subdir</html>')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.docroot)
+
+    def _write(self, name, body, mtime=None):
+        import os
+        path = os.path.join(self.docroot, name)
+        with open(path, 'wb') as f:
+            f.write(body)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def _makeOne(self, **kw):
+        from pyramid.static import static_view
+        kw.setdefault('file_cache_size', 10)
+        kw.setdefault('file_cache_max_body', 50)
+        return static_view(self.docroot, **kw)
+
+    def _makeRequest(self, path_info):
+        from pyramid.request import Request
+        environ = {
+            'wsgi.url_scheme':'http',
+            'wsgi.version':(1,0),
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'6543',
+            'PATH_INFO':path_info,
+            'SCRIPT_NAME':'',
+            'REQUEST_METHOD':'GET',
+            }
+        return Request(environ=environ)
+
+    def _call(self, inst, path_info):
+        return inst(DummyContext(), self._makeRequest(path_info))
+
+    def test_ctor_defaultargs(self):
+        from pyramid.static import static_view
+        inst = static_view(self.docroot)
+        self.assertEqual(inst.file_cache, None)
+
+    def test_small_file_body_cached(self):
+        inst = self._makeOne(cache_max_age=None)
+        response = self._call(inst, '/file.css')
+        self.assertEqual(response.body, b'body {}')
+        self._write('file.css', b'changed')
+        response = self._call(inst, '/file.css')
+        self.assertEqual(response.body, b'body {}')
+        self.assertEqual(response.content_type, 'text/css')
+        self.assertEqual(response.content_length, 7)
+        self.assertTrue(response.etag)
+        self.assertTrue(response.last_modified)
+        header_names = sorted([ x[0] for x in response.headerlist ])
+        self.assertEqual(
+            header_names,
+            ['Content-Length', 'Content-Type', 'ETag', 'Last-Modified'])
+
+    def test_large_file_body_not_cached(self):
+        inst = self._makeOne()
+        response = self._call(inst, '/big.bin')
+        self.assertEqual(response.body, b'x' * 100)
+        entry = inst.file_cache.get('big.bin')
+        self.assertEqual(entry.identity.body, None)
+        response = self._call(inst, '/big.bin')
+        self.assertEqual(response.content_type, 'application/octet-stream')
+        self.assertEqual(response.body, b'x' * 100)
+
+    def test_large_file_with_wsgi_file_wrapper(self):
+        inst = self._makeOne()
+        self._call(inst, '/big.bin')
+        class _Wrapper(object):
+            def __init__(self, file, block_size=None):
+                self.file = file
+        request = self._makeRequest('/big.bin')
+        request.environ['wsgi.file_wrapper'] = _Wrapper
+        response = inst(DummyContext(), request)
+        self.assertTrue(isinstance(response.app_iter, _Wrapper))
+        response.app_iter.file.close()
+
+    def test_cache_max_age(self):
+        inst = self._makeOne(cache_max_age=600)
+        self._call(inst, '/file.css')
+        response = self._call(inst, '/file.css')
+        self.assertEqual(response.cache_control.max_age, 600)
+        self.assertTrue(response.expires)
+
+    def test_revalidated_after_interval(self):
+        inst = self._makeOne(file_cache_interval=0)
+        self._call(inst, '/file.css')
+        self._write('file.css', b'changed!', mtime=1000)
+        response = self._call(inst, '/file.css')
+        self.assertEqual(response.body, b'changed!')
+        self.assertEqual(response.content_length, 8)
+
+    def test_revalidated_unchanged(self):
+        inst = self._makeOne(file_cache_interval=0)
+        self._call(inst, '/file.css')
+        entry = inst.file_cache.get('file.css')
+        self._call(inst, '/file.css')
+        self.assertTrue(inst.file_cache.get('file.css') is entry)
+
+    def test_revalidated_removed(self):
+        import os
+        inst = self._makeOne(file_cache_interval=0)
+        self._call(inst, '/file.css')
+        os.remove(os.path.join(self.docroot, 'file.css'))
+        response = self._call(inst, '/file.css')
+        self.assertEqual(response.status, '404 Not Found')
+        self.assertEqual(inst.file_cache.get('file.css'), None)
+
+    def test_not_found(self):
+        inst = self._makeOne()
+        response = self._call(inst, '/notthere.css')
+        self.assertEqual(response.status, '404 Not Found')
+
+    def test_directory_index(self):
+        inst = self._makeOne()
+        response = self._call(inst, '/subdir/')
+        self.assertEqual(response.body, b'<html>subdir</html>')
+        response = self._call(inst, '/subdir/')
+        self.assertEqual(response.body, b'<html>subdir</html>')
+        response = self._call(inst, '/subdir')
+        self.assertEqual(response.status, '301 Moved Permanently')
+
+    def test_notmodified(self):
+        inst = self._makeOne()
+        response = self._call(inst, '/file.css')
+        request = self._makeRequest('/file.css')
+        request.if_none_match = response.etag
+        response = inst(DummyContext(), request)
+        start_response = DummyStartResponse()
+        app_iter = response(request.environ, start_response)
+        self.assertEqual(start_response.status, '304 Not Modified')
+        self.assertEqual(list(app_iter), [])
+
+    def test_package_resource(self):
+        from pyramid.static import static_view
+        inst = static_view('pyramid.tests:fixtures/static', file_cache_size=10)
+        response = self._call(inst, '/index.html')
+        self.assertTrue(b'<html>static</html>' in response.body)
+        response = self._call(inst, '/index.html')
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(response.content_type, 'text/html')
+
+class Test_static_view_gzip(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.docroot = tempfile.mkdtemp()
+        self.css = b'body { color: black; }\n' * 20
+        self._write('file.css', self.css)
+        self._write('image.png', b'x' * 500)
+        self._write('tiny.txt', b'x')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.docroot)
+
+    def _write(self, name, body):
+        import os
+        with open(os.path.join(self.docroot, name), 'wb') as f:
+            f.write(body)
+
+    def _makeOne(self, **kw):
+        from pyramid.static import static_view
+        return static_view(self.docroot, gzip=True, **kw)
+
+    def _call(self, inst, path_info, accept_encoding='gzip, deflate'):
+        from pyramid.request import Request
+        environ = {
+            'wsgi.url_scheme':'http',
+            'wsgi.version':(1,0),
+            'SERVER_NAME':'example.com',
+            'SERVER_PORT':'6543',
+            'PATH_INFO':path_info,
+            'SCRIPT_NAME':'',
+            'REQUEST_METHOD':'GET',
+            }
+        if accept_encoding is not None:
+            environ['HTTP_ACCEPT_ENCODING'] = accept_encoding
+        request = Request(environ=environ)
+        return inst(DummyContext(), request)
+
+    def _decompress(self, body):
+        import zlib
+        return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+
+    def test_compressed_on_the_fly(self):
+        inst = self._makeOne()
+        response = self._call(inst, '/file.css')
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(response.content_type, 'text/css')
+        self.assertEqual(response.content_length, len(response.body))
+        self.assertTrue(len(response.body) < len(self.css))
+        self.assertEqual(self._decompress(response.body), self.css)
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertTrue(response.etag.endswith('-gz'))
+
+    def test_compressed_bytes_cached(self):
+        inst = self._makeOne()
+        self._call(inst, '/file.css')
+        self.assertEqual(len(inst.gzip_cache.data), 1)
+        body = list(inst.gzip_cache.data.values())[0][1]
+        response = self._call(inst, '/file.css')
+        self.assertTrue(response.body is body)
+
+    def test_not_accepted(self):
+        inst = self._makeOne()
+        response = self._call(inst, '/file.css', accept_encoding=None)
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.body, self.css)
+        self.assertEqual(response.content_length, len(self.css))
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+
+    def test_not_compressible(self):
+        inst = self._makeOne()
+        response = self._call(inst, '/image.png')
+        self.assertEqual(response.content_encoding, None)
+        self.assertFalse('Vary' in response.headers)
+
+    def test_compression_doesnt_help(self):
+        inst = self._makeOne()
+        response = self._call(inst, '/tiny.txt')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.body, b'x')
+        self.assertFalse('Vary' in response.headers)
+
+    def test_precompressed_sibling(self):
+        self._write('image.png.gz', b'precompressed')
+        inst = self._makeOne()
+        response = self._call(inst, '/image.png')
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(response.content_type, 'image/png')
+        self.assertEqual(response.body, b'precompressed')
+        self.assertEqual(response.content_length, 13)
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(inst.gzip_cache.data, {})
+
+    def test_precompressed_sibling_stale(self):
+        import os
+        self._write('file.css.gz', b'stale')
+        gzpath = os.path.join(self.docroot, 'file.css.gz')
+        mtime = os.path.getmtime(os.path.join(self.docroot, 'file.css'))
+        os.utime(gzpath, (mtime - 10, mtime - 10))
+        inst = self._makeOne()
+        response = self._call(inst, '/file.css')
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(self._decompress(response.body), self.css)
+
+    def test_precompressed_sibling_stale_not_compressible(self):
+        import os
+        self._write('image.png.gz', b'stale')
+        gzpath = os.path.join(self.docroot, 'image.png.gz')
+        mtime = os.path.getmtime(os.path.join(self.docroot, 'image.png'))
+        os.utime(gzpath, (mtime - 10, mtime - 10))
+        inst = self._makeOne()
+        response = self._call(inst, '/image.png')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.body, b'x' * 500)
+        self.assertFalse('Vary' in response.headers)
+
+    def test_precompressed_sibling_served_from_file(self):
+        from pyramid.response import FileIter
+        self._write('file.css.gz', b'precompressed')
+        inst = self._makeOne()
+        response = self._call(inst, '/file.css')
+        self.assertTrue(isinstance(response.app_iter, FileIter))
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(response.content_type, 'text/css')
+        self.assertEqual(response.content_length, 13)
+        self.assertTrue(response.etag.endswith('-gz'))
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(b''.join(response.app_iter), b'precompressed')
+        response.app_iter.close()
+        self.assertEqual(inst.gzip_cache.data, {})
+
+    def test_identity_served_from_file(self):
+        import os
+        from pyramid.response import FileIter
+        self._write('file.css.gz', b'precompressed')
+        inst = self._makeOne()
+        response = self._call(inst, '/file.css', accept_encoding=None)
+        self.assertTrue(isinstance(response.app_iter, FileIter))
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(response.content_length, len(self.css))
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        st = os.stat(os.path.join(self.docroot, 'file.css'))
+        self.assertEqual(response.etag,
+                         '%x-%x' % (int(st.st_mtime * 1000), st.st_size))
+        self.assertEqual(b''.join(response.app_iter), self.css)
+        response.app_iter.close()
+
+    def test_identity_etag_matches_file_cache(self):
+        inst = self._makeOne()
+        cached = self._makeOne(file_cache_size=10)
+        for accept_encoding in (None, 'gzip'):
+            response = self._call(inst, '/file.css', accept_encoding)
+            expected = self._call(cached, '/file.css', accept_encoding)
+            self.assertEqual(response.etag, expected.etag)
+            self.assertEqual(response.content_length, expected.content_length)
+            self.assertEqual(response.body, expected.body)
+
+    def test_precompressed_sibling_large(self):
+        self._write('image.png.gz', b'precompressed')
+        inst = self._makeOne(file_cache_max_body=5)
+        response = self._call(inst, '/image.png')
+        self.assertEqual(response.body, b'precompressed')
+        self.assertEqual(response.content_length, 13)
+
+    def test_with_file_cache(self):
+        inst = self._makeOne(file_cache_size=10)
+        response = self._call(inst, '/file.css')
+        self.assertEqual(self._decompress(response.body), self.css)
+        self._write('file.css', b'changed')
+        response = self._call(inst, '/file.css')
+        self.assertEqual(self._decompress(response.body), self.css)
+        response = self._call(inst, '/file.css', accept_encoding='')
+        self.assertEqual(response.body, self.css)
+
+    def test_too_large_for_on_the_fly_compression(self):
+        from pyramid import static
+        inst = self._makeOne()
+        saved = static._GZIP_MAX_SIZE
+        static._GZIP_MAX_SIZE = 10
+        try:
+            response = self._call(inst, '/file.css')
+        finally:
+            static._GZIP_MAX_SIZE = saved
+        self.assertEqual(response.content_encoding, None)
+
+class Test_static_view_ranges_and_sendfile(unittest.TestCase):
+    def setUp(self):
+        import os
+        import tempfile
+        self.docroot = tempfile.mkdtemp()
+        self._write('big.bin', b'0123456789' * 10)
+        os.mkdir(os.path.join(self.docroot, 'sub dir'))
+        self._write(os.path.join('sub dir', 'index.html'), b'<html></html>')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.docroot)
+
+    def _write(self, name, body):
+        import os
+        with open(os.path.join(self.docroot, name), 'wb') as f:
+            f.write(body)
+
+    def _makeOne(self, **kw):
+        from pyramid.static import static_view
+        return static_view(self.docroot, **kw)
+
+    def _makeRequest(self, path_info, headers=None):
+        from pyramid.request import Request
+        return Request.blank(path_info, headers=headers)
+
+    def _call(self, inst, request):
+        response = inst(DummyContext(), request)
+        return request.get_response(response)
+
+    def test_ctor_defaultargs(self):
+        from pyramid.response import _BLOCK_SIZE
+        inst = self._makeOne()
+        self.assertEqual(inst.block_size, _BLOCK_SIZE)
+        self.assertEqual(inst.sendfile_header, None)
+        self.assertEqual(inst.sendfile_prefix, None)
+
+    def test_block_size(self):
+        inst = self._makeOne(block_size=30)
+        response = inst(DummyContext(), self._makeRequest('/big.bin'))
+        self.assertEqual(response.app_iter.block_size, 30)
+        self.assertEqual(len(list(response.app_iter)), 4)
+        response.app_iter.close()
+
+    def test_block_size_file_cache(self):
+        inst = self._makeOne(block_size=30, file_cache_size=10,
+                             file_cache_max_body=50)
+        response = inst(DummyContext(), self._makeRequest('/big.bin'))
+        self.assertEqual(response.app_iter.block_size, 30)
+        response.app_iter.close()
+
+    def test_range(self):
+        inst = self._makeOne(block_size=7)
+        request = self._makeRequest('/big.bin', {'Range': 'bytes=15-34'})
+        response = self._call(inst, request)
+        self.assertEqual(response.status_int, 206)
+        self.assertEqual(response.body, (b'0123456789' * 10)[15:35])
+        self.assertEqual(response.content_length, 20)
+
+    def test_range_file_cache(self):
+        inst = self._makeOne(file_cache_size=10, file_cache_max_body=50)
+        request = self._makeRequest('/big.bin', {'Range': 'bytes=-5'})
+        response = self._call(inst, request)
+        self.assertEqual(response.status_int, 206)
+        self.assertEqual(response.body, b'56789')
+
+    def test_range_with_wsgi_file_wrapper(self):
+        from pyramid.response import FileIter
+        inst = self._makeOne(file_cache_size=10, file_cache_max_body=50)
+        request = self._makeRequest('/big.bin', {'Range': 'bytes=0-1'})
+        request.environ['wsgi.file_wrapper'] = object
+        response = inst(DummyContext(), request)
+        self.assertTrue(isinstance(response.app_iter, FileIter))
+        response.app_iter.close()
+
+    def test_if_range_matches(self):
+        inst = self._makeOne(file_cache_size=10, file_cache_max_body=50)
+        etag = self._call(inst, self._makeRequest('/big.bin')).etag
+        request = self._makeRequest(
+            '/big.bin', {'Range': 'bytes=0-1', 'If-Range': '"%s"' % etag})
+        response = self._call(inst, request)
+        self.assertEqual(response.status_int, 206)
+        self.assertEqual(response.body, b'01')
+
+    def test_if_range_does_not_match(self):
+        inst = self._makeOne(file_cache_size=10, file_cache_max_body=50)
+        request = self._makeRequest(
+            '/big.bin', {'Range': 'bytes=0-1', 'If-Range': '"other"'})
+        response = self._call(inst, request)
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(response.content_length, 100)
+
+    def test_sendfile(self):
+        import os
+        inst = self._makeOne(sendfile_header='X-Sendfile', gzip=True)
+        response = inst(DummyContext(), self._makeRequest('/big.bin'))
+        self.assertEqual(response.headers['X-Sendfile'],
+                         os.path.join(self.docroot, 'big.bin'))
+        self.assertEqual(response.app_iter, [])
+        self.assertEqual(response.content_type, 'application/octet-stream')
+
+    def test_sendfile_prefix(self):
+        inst = self._makeOne(sendfile_header='X-Accel-Redirect',
+                             sendfile_prefix='/protected/', cache_max_age=60)
+        response = inst(DummyContext(), self._makeRequest('/big.bin'))
+        self.assertEqual(response.headers['X-Accel-Redirect'],
+                         '/protected/big.bin')
+        self.assertEqual(response.cache_control.max_age, 60)
+
+    def test_sendfile_prefix_index(self):
+        inst = self._makeOne(sendfile_header='X-Accel-Redirect',
+                             sendfile_prefix='/protected')
+        response = inst(DummyContext(), self._makeRequest('/sub%20dir/'))
+        self.assertEqual(response.headers['X-Accel-Redirect'],
+                         '/protected/sub%20dir/index.html')
+
+    def test_sendfile_notfound(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne(sendfile_header='X-Sendfile')
+        response = inst(DummyContext(), self._makeRequest('/missing'))
+        self.assertTrue(isinstance(response, HTTPNotFound))
+
+class Test_static_view_cachebust(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.static import static_view
+        return static_view('pyramid.tests:fixtures/static', **kw)
+
+    def _makeRequest(self, path_info):
+        from pyramid.request import Request
+        return Request.blank(path_info)
+
+    def test_ctor_defaultargs(self):
+        inst = self._makeOne()
+        self.assertEqual(inst.cachebust, None)
+
+    def test_match(self):
+        inst = self._makeOne(cachebust=DummyCacheBuster(), cache_max_age=60)
+        request = self._makeRequest('/token/index.html')
+        response = inst(DummyContext(), request)
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(response.headers['Cache-Control'],
+                         'max-age=31536000, public, immutable')
+        self.assertTrue(response.expires)
+
+    def test_match_use_subpath(self):
+        inst = self._makeOne(cachebust=DummyCacheBuster(), use_subpath=True)
+        request = self._makeRequest('/')
+        request.subpath = ('token', 'index.html')
+        response = inst(DummyContext(), request)
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(response.cache_control.max_age, 31536000)
+
+    def test_no_match(self):
+        inst = self._makeOne(cachebust=DummyCacheBuster(), cache_max_age=60)
+        request = self._makeRequest('/index.html')
+        response = inst(DummyContext(), request)
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(response.cache_control.max_age, 60)
+
+    def test_match_stale(self):
+        inst = self._makeOne(cachebust=DummyCacheBuster(), cache_max_age=60)
+        request = self._makeRequest('/stale/index.html')
+        response = inst(DummyContext(), request)
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(response.cache_control.max_age, 60)
+        self.assertFalse('immutable' in response.headers['Cache-Control'])
+
+    def test_md5_cachebuster(self):
+        from pyramid.static import PathSegmentMd5CacheBuster
+        cachebust = PathSegmentMd5CacheBuster()
+        inst = self._makeOne(cachebust=cachebust, cache_max_age=60)
+        token = cachebust.token('pyramid.tests:fixtures/static/index.html')
+        request = self._makeRequest('/%s/index.html' % token)
+        response = inst(DummyContext(), request)
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(response.headers['Cache-Control'],
+                         'max-age=31536000, public, immutable')
+
+    def test_md5_cachebuster_wrong_token(self):
+        from pyramid.static import PathSegmentMd5CacheBuster
+        cachebust = PathSegmentMd5CacheBuster()
+        inst = self._makeOne(cachebust=cachebust, cache_max_age=60)
+        request = self._makeRequest('/%s/index.html' % ('0' * 32))
+        response = inst(DummyContext(), request)
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(response.cache_control.max_age, 60)
+        self.assertFalse('immutable' in response.headers['Cache-Control'])
+
+    def test_md5_cachebuster_abspath(self):
+        import os
+        from pyramid.static import static_view
+        from pyramid.static import PathSegmentMd5CacheBuster
+        here = os.path.dirname(os.path.abspath(__file__))
+        root = os.path.join(here, 'fixtures', 'static')
+        cachebust = PathSegmentMd5CacheBuster()
+        inst = static_view(root, cachebust=cachebust)
+        token = cachebust.token(os.path.join(root, 'index.html'))
+        request = self._makeRequest('/%s/index.html' % token)
+        response = inst(DummyContext(), request)
+        self.assertEqual(response.cache_control.max_age, 31536000)
+
+    def test_match_notfound(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne(cachebust=DummyCacheBuster())
+        request = self._makeRequest('/token/missing.html')
+        response = inst(DummyContext(), request)
+        self.assertTrue(isinstance(response, HTTPNotFound))
+        self.assertFalse('immutable' in response.headers.get(
+            'Cache-Control', ''))
+
+class TestPathSegmentMd5CacheBuster(unittest.TestCase):
+    def _makeOne(self):
+        from pyramid.static import PathSegmentMd5CacheBuster
+        return PathSegmentMd5CacheBuster()
+
+    def _md5(self):
+        import hashlib
+        import os
+        here = os.path.dirname(__file__)
+        path = os.path.join(here, 'fixtures', 'static', 'index.html')
+        with open(path, 'rb') as f:
+            return hashlib.md5(f.read()).hexdigest()
+
+    def test_verifyObject(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import ICacheBuster
+        verifyObject(ICacheBuster, self._makeOne())
+
+    def test_pregenerate(self):
+        inst = self._makeOne()
+        result = inst.pregenerate(
+            'pyramid.tests:fixtures/static/index.html', 'index.html', {'a':1})
+        self.assertEqual(result, (self._md5() + '/index.html', {'a':1}))
+
+    def test_pregenerate_abspath(self):
+        import os
+        here = os.path.dirname(os.path.abspath(__file__))
+        path = os.path.join(here, 'fixtures', 'static', 'index.html')
+        inst = self._makeOne()
+        result = inst.pregenerate(path, 'index.html', {})
+        self.assertEqual(result, (self._md5() + '/index.html', {}))
+
+    def test_pregenerate_not_a_file(self):
+        inst = self._makeOne()
+        result = inst.pregenerate('pyramid.tests:fixtures/static/subdir/',
+                                  'subdir/', {})
+        self.assertEqual(result, ('subdir/', {}))
+
+    def _path(self):
+        import os
+        here = os.path.dirname(os.path.abspath(__file__))
+        return os.path.join(here, 'fixtures', 'static', 'index.html')
+
+    def test_token_memoized(self):
+        import os
+        st = os.stat(self._path())
+        inst = self._makeOne()
+        inst.tokens['pyramid.tests:fixtures/static/index.html'] = (
+            self._path(), (st.st_mtime, st.st_size), 'abc')
+        self.assertEqual(
+            inst.token('pyramid.tests:fixtures/static/index.html'), 'abc')
+
+    def test_token_file_changed(self):
+        inst = self._makeOne()
+        inst.tokens['pyramid.tests:fixtures/static/index.html'] = (
+            self._path(), (0, 0), 'abc')
+        self.assertEqual(
+            inst.token('pyramid.tests:fixtures/static/index.html'),
+            self._md5())
+        self.assertEqual(
+            inst.tokens['pyramid.tests:fixtures/static/index.html'][2],
+            self._md5())
+
+    def test_token_file_removed(self):
+        inst = self._makeOne()
+        inst.tokens['pyramid.tests:fixtures/static/index.html'] = (
+            self._path() + '.missing', (0, 0), 'abc')
+        self.assertEqual(
+            inst.token('pyramid.tests:fixtures/static/index.html'), None)
+
+    def test_match(self):
+        inst = self._makeOne()
+        token = self._md5()
+        self.assertEqual(inst.match((token, 'css', 'main.css')),
+                         ('css', 'main.css'))
+
+    def test_match_not_a_token(self):
+        inst = self._makeOne()
+        self.assertEqual(inst.match(('css', 'main.css')), None)
+        self.assertEqual(inst.match(('x' * 32, 'main.css')), None)
+
+    def test_match_token_only(self):
+        inst = self._makeOne()
+        self.assertEqual(inst.match((self._md5(),)), None)
+
+class TestManifestCacheBuster(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        fd, self.manifest = tempfile.mkstemp(suffix='.json')
+        import os
+        os.write(fd, b'{"css/main.css": "css/main-678b7c80.css"}')
+        os.close(fd)
+
+    def tearDown(self):
+        import os
+        os.remove(self.manifest)
+
+    def _makeOne(self, manifest_spec):
+        from pyramid.static import ManifestCacheBuster
+        return ManifestCacheBuster(manifest_spec)
+
+    def test_verifyObject(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import ICacheBuster
+        verifyObject(ICacheBuster, self._makeOne(self.manifest))
+
+    def test_pregenerate(self):
+        inst = self._makeOne(self.manifest)
+        self.assertEqual(inst.pregenerate('pkg:static/css/main.css',
+                                          'css/main.css', {'a':1}),
+                         ('css/main-678b7c80.css', {'a':1}))
+
+    def test_pregenerate_not_in_manifest(self):
+        inst = self._makeOne(self.manifest)
+        self.assertEqual(inst.pregenerate('pkg:static/css/other.css',
+                                          'css/other.css', {}),
+                         ('css/other.css', {}))
+
+    def test_match(self):
+        inst = self._makeOne(self.manifest)
+        subpath = ('css', 'main-678b7c80.css')
+        self.assertEqual(inst.match(subpath), subpath)
+        self.assertEqual(inst.match(('css', 'main.css')), None)
+
+    def test_relative_spec(self):
+        inst = self._makeOne('fixtures/manifest.json')
+        self.assertEqual(inst.manifest,
+                         {'css/main.css': 'css/main-678b7c80.css'})
+
+class Test_accepts_gzip(unittest.TestCase):
+    def _callFUT(self, accept_encoding):
+        from pyramid.static import _accepts_gzip
+        return _accepts_gzip(accept_encoding)
+
+    def test_it(self):
+        self.assertTrue(self._callFUT('gzip'))
+        self.assertTrue(self._callFUT('deflate, GZIP;q=0.5'))
+        self.assertTrue(self._callFUT('x-gzip'))
+        self.assertTrue(self._callFUT('*'))
+        self.assertTrue(self._callFUT('gzip; level=1'))
+
+    def test_not_accepted(self):
+        self.assertFalse(self._callFUT(None))
+        self.assertFalse(self._callFUT(''))
+        self.assertFalse(self._callFUT('identity'))
+        self.assertFalse(self._callFUT('gzip;q=0'))
+        self.assertFalse(self._callFUT('gzip;q=0, *'))
+        self.assertFalse(self._callFUT('*;q=0'))
+        self.assertFalse(self._callFUT('gzip;q=bogus'))
+
+class Test_compressible(unittest.TestCase):
+    def _callFUT(self, content_type, content_encoding=None):
+        from pyramid.static import compressible
+        return compressible(content_type, content_encoding)
+
+    def test_it(self):
+        self.assertTrue(self._callFUT('text/css'))
+        self.assertTrue(self._callFUT('application/javascript'))
+        self.assertTrue(self._callFUT('image/svg+xml'))
+
+    def test_not_compressible(self):
+        self.assertFalse(self._callFUT('image/png'))
+        self.assertFalse(self._callFUT('text/plain', 'gzip'))
+
+class Test_gzip_compress(unittest.TestCase):
+    def test_it(self):
+        import zlib
+        from pyramid.static import gzip_compress
+        result = gzip_compress(b'abc' * 10)
+        self.assertEqual(result[:2], b'\x1f\x8b')
+        self.assertEqual(zlib.decompress(result, 16 + zlib.MAX_WBITS),
+                         b'abc' * 10)
+
 class DummyContext:
     pass
 
+class DummyCacheBuster(object):
+    def __init__(self, token='token'):
+        self.token = token
+
+    def pregenerate(self, pathspec, subpath, kw):
+        return '%s/%s' % (self.token, subpath), kw
+
+    def match(self, subpath):
+        if subpath[0] in ('token', 'stale'):
+            return subpath[1:]
+
 class DummyStartResponse:
     status = ()
     headers = ()
@@ -71,6 +71,18 @@ class RoutesMapperTests(unittest.TestCase):
         klass = self._getTargetClass()
         return klass()
 
+    def test___copy__(self):
+        import copy
+        mapper = self._makeOne()
+        mapper.connect('foo', 'archives/:action/:article')
+        result = copy.copy(mapper)
+        result.connect('bar', 'bar')
+        self.assertEqual([r.name for r in mapper.get_routes()], ['foo'])
+        self.assertEqual([r.name for r in result.get_routes()],
+                         ['foo', 'bar'])
+        self.assertEqual(mapper.get_route('bar'), None)
+        self.assertTrue(result.get_route('foo') is mapper.get_route('foo'))
+
     def test_provides_IRoutesMapper(self):
         from pyramid.interfaces import IRoutesMapper
         from zope.interface.verify import verifyObject
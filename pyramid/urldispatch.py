@@ -50,6 +50,13 @@ class RoutesMapper(object):
     def get_routes(self):
         return self.routelist
 
+    def __copy__(self):
+        # the copy has its own route list, but shares the route objects
+        mapper = self.__class__()
+        mapper.routelist = list(self.routelist)
+        mapper.routes = dict(self.routes)
+        return mapper
+
     def get_route(self, name):
         return self.routes.get(name)
 
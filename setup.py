@@ -104,6 +104,8 @@ setup(name='pyramid',
         proutes = pyramid.scripts.proutes:main
         pviews = pyramid.scripts.pviews:main
         ptweens = pyramid.scripts.ptweens:main
+        ptemplates = pyramid.scripts.ptemplates:main
+        pcompress = pyramid.scripts.pcompress:main
         prequest = pyramid.scripts.prequest:main
         [paste.server_runner]
         wsgiref = pyramid.scripts.pserve:wsgiref_server_runner